@@ -0,0 +1,39 @@
+from typing import Optional, Literal
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.db.mongodb import get_database
+from app.services import rollup
+from app.schemas.analytics import RollupList
+
+router = APIRouter()
+
+
+@router.get("/platform/{platform}/top", response_model=RollupList)
+async def read_top_topics(
+    platform: str = Path(..., description="平台标识: weibo, baidu, zhihu, douyin, bilibili"),
+    db: AsyncIOMotorClient = Depends(get_database),
+    granularity: Literal["hour", "day"] = Query("day", description="汇总粒度"),
+    bucket: Optional[datetime] = Query(None, description="时间桶内的任意时间, 默认为最近一个时间桶"),
+    sort_by: Literal["best_rank", "time_on_list", "peak_hot_value"] = Query("best_rank", description="排序方式"),
+    limit: int = Query(20, description="返回记录数")
+):
+    """获取平台在某小时或某天的话题排行"""
+    bucket_start, rollups = await rollup.get_top_topics(db, platform, granularity, bucket, sort_by, limit)
+    return {"data": rollups, "total": len(rollups), "bucket": bucket_start}
+
+
+@router.get("/topic/{topic_id}", response_model=RollupList)
+async def read_topic_rollups(
+    topic_id: str = Path(..., description="话题ID"),
+    db: AsyncIOMotorClient = Depends(get_database),
+    granularity: Literal["hour", "day"] = Query("day", description="汇总粒度"),
+    start_date: Optional[datetime] = Query(None, description="开始时间"),
+    end_date: Optional[datetime] = Query(None, description="结束时间"),
+    limit: int = Query(100, description="返回记录数")
+):
+    """获取话题按小时或按天的汇总"""
+    rollups = await rollup.get_topic_rollups(db, topic_id, granularity, start_date, end_date, limit)
+    return {"data": rollups, "total": len(rollups)}
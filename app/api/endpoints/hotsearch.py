@@ -1,45 +1,132 @@
 from typing import Optional
+from datetime import datetime
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+from redis.asyncio import Redis
 
+from app.api.responses import json_response
+from app.core.serialization import dumps_list
 from app.db.mongodb import get_database
-from app.services import hotsearch
+from app.db.redis import get_redis
+from app.services import hotsearch, cache, trending, ingest
+from app.services.pagination import get_next_cursor
+from app.services.registry import platform_registry
 from app.schemas.hotsearch import (
     HotSearchResponse, 
     HotSearchList, 
     HotSearchCreate, 
     HotSearchUpdate,
-    HotSearchQueryParams
+    HotSearchBulkCreate,
+    HotSearchBulkResult,
+    HotSearchQueryParams,
+    HotSearchCacheStats,
+    RisingHotSearchList
 )
 
 router = APIRouter()
 
+# 平台+标题+抓取时间为唯一键
+DUPLICATE_HOTSEARCH_DETAIL = "该平台同一抓取时间已存在相同标题的热搜"
+
 
 @router.get("/", response_model=HotSearchList)
 async def read_hotsearches(
     db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis),
     skip: int = Query(0, description="跳过记录数"),
-    limit: int = Query(100, description="返回记录数")
+    limit: int = Query(100, description="返回记录数"),
+    cursor: Optional[str] = Query(None, description="分页游标, 提供时忽略skip")
 ):
     """获取所有热搜"""
-    hotsearches = await hotsearch.get_all_hotsearches(db, skip, limit)
-    return {"data": hotsearches, "total": len(hotsearches)}
+    # 游标分页多用于深度翻页, 不写入缓存
+    payload = None if cursor else await cache.get_cached_list(redis, None, skip, limit)
+    if payload is None:
+        try:
+            hotsearches, total = await asyncio.gather(
+                hotsearch.get_all_hotsearches(db, skip, limit, cursor),
+                hotsearch.count_all_hotsearches(db, redis)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        payload = dumps_list(
+            HotSearchList,
+            hotsearches,
+            total=total,
+            next_cursor=get_next_cursor(hotsearches, limit, hotsearch.LIST_SORT)
+        )
+        if not cursor:
+            await cache.set_cached_list(redis, None, skip, limit, payload)
+    return json_response(payload)
 
 
 @router.get("/platform/{platform}", response_model=HotSearchList)
 async def read_platform_hotsearches(
     platform: str = Path(..., description="平台标识: weibo, baidu, zhihu, douyin, bilibili"),
     db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis),
     skip: int = Query(0, description="跳过记录数"),
-    limit: int = Query(100, description="返回记录数")
+    limit: int = Query(100, description="返回记录数"),
+    cursor: Optional[str] = Query(None, description="分页游标, 提供时忽略skip")
 ):
     """获取指定平台的热搜"""
-    if platform not in ["weibo", "baidu", "zhihu", "douyin", "bilibili"]:
+    await platform_registry.ensure_loaded(db)
+    if not platform_registry.is_valid(platform):
+        raise HTTPException(status_code=400, detail="无效的平台标识")
+    
+    payload = None if cursor else await cache.get_cached_list(redis, platform, skip, limit)
+    if payload is None:
+        try:
+            hotsearches, total = await asyncio.gather(
+                hotsearch.get_hotsearches_by_platform(db, platform, skip, limit, cursor),
+                hotsearch.count_hotsearches_by_platform(db, redis, platform)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        payload = dumps_list(
+            HotSearchList,
+            hotsearches,
+            total=total,
+            next_cursor=get_next_cursor(hotsearches, limit, hotsearch.PLATFORM_SORT)
+        )
+        if not cursor:
+            await cache.set_cached_list(redis, platform, skip, limit, payload)
+    return json_response(payload)
+
+
+@router.get("/platform/{platform}/latest", response_model=HotSearchList)
+async def read_platform_latest_hotsearches(
+    platform: str = Path(..., description="平台标识: weibo, baidu, zhihu, douyin, bilibili"),
+    db: AsyncIOMotorClient = Depends(get_database)
+):
+    """获取指定平台当前热搜榜(最新一次抓取的快照)"""
+    await platform_registry.ensure_loaded(db)
+    if not platform_registry.is_valid(platform):
         raise HTTPException(status_code=400, detail="无效的平台标识")
     
-    hotsearches = await hotsearch.get_hotsearches_by_platform(db, platform, skip, limit)
-    return {"data": hotsearches, "total": len(hotsearches)}
+    hotsearches = await hotsearch.get_latest_hotsearches(db, platform)
+    return json_response(dumps_list(HotSearchList, hotsearches, total=len(hotsearches)))
+
+
+@router.get("/rising", response_model=RisingHotSearchList)
+async def read_rising_hotsearches(
+    db: AsyncIOMotorClient = Depends(get_database),
+    platform: Optional[str] = Query(None, description="平台标识, 为空时合并所有平台"),
+    limit: int = Query(20, description="返回记录数")
+):
+    """获取上升最快的热搜(排名上升、热度增长及新上榜)"""
+    rising = await trending.get_rising(db, platform, limit)
+    return json_response(dumps_list(RisingHotSearchList, rising, total=len(rising)))
+
+
+@router.get("/cache/stats", response_model=HotSearchCacheStats)
+async def read_cache_stats(
+    redis: Redis = Depends(get_redis)
+):
+    """获取热搜列表缓存命中统计"""
+    return await cache.get_cache_stats(redis)
 
 
 @router.get("/{hotsearch_id}", response_model=HotSearchResponse)
@@ -57,45 +144,83 @@ async def read_hotsearch(
 @router.post("/", response_model=HotSearchResponse)
 async def create_hotsearch(
     hotsearch_data: HotSearchCreate,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """创建热搜"""
-    return await hotsearch.create_hotsearch(db, hotsearch_data)
+    try:
+        db_hotsearch = await hotsearch.create_hotsearch(db, hotsearch_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=DUPLICATE_HOTSEARCH_DETAIL)
+    await cache.invalidate_hotsearch_cache(redis, hotsearch_data.platform)
+    return db_hotsearch
+
+
+@router.post("/bulk", response_model=HotSearchBulkResult)
+async def bulk_create_hotsearches(
+    bulk_data: HotSearchBulkCreate,
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
+):
+    """批量写入热搜, 供外部数据源推送; 同一次抓取重复推送时更新已有数据"""
+    items = [item.dict() for item in bulk_data.items]
+    result = await ingest.bulk_upsert_hotsearches(db, items, bulk_data.crawled_at or datetime.now())
+    for platform in {item["platform"] for item in items}:
+        await cache.invalidate_hotsearch_cache(redis, platform)
+    return result
 
 
 @router.put("/{hotsearch_id}", response_model=HotSearchResponse)
 async def update_hotsearch(
     hotsearch_id: str,
     hotsearch_data: HotSearchUpdate,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """更新热搜"""
-    db_hotsearch = await hotsearch.get_hotsearch(db, hotsearch_id)
+    try:
+        db_hotsearch = await hotsearch.update_hotsearch(db, hotsearch_id, hotsearch_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=DUPLICATE_HOTSEARCH_DETAIL)
     if db_hotsearch is None:
         raise HTTPException(status_code=404, detail="热搜数据不存在")
     
-    return await hotsearch.update_hotsearch(db, hotsearch_id, hotsearch_data)
+    await cache.invalidate_hotsearch_cache(redis, db_hotsearch.get("platform"))
+    return db_hotsearch
 
 
 @router.delete("/{hotsearch_id}", response_model=dict)
 async def delete_hotsearch(
     hotsearch_id: str,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """删除热搜"""
-    db_hotsearch = await hotsearch.get_hotsearch(db, hotsearch_id)
+    db_hotsearch = await hotsearch.delete_hotsearch(db, hotsearch_id)
     if db_hotsearch is None:
         raise HTTPException(status_code=404, detail="热搜数据不存在")
     
-    success = await hotsearch.delete_hotsearch(db, hotsearch_id)
-    return {"success": success}
+    await cache.invalidate_hotsearch_cache(redis, db_hotsearch.get("platform"))
+    return {"success": True}
 
 
 @router.post("/search", response_model=HotSearchList)
 async def search_hotsearches(
     params: HotSearchQueryParams,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """搜索热搜"""
-    results = await hotsearch.search_hotsearches(db, params)
-    return {"data": results, "total": len(results)} 
\ No newline at end of file
+    try:
+        results, total = await asyncio.gather(
+            hotsearch.search_hotsearches(db, params),
+            hotsearch.count_search_hotsearches(db, redis, params)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(dumps_list(
+        HotSearchList,
+        results,
+        total=total,
+        next_cursor=get_next_cursor(results, params.limit, hotsearch.get_search_sort(params))
+    )) 
\ No newline at end of file
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import Redis
 
+from app.api.responses import json_response
+from app.core.serialization import dumps_list
 from app.db.mongodb import get_database
+from app.db.redis import get_redis
 from app.services import platform
+from app.services.registry import platform_registry, publish_platform_change
 from app.schemas.platform import (
     PlatformResponse, 
     PlatformList, 
@@ -21,7 +26,7 @@ async def read_platforms(
 ):
     """获取所有平台"""
     platforms = await platform.get_all_platforms(db, skip, limit)
-    return {"data": platforms, "total": len(platforms)}
+    return json_response(dumps_list(PlatformList, platforms, total=len(platforms)))
 
 
 @router.get("/active", response_model=PlatformList)
@@ -29,8 +34,9 @@ async def read_active_platforms(
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """获取所有激活的平台"""
-    platforms = await platform.get_active_platforms(db)
-    return {"data": platforms, "total": len(platforms)}
+    await platform_registry.ensure_loaded(db)
+    platforms = platform_registry.get_active()
+    return json_response(dumps_list(PlatformList, platforms, total=len(platforms)))
 
 
 @router.get("/{platform_id}", response_model=PlatformResponse)
@@ -39,7 +45,8 @@ async def read_platform(
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """获取单个平台"""
-    db_platform = await platform.get_platform(db, platform_id=platform_id)
+    await platform_registry.ensure_loaded(db)
+    db_platform = platform_registry.get_by_id(platform_id)
     if db_platform is None:
         raise HTTPException(status_code=404, detail="平台不存在")
     return db_platform
@@ -51,7 +58,8 @@ async def read_platform_by_name(
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """通过名称获取平台"""
-    db_platform = await platform.get_platform(db, platform_name=platform_name)
+    await platform_registry.ensure_loaded(db)
+    db_platform = platform_registry.get(platform_name)
     if db_platform is None:
         raise HTTPException(status_code=404, detail="平台不存在")
     return db_platform
@@ -60,44 +68,57 @@ async def read_platform_by_name(
 @router.post("/", response_model=PlatformResponse)
 async def create_platform(
     platform_data: PlatformCreate,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """创建平台"""
-    return await platform.create_platform(db, platform_data)
+    db_platform = await platform.create_platform(db, platform_data)
+    platform_registry.put(db_platform)
+    await publish_platform_change(redis, db_platform["name"])
+    return db_platform
 
 
 @router.put("/{platform_id}", response_model=PlatformResponse)
 async def update_platform(
     platform_id: str,
     platform_data: PlatformUpdate,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """更新平台"""
-    db_platform = await platform.get_platform(db, platform_id=platform_id)
+    db_platform = await platform.update_platform(db, platform_id, platform_data)
     if db_platform is None:
         raise HTTPException(status_code=404, detail="平台不存在")
     
-    return await platform.update_platform(db, platform_id, platform_data)
+    platform_registry.put(db_platform)
+    await publish_platform_change(redis, db_platform["name"])
+    return db_platform
 
 
 @router.delete("/{platform_id}", response_model=dict)
 async def delete_platform(
     platform_id: str,
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """删除平台"""
-    db_platform = await platform.get_platform(db, platform_id=platform_id)
+    db_platform = await platform.delete_platform(db, platform_id)
     if db_platform is None:
         raise HTTPException(status_code=404, detail="平台不存在")
     
-    success = await platform.delete_platform(db, platform_id)
-    return {"success": success}
+    platform_registry.remove(db_platform)
+    await publish_platform_change(redis, db_platform["name"])
+    return {"success": True}
 
 
 @router.post("/initialize", response_model=PlatformList)
 async def initialize_platforms(
-    db: AsyncIOMotorClient = Depends(get_database)
+    db: AsyncIOMotorClient = Depends(get_database),
+    redis: Redis = Depends(get_redis)
 ):
     """初始化默认平台"""
     platforms = await platform.initialize_default_platforms(db)
+    for db_platform in platforms:
+        platform_registry.put(db_platform)
+    await publish_platform_change(redis, "*")
     return {"data": platforms, "total": len(platforms)}
\ No newline at end of file
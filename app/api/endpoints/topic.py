@@ -0,0 +1,50 @@
+from typing import Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.db.mongodb import get_database
+from app.services import topic, cluster
+from app.schemas.topic import TopicDetail, TopicList, ClusterList
+
+router = APIRouter()
+
+
+@router.get("/platform/{platform}", response_model=TopicList)
+async def read_platform_topics(
+    platform: str = Path(..., description="平台标识: weibo, baidu, zhihu, douyin, bilibili"),
+    db: AsyncIOMotorClient = Depends(get_database),
+    skip: int = Query(0, description="跳过记录数"),
+    limit: int = Query(100, description="返回记录数")
+):
+    """按最近上榜时间获取平台话题"""
+    topics = await topic.get_topics(db, platform, skip, limit)
+    return {"data": topics, "total": len(topics)}
+
+
+@router.get("/clusters", response_model=ClusterList)
+async def read_clusters(
+    db: AsyncIOMotorClient = Depends(get_database),
+    platform: Optional[str] = Query(None, description="仅返回涉及该平台的聚类"),
+    limit: int = Query(50, description="返回记录数")
+):
+    """获取各平台描述同一事件的跨平台热搜聚类"""
+    doc = await cluster.get_clusters(db, platform, limit)
+    if doc is None:
+        return {"data": [], "total": 0}
+    return {"data": doc["clusters"], "total": len(doc["clusters"]), "computed_at": doc["computed_at"]}
+
+
+@router.get("/{topic_id}", response_model=TopicDetail)
+async def read_topic_trajectory(
+    topic_id: str = Path(..., description="话题ID"),
+    db: AsyncIOMotorClient = Depends(get_database),
+    start_date: Optional[datetime] = Query(None, description="开始时间"),
+    end_date: Optional[datetime] = Query(None, description="结束时间")
+):
+    """获取话题的排名与热度走势"""
+    db_topic = await topic.get_topic_trajectory(db, topic_id, start_date, end_date)
+    if db_topic is None:
+        raise HTTPException(status_code=404, detail="话题不存在")
+    return db_topic
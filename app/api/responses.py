@@ -0,0 +1,6 @@
+from fastapi.responses import Response
+
+
+def json_response(payload: bytes) -> Response:
+    """直接返回已序列化的JSON, 跳过FastAPI按response_model的校验及编码"""
+    return Response(content=payload, media_type="application/json")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import hotsearch, platform
+from app.api.endpoints import hotsearch, platform, topic, analytics
 
 api_router = APIRouter()
 
@@ -14,4 +14,16 @@ api_router.include_router(
     platform.router,
     prefix="/platform",
     tags=["平台"]
-) 
\ No newline at end of file
+) 
+
+api_router.include_router(
+    topic.router,
+    prefix="/topic",
+    tags=["话题"]
+)
+
+api_router.include_router(
+    analytics.router,
+    prefix="/analytics",
+    tags=["统计分析"]
+)
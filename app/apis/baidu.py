@@ -0,0 +1,34 @@
+from typing import List, Dict, Any
+from urllib.parse import quote
+
+from app.apis.base import BaseCrawler, register_crawler
+
+
+@register_crawler
+class BaiduAPI(BaseCrawler):
+    """百度热搜API客户端"""
+
+    platform = "baidu"
+    api_url = "https://top.baidu.com/api/board?platform=wise&tab=realtime"
+    headers = {"Referer": "https://top.baidu.com/"}
+
+    def parse(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """解析百度热搜, 条目位于data.cards[0].content, 移动端接口会再嵌套一层content"""
+        content = data["data"]["cards"][0]["content"]
+        if content and "content" in content[0]:
+            content = [item for group in content for item in group["content"]]
+        return [
+            {
+                "title": item.get("word") or item.get("query"),
+                "url": item.get("rawUrl") or item.get("url"),
+                "hot_value": item.get("hotScore"),
+                "content": item.get("desc")
+            }
+            for item in content
+            # 置顶条目不参与排名
+            if not item.get("isTop")
+        ]
+
+    def build_url(self, entry: Dict[str, Any]) -> str:
+        """搜索结果页链接"""
+        return f"https://www.baidu.com/s?wd={quote(entry['title'])}"
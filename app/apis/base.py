@@ -0,0 +1,319 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+from urllib.parse import urlsplit
+
+import aiohttp
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.apis.session import get_http_session
+from app.apis.resilience import CircuitBreaker, RateLimiter, call_with_retries
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+)
+
+# 内置的各平台响应样本, 用于离线运行及基准测试
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+# 抓取状态键: Hash, 保存上一次成功抓取的ETag、Last-Modified及内容摘要, 由所有Worker进程共享
+STATE_KEY_PREFIX = "crawler:state"
+
+# 参与内容摘要计算的字段, 即写入数据库的全部条目字段(不含时间戳)
+CONTENT_HASH_FIELDS = ("title", "url", "rank", "hot_value", "category", "content", "tags")
+
+_HOT_VALUE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([万亿wW]?)")
+_HOT_VALUE_UNITS = {"万": 10_000, "w": 10_000, "W": 10_000, "亿": 100_000_000}
+
+
+class CrawlerError(Exception):
+    """平台抓取失败"""
+
+
+class TransientError(CrawlerError):
+    """可重试的抓取失败: 网络异常、超时、HTTP 5xx或429"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析以秒为单位的Retry-After响应头"""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class NotModified(Exception):
+    """榜单与上一次抓取相同(HTTP 304或内容摘要一致), 无需解析及存储"""
+
+
+def compute_content_hash(items: List[Dict[str, Any]]) -> str:
+    """计算规范化后榜单的内容摘要"""
+    payload = [[item.get(field) for field in CONTENT_HASH_FIELDS] for item in items]
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+
+def parse_hot_value(value: Any) -> Optional[int]:
+    """
+    将平台返回的热度统一为整数
+    支持数字及"1234万热度"、"1.2亿"等文本, 无法解析时返回None
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _HOT_VALUE_PATTERN.search(str(value).replace(",", ""))
+    if not match:
+        return None
+    return int(float(match.group(1)) * _HOT_VALUE_UNITS.get(match.group(2), 1))
+
+
+class BaseCrawler(ABC):
+    """
+    平台热搜抓取基类
+    抓取流程: fetch(请求原始响应) -> parse(平台相关的解析) -> normalize(统一为热搜文档结构)
+    子类只需声明platform、api_url并实现parse, 连接池、超时、异常处理及字段规范化由基类统一完成
+    """
+
+    platform: str = ""
+    api_url: str = ""
+    headers: Dict[str, str] = {}
+    category: str = "general"
+
+    def __init__(self):
+        self.logger = logging.getLogger(f"{self.platform}_api")
+        # 上一次成功抓取的状态, 及本次抓取待提交的状态
+        self.state: Dict[str, str] = {}
+        self._pending: Dict[str, str] = {}
+        self._redis: Optional[Redis] = None
+
+    @property
+    def state_key(self) -> str:
+        return f"{STATE_KEY_PREFIX}:{self.platform}"
+
+    async def load_state(self, redis: Redis):
+        """读取上一次成功抓取的状态, 读取失败时按无状态处理(完整抓取)"""
+        self._redis = redis
+        try:
+            raw = await redis.hgetall(self.state_key)
+            self.state = {k.decode(): v.decode() for k, v in raw.items()}
+        except RedisError as e:
+            self.logger.warning(f"读取抓取状态失败: {e}")
+            self.state = {}
+
+    async def commit_state(self):
+        """榜单存储成功后提交本次抓取的状态, 存储失败时不提交, 以免重试被误判为未变化"""
+        self.state.update(self._pending)
+        self._pending = {}
+        if self._redis is None or not self.state:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hset(self.state_key, mapping=self.state)
+            pipe.expire(self.state_key, settings.CRAWLER_STATE_TTL)
+            await pipe.execute()
+        except RedisError as e:
+            self.logger.warning(f"保存抓取状态失败: {e}")
+
+    def get_headers(self) -> Dict[str, str]:
+        """请求头"""
+        return {"User-Agent": DEFAULT_USER_AGENT, "Accept": "application/json, text/plain, */*", **self.headers}
+
+    def get_conditional_headers(self) -> Dict[str, str]:
+        """根据上一次响应的ETag/Last-Modified构建条件请求头"""
+        if not settings.CRAWLER_CONDITIONAL_REQUESTS:
+            return {}
+        headers = {}
+        if self.state.get("etag"):
+            headers["If-None-Match"] = self.state["etag"]
+        if self.state.get("last_modified"):
+            headers["If-Modified-Since"] = self.state["last_modified"]
+        return headers
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Any:
+        """
+        请求平台接口并返回解码后的JSON
+        上一次响应带有ETag/Last-Modified时发送条件请求;
+        设置了CRAWLER_FIXTURE_DIR时读取本地样本, 不发起网络请求
+        :raises NotModified: 服务端返回304
+        :raises TransientError: 网络异常、超时、HTTP 5xx或429
+        :raises CrawlerError: 其他非200状态码, 或响应不是合法的JSON(如验证码页面)
+        """
+        if settings.CRAWLER_FIXTURE_DIR:
+            return self.load_fixture(Path(settings.CRAWLER_FIXTURE_DIR))
+
+        headers = {**self.get_headers(), **self.get_conditional_headers()}
+        try:
+            async with session.get(self.api_url, headers=headers) as response:
+                if response.status == 304:
+                    raise NotModified("HTTP 304")
+                if response.status == 429 or response.status >= 500:
+                    raise TransientError(
+                        f"API请求失败: HTTP {response.status}",
+                        _parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                if response.status != 200:
+                    raise CrawlerError(f"API请求失败: HTTP {response.status}")
+                try:
+                    # 部分平台返回的Content-Type不是application/json
+                    data = await response.json(content_type=None)
+                except ValueError as e:
+                    raise CrawlerError(f"API响应不是合法的JSON: {e}") from e
+                for header, field in (("ETag", "etag"), ("Last-Modified", "last_modified")):
+                    if response.headers.get(header):
+                        self._pending[field] = response.headers[header]
+                return data
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransientError(f"API请求失败: {e!r}") from e
+
+    async def request(self, session: aiohttp.ClientSession) -> Any:
+        """
+        经熔断、限流及重试保护的fetch
+        已通过load_state关联Redis时, 请求前检查平台熔断状态并按上游主机限流, 重试耗尽后计入熔断失败次数;
+        可重试的失败按指数退避(带抖动)重试, 最多CRAWLER_RETRY_ATTEMPTS次
+        :raises CircuitOpenError: 平台处于熔断状态
+        """
+        if self._redis is None or settings.CRAWLER_FIXTURE_DIR:
+            return await call_with_retries(lambda: self.fetch(session), (TransientError,))
+
+        breaker = CircuitBreaker(self._redis, self.platform)
+        limiter = RateLimiter(self._redis)
+        host = urlsplit(self.api_url).hostname
+
+        async def attempt():
+            await limiter.acquire(host)
+            return await self.fetch(session)
+
+        await breaker.check()
+        try:
+            data = await call_with_retries(attempt, (TransientError,))
+        except NotModified:
+            await breaker.record_success()
+            raise
+        except CrawlerError:
+            await breaker.record_failure()
+            raise
+        await breaker.record_success()
+        return data
+
+    def load_fixture(self, directory: Path = FIXTURE_DIR) -> Any:
+        """读取平台的本地响应样本"""
+        with open(directory / f"{self.platform}.json", encoding="utf-8") as f:
+            return json.load(f)
+
+    @abstractmethod
+    def parse(self, data: Any) -> List[Dict[str, Any]]:
+        """
+        从原始响应中提取条目, 由子类实现
+        :return: 按榜单顺序排列的条目, 至少包含title, 可包含url、hot_value、rank、category、content、tags
+        """
+
+    def build_url(self, entry: Dict[str, Any]) -> str:
+        """条目未提供链接时的默认链接"""
+        return ""
+
+    def normalize(
+        self,
+        entries: List[Dict[str, Any]],
+        crawled_at: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        将解析出的条目统一为热搜文档结构
+        去除空标题及同一榜单中的重复标题, 排名按榜单顺序重新编号, 同一次抓取的条目使用相同的时间
+        """
+        # 使用BSON日期类型存储, 以支持排序、范围查询及TTL索引
+        now = crawled_at or datetime.now()
+        items = []
+        seen = set()
+        for entry in entries:
+            title = (entry.get("title") or "").strip()
+            if not title or title in seen:
+                continue
+            seen.add(title)
+            items.append({
+                "platform": self.platform,
+                "title": title,
+                "url": entry.get("url") or self.build_url(entry),
+                "rank": len(items) + 1,
+                "hot_value": parse_hot_value(entry.get("hot_value")),
+                "category": entry.get("category") or self.category,
+                "content": entry.get("content") or None,
+                "tags": list(entry.get("tags") or []),
+                "created_at": now,
+                "updated_at": now
+            })
+        return items
+
+    async def fetch_items(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        crawled_at: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        执行抓取流程
+        已通过load_state加载状态时, 榜单内容摘要与上一次成功抓取一致则视为未变化
+        :raises NotModified: 榜单未变化, 调用方应跳过存储及后续处理
+        :raises CrawlerError: 请求或解析失败
+        """
+        self._pending = {}
+        data = await self.request(session or get_http_session())
+        try:
+            entries = self.parse(data)
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+            raise CrawlerError(f"解析API数据失败: {e}") from e
+        items = self.normalize(entries, crawled_at)
+
+        content_hash = compute_content_hash(items)
+        if content_hash == self.state.get("content_hash"):
+            # 内容未变但ETag等可能已更新, 提交后下次可直接命中304
+            await self.commit_state()
+            raise NotModified("内容摘要未变化")
+        self._pending["content_hash"] = content_hash
+
+        self.logger.info(f"成功提取到 {len(items)} 条热搜数据")
+        return items
+
+    async def fetch_hot_search(
+        self,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        获取热搜, 失败时返回空列表
+        :param session: aiohttp会话, 为None时使用共享会话
+        """
+        try:
+            return await self.fetch_items(session)
+        except Exception as e:
+            self.logger.error(f"获取{self.platform}热搜失败: {e}")
+            return []
+
+
+# 抓取器注册表: 平台标识 -> 抓取器类
+CRAWLERS: Dict[str, Type[BaseCrawler]] = {}
+
+
+def register_crawler(cls: Type[BaseCrawler]) -> Type[BaseCrawler]:
+    """
+    注册抓取器的类装饰器
+    :raises TypeError: 抓取器未实现parse等抽象方法, 或未声明platform
+    """
+    if inspect.isabstract(cls):
+        raise TypeError(f"抓取器{cls.__name__}未实现抽象方法: {', '.join(sorted(cls.__abstractmethods__))}")
+    if not cls.platform:
+        raise TypeError(f"抓取器{cls.__name__}未声明platform")
+    CRAWLERS[cls.platform] = cls
+    return cls
@@ -0,0 +1,30 @@
+import argparse
+import time
+from typing import Dict
+
+from app.apis.base import FIXTURE_DIR
+from app.apis.registry import get_crawlers
+
+
+def benchmark_crawlers(rounds: int = 1000) -> Dict[str, dict]:
+    """
+    基于本地响应样本对各平台的解析及规范化进行基准测试, 不发起网络请求
+    :return: 平台 -> {"items": 条目数, "avg_ms": 平均耗时(毫秒)}
+    """
+    results = {}
+    for platform, crawler in get_crawlers().items():
+        data = crawler.load_fixture(FIXTURE_DIR)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            items = crawler.normalize(crawler.parse(data))
+        elapsed = time.perf_counter() - start
+        results[platform] = {"items": len(items), "avg_ms": round(elapsed / rounds * 1000, 4)}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="平台抓取器解析基准测试(离线)")
+    parser.add_argument("--rounds", type=int, default=1000, help="每个平台的执行轮数")
+    args = parser.parse_args()
+    for platform, result in benchmark_crawlers(args.rounds).items():
+        print(f"{platform:<10} {result['items']:>4}条  {result['avg_ms']:.4f}ms/次")
@@ -0,0 +1,27 @@
+from typing import List, Dict, Any
+
+from app.apis.base import BaseCrawler, register_crawler
+
+
+@register_crawler
+class BilibiliAPI(BaseCrawler):
+    """B站热门排行榜API客户端"""
+
+    platform = "bilibili"
+    api_url = "https://api.bilibili.com/x/web-interface/ranking/v2?rid=0&type=all"
+    headers = {"Referer": "https://www.bilibili.com/v/popular/rank/all"}
+
+    def parse(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """解析B站排行榜, 热度取播放量, 分区名作为标签"""
+        if data.get("code") != 0:
+            raise ValueError(f"接口返回错误: {data.get('message')}")
+        return [
+            {
+                "title": item.get("title"),
+                "url": f"https://www.bilibili.com/video/{item['bvid']}" if item.get("bvid") else item.get("short_link_v2"),
+                "hot_value": item.get("stat", {}).get("view"),
+                "content": item.get("desc"),
+                "tags": [item["tname"]] if item.get("tname") else []
+            }
+            for item in data["data"]["list"]
+        ]
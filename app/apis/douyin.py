@@ -0,0 +1,29 @@
+from typing import List, Dict, Any
+from urllib.parse import quote
+
+from app.apis.base import BaseCrawler, register_crawler
+
+
+@register_crawler
+class DouyinAPI(BaseCrawler):
+    """抖音热点API客户端"""
+
+    platform = "douyin"
+    api_url = "https://www.douyin.com/aweme/v1/web/hot/search/list/?device_platform=webapp&aid=6383"
+    headers = {"Referer": "https://www.douyin.com/hot"}
+
+    def parse(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """解析抖音热点, 条目位于data.word_list, 按position排序"""
+        word_list = sorted(data["data"]["word_list"], key=lambda x: x.get("position", 0))
+        return [
+            {
+                "title": item.get("word"),
+                "url": f"https://www.douyin.com/hot/{item['sentence_id']}" if item.get("sentence_id") else None,
+                "hot_value": item.get("hot_value")
+            }
+            for item in word_list
+        ]
+
+    def build_url(self, entry: Dict[str, Any]) -> str:
+        """搜索结果页链接"""
+        return f"https://www.douyin.com/search/{quote(entry['title'])}"
@@ -0,0 +1,21 @@
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.apis.base import BaseCrawler, CRAWLERS
+# 导入各平台模块以完成注册
+from app.apis import weibo, baidu, zhihu, douyin, bilibili  # noqa: F401
+
+
+def get_crawler(platform: str) -> Optional[BaseCrawler]:
+    """
+    获取平台抓取器
+    :return: 平台不在settings.PLATFORMS中或尚未实现时返回None
+    """
+    if platform not in settings.PLATFORMS or platform not in CRAWLERS:
+        return None
+    return CRAWLERS[platform]()
+
+
+def get_crawlers() -> Dict[str, BaseCrawler]:
+    """获取settings.PLATFORMS中所有已实现的抓取器"""
+    return {platform: CRAWLERS[platform]() for platform in settings.PLATFORMS if platform in CRAWLERS}
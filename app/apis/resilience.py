@@ -0,0 +1,188 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+
+# 键设计(所有Worker进程共享):
+#   crawler:ratelimit:{host}        -> Hash {tokens, ts}, 上游主机的令牌桶, 由Lua脚本原子地补充及预约
+#   crawler:breaker:{platform}      -> Hash {failures, open_until}, 平台的连续失败次数及熔断截止时间
+#   crawler:breaker:{platform}:probe -> String, 熔断冷却结束后只允许一个试探请求
+RATE_LIMIT_PREFIX = "crawler:ratelimit"
+BREAKER_PREFIX = "crawler:breaker"
+
+T = TypeVar("T")
+
+# 令牌桶: 按经过的时间补充令牌后预约一个令牌, 令牌不足时允许为负, 返回需要等待的秒数;
+# 预约制保证并发的请求按到达顺序依次放行, 一次往返即可完成
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class CircuitOpenError(Exception):
+    """平台处于熔断状态, 请求未发出"""
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    指数退避(全抖动): 第attempt次重试前等待[0, min(cap, base * 2^attempt)]内的随机时间
+    随机化使多个Worker的重试错开, 避免同时冲击刚恢复的上游
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+async def call_with_retries(
+    func: Callable[[], Awaitable[T]],
+    retry_on: Tuple[Type[Exception], ...],
+    attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None
+) -> T:
+    """
+    调用func, 抛出retry_on中的异常时按指数退避重试
+    异常带有retry_after属性(如响应的Retry-After)时至少等待该时间
+    :param attempts: 最大调用次数(含首次), 默认为settings.CRAWLER_RETRY_ATTEMPTS
+    :raises: 最后一次调用的异常
+    """
+    attempts = attempts or settings.CRAWLER_RETRY_ATTEMPTS
+    base_delay = settings.CRAWLER_RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = settings.CRAWLER_RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except retry_on as e:
+            if attempt + 1 >= attempts:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            delay = min(max(delay, getattr(e, "retry_after", None) or 0), max_delay)
+            logger.warning(f"请求失败({e}), {delay:.2f}秒后进行第{attempt + 1}次重试")
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    按上游主机的令牌桶限流, 状态保存在Redis中, 所有Worker进程共享同一个速率
+    每秒补充rate个令牌, 最多积累burst个, 允许短时突发
+    """
+
+    def __init__(self, redis: Redis, rate: Optional[float] = None, burst: Optional[int] = None):
+        self.redis = redis
+        self.rate = settings.CRAWLER_RATE_LIMIT if rate is None else rate
+        self.burst = burst or settings.CRAWLER_RATE_BURST
+        self._script = redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def reserve(self, host: str) -> float:
+        """
+        预约一个令牌
+        :return: 需要等待的秒数, 未启用限流或Redis不可用时为0
+        """
+        if self.rate <= 0:
+            return 0.0
+        try:
+            wait = await self._script(
+                keys=[f"{RATE_LIMIT_PREFIX}:{host}"],
+                args=[self.rate, self.burst, time.time()]
+            )
+            return float(wait)
+        except RedisError as e:
+            logger.warning(f"限流状态读取失败, 本次不限流: {e}")
+            return 0.0
+
+    async def acquire(self, host: str):
+        """等待直到获得令牌"""
+        wait = await self.reserve(host)
+        if wait > 0:
+            logger.debug(f"上游[{host}]限流, 等待{wait:.2f}秒")
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    平台熔断器, 状态保存在Redis中, 所有Worker进程共享
+    - 关闭: 正常请求, 连续失败达到threshold次后打开
+    - 打开: cooldown秒内直接拒绝请求, 不再请求已经故障的上游
+    - 半开: 冷却结束后只放行一个试探请求, 成功则关闭, 失败则重新打开
+    Redis不可用时不熔断
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        threshold: Optional[int] = None,
+        cooldown: Optional[int] = None
+    ):
+        self.redis = redis
+        self.name = name
+        self.key = f"{BREAKER_PREFIX}:{name}"
+        self.probe_key = f"{self.key}:probe"
+        self.threshold = threshold or settings.CRAWLER_BREAKER_THRESHOLD
+        self.cooldown = cooldown or settings.CRAWLER_BREAKER_COOLDOWN
+        self._dirty = True
+
+    async def check(self):
+        """
+        请求前检查熔断状态
+        :raises CircuitOpenError: 熔断打开, 或半开状态下已有试探请求
+        """
+        try:
+            state = await self.redis.hgetall(self.key)
+            self._dirty = bool(state)
+            open_until = state.get(b"open_until")
+            if open_until is None:
+                return
+            remaining = float(open_until) - time.time()
+            if remaining > 0:
+                raise CircuitOpenError(f"平台[{self.name}]已熔断, {remaining:.0f}秒后重试")
+            if not await self.redis.set(self.probe_key, 1, nx=True, ex=self.cooldown):
+                raise CircuitOpenError(f"平台[{self.name}]熔断半开, 试探请求进行中")
+            logger.info(f"平台[{self.name}]熔断冷却结束, 发送试探请求")
+        except RedisError as e:
+            logger.warning(f"熔断状态读取失败: {e}")
+
+    async def record_success(self):
+        """请求成功, 清除失败计数并关闭熔断"""
+        if not self._dirty:
+            return
+        try:
+            await self.redis.delete(self.key, self.probe_key)
+            self._dirty = False
+        except RedisError as e:
+            logger.warning(f"熔断状态更新失败: {e}")
+
+    async def record_failure(self):
+        """请求失败(重试耗尽), 连续失败达到阈值时打开熔断"""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hincrby(self.key, "failures", 1)
+            pipe.expire(self.key, settings.CRAWLER_STATE_TTL)
+            failures, _ = await pipe.execute()
+            self._dirty = True
+            if failures >= self.threshold:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hset(self.key, "open_until", time.time() + self.cooldown)
+                pipe.delete(self.probe_key)
+                await pipe.execute()
+                logger.warning(f"平台[{self.name}]连续失败{failures}次, 熔断{self.cooldown}秒")
+        except RedisError as e:
+            logger.warning(f"熔断状态更新失败: {e}")
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Optional
+
+import aiohttp
+from loguru import logger
+
+from app.core.config import settings
+
+
+class HTTPSessionManager:
+    """
+    平台API客户端共享的aiohttp会话管理器
+    同一事件循环内复用一个带连接池的会话, 保持长连接并缓存DNS解析结果
+    """
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """创建会话"""
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_SIZE,
+            limit_per_host=settings.HTTP_POOL_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.HTTP_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+        )
+        logger.info(
+            f"创建HTTP会话(连接池: {settings.HTTP_POOL_SIZE}, "
+            f"单主机: {settings.HTTP_POOL_PER_HOST}, 超时: {settings.HTTP_TIMEOUT}s)"
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        获取当前事件循环的共享会话
+        会话与事件循环绑定, 循环变化或会话已关闭时重新创建
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            if self.session is not None and not self.session.closed:
+                logger.warning("事件循环已变化, 丢弃旧的HTTP会话")
+            self.session = self._create_session()
+            self._loop = loop
+        return self.session
+
+    async def close(self):
+        """关闭会话及连接池"""
+        if self.session is not None and not self.session.closed:
+            logger.info("正在关闭HTTP会话...")
+            await self.session.close()
+            logger.info("HTTP会话已关闭")
+        self.session = None
+        self._loop = None
+
+
+http_session = HTTPSessionManager()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """获取共享的HTTP会话"""
+    return http_session.get_session()
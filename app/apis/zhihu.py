@@ -0,0 +1,25 @@
+from typing import List, Dict, Any
+
+from app.apis.base import BaseCrawler, register_crawler
+
+
+@register_crawler
+class ZhihuAPI(BaseCrawler):
+    """知乎热榜API客户端"""
+
+    platform = "zhihu"
+    api_url = "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total?limit=50"
+    headers = {"Referer": "https://www.zhihu.com/hot"}
+
+    def parse(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """解析知乎热榜, 热度为"1234 万热度"格式的文本"""
+        entries = []
+        for item in data["data"]:
+            target = item.get("target", {})
+            entries.append({
+                "title": target.get("title"),
+                "url": f"https://www.zhihu.com/question/{target['id']}" if target.get("id") else None,
+                "hot_value": item.get("detail_text"),
+                "content": target.get("excerpt")
+            })
+        return entries
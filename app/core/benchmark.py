@@ -0,0 +1,85 @@
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.core.serialization import dumps_list
+from app.schemas.hotsearch import HotSearchList
+
+
+def _make_documents(size: int) -> List[dict]:
+    """构造与hot_searches集合结构一致的文档"""
+    now = datetime.now().replace(microsecond=123000)
+    return [
+        {
+            "_id": ObjectId(),
+            "platform": "weibo",
+            "title": f"热搜标题示例第{i}条",
+            "url": f"https://s.weibo.com/weibo?q=%23{i}%23",
+            "rank": i + 1,
+            "hot_value": 1_000_000 - i,
+            "category": "general",
+            "content": "热搜内容摘要" * 3,
+            "tags": ["热点", "社会"],
+            "search_grams": ["热搜", "搜标", "标题"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(size)
+    ]
+
+
+def _stdlib_dumps(docs: List[dict]) -> bytes:
+    """FastAPI默认路径: 逐条校验为响应模型后由标准库json编码"""
+    result = HotSearchList(data=docs, total=len(docs))
+    return json.dumps(result.model_dump(mode="json"), ensure_ascii=False).encode()
+
+
+def _model_dumps(docs: List[dict]) -> bytes:
+    """逐条校验为响应模型后由Pydantic序列化(API_FAST_SERIALIZATION关闭时的路径)"""
+    return HotSearchList(data=docs, total=len(docs)).model_dump_json().encode()
+
+
+def _fast_dumps(docs: List[dict]) -> bytes:
+    """文档直接映射为响应字段后由orjson序列化"""
+    return dumps_list(HotSearchList, docs, total=len(docs))
+
+
+def benchmark_serialization(sizes=(100, 1000), rounds: int = 200) -> Dict[int, Dict[str, float]]:
+    """
+    对热搜列表响应的序列化进行基准测试
+    :return: 每页条数 -> 各序列化方式的平均耗时(毫秒)
+    """
+    fast_serialization = settings.API_FAST_SERIALIZATION
+    settings.API_FAST_SERIALIZATION = True
+    modes = {"stdlib": _stdlib_dumps, "pydantic": _model_dumps, "orjson": _fast_dumps}
+    results = {}
+    try:
+        for size in sizes:
+            docs = _make_documents(size)
+            results[size] = {}
+            for name, dumps in modes.items():
+                dumps(docs)
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    dumps(docs)
+                results[size][name] = round((time.perf_counter() - start) / rounds * 1000, 4)
+    finally:
+        settings.API_FAST_SERIALIZATION = fast_serialization
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="热搜列表响应序列化基准测试")
+    parser.add_argument("--rounds", type=int, default=200, help="每种方式的执行轮数")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="每页条数")
+    args = parser.parse_args()
+    for size, result in benchmark_serialization(args.sizes, args.rounds).items():
+        baseline = result["stdlib"]
+        print(f"{size}条/页")
+        for name, avg_ms in result.items():
+            print(f"  {name:<10} {avg_ms:.4f}ms/次  {baseline / avg_ms:.1f}x")
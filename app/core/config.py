@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import AnyHttpUrl, Field
 from pydantic_settings import BaseSettings
 import os
@@ -29,10 +29,14 @@ class Settings(BaseSettings):
         default="mongodb://localhost:27017/news_trending",
         description="MongoDB连接字符串"
     )
+    MONGODB_ENSURE_INDEXES: bool = True  # 启动时自动创建缺失的索引
     REDIS_URL: str = Field(
         default="redis://localhost:6379/0",
         description="Redis连接字符串"
     )
+    REDIS_MAX_CONNECTIONS: int = 50  # Redis连接池大小
+    REDIS_SOCKET_TIMEOUT: float = 5.0  # Redis连接及读写超时(秒)
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # 空闲连接健康检查间隔(秒)
     
     # Celery配置
     CELERY_BROKER_URL: str = Field(
@@ -43,11 +47,87 @@ class Settings(BaseSettings):
         default="redis://localhost:6379/2",
         description="Celery Result Backend URL"
     )
+    # 任务队列: 各平台抓取任务进入"{前缀}.{平台}"队列, 清理、汇总重算进入维护队列, 其余任务进入默认队列
+    CELERY_DEFAULT_QUEUE: str = "default"
+    CELERY_FETCH_QUEUE_PREFIX: str = "fetch"
+    CELERY_MAINTENANCE_QUEUE: str = "maintenance"
+    # Worker配置: 配置名 -> 消费的队列及并发数, "fetch.*"表示所有平台的抓取队列
+    CELERY_WORKER_PROFILES: Dict[str, Dict[str, Any]] = {
+        "all": {"queues": ["default", "fetch.*", "maintenance"]},
+        "scheduler": {"queues": ["default"], "concurrency": 2},
+        "fetch": {"queues": ["fetch.*"]},
+        "maintenance": {"queues": ["maintenance"], "concurrency": 1},
+    }
+    # 当前Worker使用的配置名, 也可直接指定以逗号分隔的队列(如fetch.weibo), 为空时消费所有队列
+    CELERY_WORKER_PROFILE: Optional[str] = None
     
     # 数据采集配置
-    FETCH_FREQUENCY: int = 60  # 获取数据频率(分钟)
+    FETCH_FREQUENCY: int = 60  # 获取数据频率(分钟), 平台未配置crawl_frequency时使用
     HISTORY_DAYS: int = 7  # 历史数据保留天数
-    
+    CLEANUP_MODE: str = "ttl"  # 过期数据清理方式: ttl(由TTL索引自动过期) 或 purge(定时分批删除, 不创建TTL索引)
+    PURGE_BATCH_SIZE: int = 1000  # 分批删除时每批条数
+    PURGE_BATCH_INTERVAL: float = 0.2  # 分批删除时批次间隔(秒)
+    FETCH_CONCURRENCY: int = 5  # 多平台并发抓取的最大并发数
+    BULK_BATCH_SIZE: int = 1000  # 批量写入时每批操作数
+    BULK_MAX_ITEMS: int = 5000  # 批量写入接口单次请求的最大条数
+    BULK_WRITE_CONCERN: str = "1"  # 批量写入的写确认级别: 0, 1 或 majority
+    BULK_WRITE_JOURNAL: bool = False  # 批量写入是否等待写入日志
+    # 存储方式: items(每条热搜一个文档), snapshot(每次抓取一个快照文档), both(同时写入)
+    # 列表、搜索接口读取items, 当前榜单接口读取snapshot
+    STORAGE_MODE: str = "both"
+    TOPIC_TRACKING_ENABLED: bool = True  # 是否将抓取结果合并为去重的话题时间序列
+    TOPIC_HISTORY_DAYS: int = 30  # 话题在最后一次上榜后的保留天数
+    TOPIC_MAX_POINTS: int = 720  # 单个话题保留的时间序列点数上限
+    RISING_HEAT_WEIGHT: float = 10.0  # 上升势头得分中热度增长率的权重
+    ROLLUP_ENABLED: bool = True  # 是否在每次抓取后增量更新话题小时/日汇总
+    ROLLUP_HOURLY_DAYS: int = 90  # 小时汇总保留天数, 日汇总长期保留
+    ROLLUP_REBUILD_HOURS: int = 24  # 定时任务根据原始数据重算最近多少小时的汇总
+    ROLLUP_MAX_INTERVAL: int = 7200  # 累计在榜时长时相邻两次抓取的最大间隔(秒)
+    CLUSTER_ENABLED: bool = True  # 是否在每个抓取周期结束后计算跨平台聚类
+    CLUSTER_SIMILARITY_THRESHOLD: float = 0.4  # 标题n-gram向量余弦相似度不低于该值的跨平台热搜归为同一聚类
+
+    # 抓取调度配置: 定时扫描到期的平台, 并根据榜单变化程度在平台配置的抓取频率基础上自适应调整间隔
+    SCHEDULER_TICK: float = 60.0  # 扫描到期平台的周期(秒)
+    SCHEDULER_ADAPTIVE: bool = True  # 是否自适应调整抓取间隔, 关闭时按平台配置的抓取频率抓取
+    SCHEDULER_MIN_INTERVAL: float = 5.0  # 最短抓取间隔(分钟)
+    SCHEDULER_MAX_FACTOR: float = 4.0  # 最长抓取间隔为平台配置频率的倍数
+    SCHEDULER_VOLATILITY_ALPHA: float = 0.5  # 榜单变化程度指数移动平均的平滑系数
+    SCHEDULER_HIGH_VOLATILITY: float = 0.2  # 平均变化程度不低于该值时缩短间隔
+    SCHEDULER_LOW_VOLATILITY: float = 0.05  # 平均变化程度不高于该值时延长间隔
+    SCHEDULER_SPEEDUP: float = 0.5  # 缩短间隔时的倍数
+    SCHEDULER_SLOWDOWN: float = 1.5  # 延长间隔时的倍数
+
+    # HTTP客户端配置
+    HTTP_POOL_SIZE: int = 100  # 连接池总连接数
+    HTTP_POOL_PER_HOST: int = 10  # 单个主机的最大连接数
+    HTTP_DNS_CACHE_TTL: int = 300  # DNS缓存时间(秒)
+    HTTP_KEEPALIVE_TIMEOUT: float = 75.0  # 空闲长连接保持时间(秒)
+    HTTP_TIMEOUT: float = 15.0  # 单次请求总超时(秒)
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # 建立连接超时(秒)
+    # 抓取器读取本地响应样本的目录(如app/apis/fixtures), 设置后不发起网络请求, 用于离线运行及基准测试
+    CRAWLER_FIXTURE_DIR: Optional[str] = None
+    CRAWLER_CONDITIONAL_REQUESTS: bool = True  # 是否根据上一次响应的ETag/Last-Modified发送条件请求
+    CRAWLER_STATE_TTL: int = 86400  # 抓取状态(ETag、内容摘要、熔断计数)的保留时间(秒)
+    CRAWLER_RETRY_ATTEMPTS: int = 3  # 网络异常、超时、HTTP 5xx或429时单次抓取的最大请求次数(含首次)
+    CRAWLER_RETRY_BASE_DELAY: float = 1.0  # 重试退避基础间隔(秒), 第n次重试前等待[0, 基础间隔 * 2^n]内的随机时间
+    CRAWLER_RETRY_MAX_DELAY: float = 30.0  # 重试退避最大间隔(秒)
+    CRAWLER_RATE_LIMIT: float = 1.0  # 所有Worker对同一上游主机每秒的最大请求数, 0表示不限流
+    CRAWLER_RATE_BURST: int = 3  # 同一上游主机允许的突发请求数
+    CRAWLER_BREAKER_THRESHOLD: int = 5  # 平台连续失败多少次(重试耗尽)后熔断
+    CRAWLER_BREAKER_COOLDOWN: int = 300  # 熔断持续时间(秒), 之后放行一个试探请求
+    CRAWLER_TASK_MAX_RETRIES: int = 3  # 抓取任务失败后的Celery重试次数
+    CRAWLER_TASK_RETRY_DELAY: float = 60.0  # 抓取任务重试的退避基础间隔(秒)
+    CRAWLER_LOCK_TTL: int = 300  # 平台抓取租约时长(秒), 应大于单次抓取(含重试)的最长耗时
+
+    # 接口配置
+    # 列表接口直接将MongoDB文档映射为响应字段并由orjson序列化, 跳过逐条的Pydantic模型校验
+    API_FAST_SERIALIZATION: bool = True
+
+    # 缓存配置
+    HOTSEARCH_CACHE_ENABLED: bool = True  # 是否启用热搜列表缓存
+    HOTSEARCH_CACHE_TTL: int = 3600  # 热搜列表缓存兜底过期时间(秒)，正常由抓取任务主动失效
+    HOTSEARCH_COUNT_CACHE_TTL: int = 60  # 热搜总数缓存过期时间(秒)
+
     # 平台配置
     PLATFORMS: List[str] = ["weibo", "baidu", "zhihu", "douyin", "bilibili"]
     
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple, Type, get_args
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+def _default(value: Any) -> Any:
+    """orjson不支持的类型"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+@lru_cache(maxsize=None)
+def _get_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    """响应模型的字段(按声明顺序)及缺省值, 必填字段缺省为None"""
+    return tuple(
+        (name, None if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+
+def document_to_dict(model: Type[BaseModel], doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    按响应模型的字段从MongoDB文档中取值, 不做类型校验及转换
+    _id映射为字符串id, 模型未声明的字段(如search_grams)被丢弃, 缺失的字段使用模型缺省值
+    仅支持不含嵌套模型的扁平响应模型
+    """
+    result = {}
+    for name, default in _get_fields(model):
+        if name == "id" and "id" not in doc:
+            result["id"] = str(doc["_id"])
+        else:
+            result[name] = doc.get(name, default)
+    return result
+
+
+def dumps_list(list_model: Type[BaseModel], docs: Iterable[Dict[str, Any]], **fields: Any) -> bytes:
+    """
+    将列表响应({"data": [...], 其他字段})序列化为JSON
+    settings.API_FAST_SERIALIZATION开启时直接将MongoDB文档映射为响应字段并由orjson编码,
+    跳过逐条构建及校验Pydantic模型; 关闭时按list_model校验后序列化, 两者输出一致
+    :param list_model: 列表响应模型, data字段为List[条目模型]
+    :param fields: data以外的字段, 如total、next_cursor
+    """
+    if not settings.API_FAST_SERIALIZATION:
+        return list_model(data=docs, **fields).model_dump_json().encode()
+
+    item_model = get_args(list_model.model_fields["data"].annotation)[0]
+    payload = {}
+    for name, default in _get_fields(list_model):
+        if name == "data":
+            payload["data"] = [document_to_dict(item_model, doc) for doc in docs]
+        else:
+            payload[name] = fields.get(name, default)
+    return orjson.dumps(payload, default=_default)
@@ -0,0 +1,269 @@
+import argparse
+import asyncio
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from loguru import logger
+
+from app.core.config import settings
+from app.models.hotsearch import HotSearchModel
+from app.models.platform import PlatformModel
+from app.models.rollup import HourlyRollupModel, DailyRollupModel
+from app.models.snapshot import HotSearchSnapshotModel
+from app.models.topic import TopicModel
+
+
+# 需要比对的索引选项, 选项不同视为索引不一致
+INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds")
+
+
+def expiry_index(field: str, days: int) -> IndexModel:
+    """
+    过期数据的时间索引
+    CLEANUP_MODE为ttl时为TTL索引, 由MongoDB后台自动删除过期数据;
+    为purge时为普通索引, 仅供分批清理任务按时间扫描, 不会被TTL监视器删除
+    """
+    if settings.CLEANUP_MODE == "ttl":
+        return IndexModel([(field, ASCENDING)], name=f"{field}_ttl", expireAfterSeconds=days * 24 * 3600)
+    return IndexModel([(field, ASCENDING)], name=field)
+
+
+def get_index_registry() -> Dict[str, List[IndexModel]]:
+    """
+    索引注册表: 集合名 -> 索引定义
+    新增查询模式时在此声明对应索引, 启动时或通过命令行幂等地创建
+    """
+    return {
+        HotSearchModel.model_config["collection"]: [
+            # 按平台查询并按时间倒序、排名正序排序, 以_id结尾支持游标分页
+            IndexModel(
+                [("platform", ASCENDING), ("created_at", DESCENDING), ("rank", ASCENDING), ("_id", ASCENDING)],
+                name="platform_created_at_rank_id"
+            ),
+            # 按分类过滤并按时间排序
+            IndexModel(
+                [("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="category_created_at_id"
+            ),
+            # 全文检索n-gram倒排索引(多键索引)
+            IndexModel(
+                [("search_grams", ASCENDING), ("created_at", DESCENDING)],
+                name="search_grams_created_at"
+            ),
+            # 批量写入的upsert键(平台+标题+抓取时间), 唯一索引保证并发或重试的upsert不产生重复文档
+            IndexModel(
+                [("platform", ASCENDING), ("title", ASCENDING), ("created_at", DESCENDING)],
+                name="platform_title_created_at",
+                unique=True
+            ),
+            # 全量列表按时间倒序排序及游标分页
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="created_at_id"
+            ),
+            # 按时间范围查询及清理过期数据
+            expiry_index("created_at", settings.HISTORY_DAYS),
+        ],
+        HotSearchSnapshotModel.model_config["collection"]: [
+            # 读取平台最新快照及按时间范围读取历史快照
+            IndexModel(
+                [("platform", ASCENDING), ("crawled_at", DESCENDING)],
+                name="platform_crawled_at"
+            ),
+            expiry_index("crawled_at", settings.HISTORY_DAYS),
+        ],
+        TopicModel.model_config["collection"]: [
+            # 按平台获取最近上榜的话题
+            IndexModel(
+                [("platform", ASCENDING), ("last_seen", DESCENDING)],
+                name="platform_last_seen"
+            ),
+            IndexModel(
+                [("last_seen", ASCENDING)],
+                name="last_seen_ttl",
+                expireAfterSeconds=settings.TOPIC_HISTORY_DAYS * 24 * 3600
+            ),
+        ],
+        HourlyRollupModel.model_config["collection"]: [
+            # 平台时间桶内的话题排行
+            IndexModel(
+                [("platform", ASCENDING), ("bucket", DESCENDING), ("best_rank", ASCENDING)],
+                name="platform_bucket_best_rank"
+            ),
+            # 话题各时间桶的汇总
+            IndexModel([("topic_id", ASCENDING), ("bucket", ASCENDING)], name="topic_id_bucket"),
+            IndexModel(
+                [("bucket", ASCENDING)],
+                name="bucket_ttl",
+                expireAfterSeconds=settings.ROLLUP_HOURLY_DAYS * 24 * 3600
+            ),
+        ],
+        DailyRollupModel.model_config["collection"]: [
+            IndexModel(
+                [("platform", ASCENDING), ("bucket", DESCENDING), ("best_rank", ASCENDING)],
+                name="platform_bucket_best_rank"
+            ),
+            IndexModel([("topic_id", ASCENDING), ("bucket", ASCENDING)], name="topic_id_bucket"),
+        ],
+        PlatformModel.model_config["collection"]: [
+            IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+            IndexModel([("is_active", ASCENDING), ("name", ASCENDING)], name="is_active_name"),
+        ],
+    }
+
+
+def _index_differs(spec: dict, existing: dict) -> bool:
+    """比较索引定义与已存在索引的键及选项"""
+    if not _same_key(spec, existing):
+        return True
+    return any(spec.get(option) != existing.get(option) for option in INDEX_OPTIONS)
+
+
+def _only_ttl_differs(spec: dict, existing: dict) -> bool:
+    """判断是否仅TTL过期时间不同(可通过collMod原地修改)"""
+    if "expireAfterSeconds" not in spec or "expireAfterSeconds" not in existing:
+        return False
+    ttl_free_spec = {k: v for k, v in spec.items() if k != "expireAfterSeconds"}
+    ttl_free_existing = {k: v for k, v in existing.items() if k != "expireAfterSeconds"}
+    return not _index_differs(ttl_free_spec, ttl_free_existing)
+
+
+def _same_key(spec: dict, existing: dict) -> bool:
+    return list(spec["key"].items()) == [tuple(k) for k in existing["key"]]
+
+
+def _only_unique_added(spec: dict, existing: dict) -> bool:
+    """判断是否仅需将已有索引改为唯一索引"""
+    if not spec.get("unique") or existing.get("unique"):
+        return False
+    return not _index_differs({**spec, "unique": None}, existing)
+
+
+async def migrate_to_unique(db: AsyncIOMotorDatabase, collection_name: str, index: IndexModel) -> bool:
+    """
+    将已有的普通索引重建为唯一索引
+    已有数据中存在重复键时无法创建唯一索引, 保留原索引并记录告警, 需先清理重复数据
+    :return: 是否已重建
+    """
+    spec = index.document
+    collection = db[collection_name]
+    group_id = {field.replace(".", "_"): f"${field}" for field in spec["key"]}
+    duplicates = collection.aggregate([
+        {"$group": {"_id": group_id, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": 1}
+    ], allowDiskUse=True)
+    if [doc async for doc in duplicates]:
+        logger.warning(f"集合[{collection_name}]存在重复数据, 无法将索引[{spec['name']}]改为唯一索引, 请先清理重复数据")
+        return False
+
+    await collection.drop_index(spec["name"])
+    await collection.create_indexes([index])
+    logger.info(f"集合[{collection_name}]索引[{spec['name']}]已重建为唯一索引")
+    return True
+
+
+async def sync_ttl_index(
+    db: AsyncIOMotorDatabase,
+    collection_name: str,
+    index_name: str,
+    expire_after_seconds: int
+):
+    """通过collMod原地修改TTL索引的过期时间, 无需重建索引"""
+    await db.command(
+        "collMod",
+        collection_name,
+        index={"name": index_name, "expireAfterSeconds": expire_after_seconds}
+    )
+    logger.info(f"集合[{collection_name}]TTL索引[{index_name}]过期时间已更新为{expire_after_seconds}秒")
+
+
+async def check_indexes(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, List[str]]]:
+    """
+    检查索引状态
+    :return: 集合名 -> {"present": [...], "missing": [...], "conflicting": [...], "unmanaged": [...]}
+    """
+    report = {}
+    for collection_name, indexes in get_index_registry().items():
+        existing = await db[collection_name].index_information()
+        status = {"present": [], "missing": [], "conflicting": [], "unmanaged": []}
+
+        for index in indexes:
+            spec = index.document
+            name = spec["name"]
+            if name not in existing:
+                status["missing"].append(name)
+            elif _index_differs(spec, existing[name]):
+                status["conflicting"].append(name)
+            else:
+                status["present"].append(name)
+
+        declared = {index.document["name"] for index in indexes}
+        status["unmanaged"] = [name for name in existing if name != "_id_" and name not in declared]
+        report[collection_name] = status
+
+    return report
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """
+    幂等地创建注册表中缺失的索引
+    仅TTL过期时间不一致的索引(如HISTORY_DAYS变更)通过collMod同步, 新声明为唯一的索引在无重复数据时重建;
+    与缺失索引键相同的未声明索引(如切换CLEANUP_MODE后的旧TTL索引)视为被替换, 先删除再创建,
+    其他定义不一致的索引只记录告警, 不会被删除重建
+    :return: 集合名 -> 新创建的索引名
+    """
+    report = await check_indexes(db)
+    created = {}
+
+    for collection_name, indexes in get_index_registry().items():
+        status = report[collection_name]
+        if status["conflicting"]:
+            existing = await db[collection_name].index_information()
+        for index in indexes:
+            spec = index.document
+            if spec["name"] not in status["conflicting"]:
+                continue
+            if _only_ttl_differs(spec, existing[spec["name"]]):
+                await sync_ttl_index(db, collection_name, spec["name"], spec["expireAfterSeconds"])
+            elif _only_unique_added(spec, existing[spec["name"]]):
+                await migrate_to_unique(db, collection_name, index)
+            else:
+                logger.warning(f"集合[{collection_name}]索引[{spec['name']}]与定义不一致, 请手动处理")
+
+        missing = [index for index in indexes if index.document["name"] in status["missing"]]
+        if missing and status["unmanaged"]:
+            existing = await db[collection_name].index_information()
+            for name in status["unmanaged"]:
+                if any(_same_key(index.document, existing[name]) for index in missing):
+                    await db[collection_name].drop_index(name)
+                    logger.info(f"集合[{collection_name}]索引[{name}]已被替换, 已删除")
+        if missing:
+            created[collection_name] = await db[collection_name].create_indexes(missing)
+            logger.info(f"集合[{collection_name}]已创建索引: {created[collection_name]}")
+
+    if not created:
+        logger.info("所有索引均已存在")
+    return created
+
+
+async def _main(check_only: bool):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        db = client.get_database()
+        if not check_only:
+            await ensure_indexes(db)
+        for collection_name, status in (await check_indexes(db)).items():
+            print(f"[{collection_name}]")
+            for state, names in status.items():
+                print(f"  {state}: {', '.join(names) or '-'}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MongoDB索引管理")
+    parser.add_argument("--check", action="store_true", help="仅检查索引状态, 不创建")
+    args = parser.parse_args()
+    asyncio.run(_main(args.check))
@@ -1,38 +1,72 @@
-import redis
+from typing import Optional
+
+from redis.asyncio import Redis, ConnectionPool
+from redis.asyncio.client import Pipeline
 from loguru import logger
 
 from app.core.config import settings
 
 class RedisClient:
+    """基于asyncio的Redis客户端, 所有连接来自同一个连接池"""
+
     def __init__(self):
-        self.client = None
-        
-    def connect(self):
+        self.pool: Optional[ConnectionPool] = None
+        self.client: Optional[Redis] = None
+
+    def _create_client(self) -> Redis:
+        """创建连接池及客户端(不产生网络IO)"""
+        self.pool = ConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        self.client = Redis(connection_pool=self.pool)
+        return self.client
+
+    async def connect(self):
         """连接到Redis"""
         try:
-            self.client = redis.from_url(settings.REDIS_URL)
-            logger.info("成功连接到Redis")
+            self._create_client()
+            await self.client.ping()
+            logger.info(f"成功连接到Redis(连接池大小: {settings.REDIS_MAX_CONNECTIONS})")
         except Exception as e:
             logger.error(f"Redis连接失败: {e}")
             raise
-            
-    def get_client(self):
+
+    def get_client(self) -> Redis:
         """获取Redis客户端"""
         if not self.client:
-            self.connect()
+            self._create_client()
         return self.client
-        
-    def close(self):
+
+    def pipeline(self, transaction: bool = False) -> Pipeline:
+        """获取管道, 用于将多条命令合并为一次网络往返"""
+        return self.get_client().pipeline(transaction=transaction)
+
+    async def ping(self) -> bool:
+        """健康检查"""
+        try:
+            return await self.get_client().ping()
+        except Exception as e:
+            logger.warning(f"Redis健康检查失败: {e}")
+            return False
+
+    async def close(self):
         """关闭Redis连接"""
         if self.client:
             logger.info("正在关闭Redis连接...")
-            self.client.close()
+            await self.client.aclose()
+            await self.pool.disconnect()
+            self.client = None
+            self.pool = None
             logger.info("Redis连接已关闭")
 
 
 redis_client = RedisClient()
 
 
-def get_redis():
+async def get_redis() -> Redis:
     """获取Redis客户端依赖"""
-    return redis_client.get_client() 
\ No newline at end of file
+    return redis_client.get_client()
@@ -19,6 +19,15 @@ class PyObjectId(ObjectId):
         return ObjectId(v)
 
 
+def parse_object_id(value: Any) -> Optional[ObjectId]:
+    """将字符串ID转换为ObjectId, 格式无效时返回None"""
+    if isinstance(value, ObjectId):
+        return value
+    if not ObjectId.is_valid(value):
+        return None
+    return ObjectId(value)
+
+
 class MongoBaseModel(BaseModel):
     """MongoDB模型基类"""
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from app.models.base import MongoBaseModel
+
+
+class ClusterItem(BaseModel):
+    """聚类中的平台热搜条目"""
+    platform: str = Field(..., description="平台标识")
+    topic_id: str = Field(..., description="话题ID")
+    title: str = Field(..., description="热搜标题")
+    url: str = Field(..., description="热搜链接")
+    rank: int = Field(..., description="当前排名")
+    hot_value: Optional[int] = Field(None, description="当前热度值")
+
+
+class Cluster(BaseModel):
+    """跨平台热搜聚类, 即不同平台上描述同一事件的热搜"""
+    title: str = Field(..., description="代表标题(排名最高的条目)")
+    platforms: List[str] = Field(..., description="涉及的平台")
+    size: int = Field(..., description="条目数")
+    score: float = Field(..., description="聚类得分, 各条目1/排名之和")
+    items: List[ClusterItem] = Field(..., description="按排名升序排列的条目")
+
+
+class ClusterModel(MongoBaseModel):
+    """
+    跨平台聚类模型
+    仅保存一个文档(_id为latest), 每个抓取周期结束后基于各平台最新榜单整体替换
+    """
+    computed_at: datetime = Field(..., description="计算时间")
+    item_count: int = Field(..., description="参与聚类的热搜条数")
+    clusters: List[Cluster] = Field(default_factory=list, description="按涉及平台数和得分降序排列的聚类")
+    
+    model_config = {
+        "collection": "hot_search_clusters"
+    }
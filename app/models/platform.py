@@ -14,6 +14,10 @@ class PlatformModel(MongoBaseModel):
     is_active: bool = Field(True, description="是否激活")
     crawl_frequency: int = Field(60, description="爬取频率(分钟)")
     last_crawl: Optional[datetime] = Field(None, description="上次爬取时间")
+    crawl_interval: Optional[float] = Field(None, description="自适应调整后的当前爬取间隔(分钟)")
+    volatility: Optional[float] = Field(None, description="近期榜单变化程度的移动平均(0~1)")
+    next_crawl: Optional[datetime] = Field(None, description="下次爬取时间")
+    crawl_fence: Optional[int] = Field(None, description="最近一次写入数据的抓取租约fencing令牌")
     
     model_config = {
         "collection": "platforms",
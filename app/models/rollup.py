@@ -0,0 +1,35 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import Field
+
+from app.models.base import MongoBaseModel
+
+
+class HourlyRollupModel(MongoBaseModel):
+    """
+    话题小时汇总模型
+    每个平台话题在每个小时一个文档, _id为"{话题ID}:{时间桶}"
+    """
+    platform: str = Field(..., description="平台: weibo, baidu, zhihu, douyin, bilibili")
+    topic_id: str = Field(..., description="话题ID")
+    bucket: datetime = Field(..., description="时间桶起点")
+    title: str = Field(..., description="时间桶内最近一次出现时的标题")
+    url: str = Field(..., description="时间桶内最近一次出现时的链接")
+    best_rank: int = Field(..., description="时间桶内最高排名")
+    peak_hot_value: Optional[int] = Field(None, description="时间桶内峰值热度")
+    appearances: int = Field(0, description="时间桶内上榜次数")
+    time_on_list: int = Field(0, description="时间桶内在榜时长(秒), 按相邻两次抓取均在榜的间隔累计")
+    first_seen: datetime = Field(..., description="时间桶内首次上榜时间")
+    last_seen: datetime = Field(..., description="时间桶内最近上榜时间")
+    
+    model_config = {
+        "collection": "hot_search_rollups_hourly"
+    }
+
+
+class DailyRollupModel(HourlyRollupModel):
+    """话题日汇总模型, 字段与小时汇总相同, 长期保留"""
+    
+    model_config = {
+        "collection": "hot_search_rollups_daily"
+    }
@@ -0,0 +1,45 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from app.models.base import MongoBaseModel
+
+
+class SnapshotItem(BaseModel):
+    """快照中的单条热搜, 只保留随条目变化的字段"""
+    title: str = Field(..., description="热搜标题")
+    url: str = Field(..., description="热搜链接")
+    rank: int = Field(..., description="排名")
+    hot_value: Optional[int] = Field(None, description="热度值")
+    category: str = Field("general", description="分类")
+    content: Optional[str] = Field(None, description="相关内容")
+    tags: List[str] = Field(default_factory=list, description="标签")
+
+
+class HotSearchSnapshotModel(MongoBaseModel):
+    """热搜快照模型: 每次抓取保存为一个文档"""
+    platform: str = Field(..., description="平台: weibo, baidu, zhihu, douyin, bilibili")
+    crawled_at: datetime = Field(..., description="抓取时间")
+    item_count: int = Field(..., description="条目数")
+    items: List[SnapshotItem] = Field(default_factory=list, description="按排名排列的热搜条目")
+    
+    model_config = {
+        "collection": "hot_search_snapshots",
+        "json_schema_extra": {
+            "example": {
+                "platform": "weibo",
+                "crawled_at": "2023-01-01T12:00:00",
+                "item_count": 1,
+                "items": [
+                    {
+                        "title": "2023世界杯",
+                        "url": "https://s.weibo.com/weibo?q=2023%E4%B8%96%E7%95%8C%E6%9D%AF",
+                        "rank": 1,
+                        "hot_value": 6542321
+                    }
+                ],
+                "created_at": "2023-01-01T12:00:00",
+                "updated_at": "2023-01-01T12:00:00"
+            }
+        }
+    }
@@ -0,0 +1,51 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from app.models.base import MongoBaseModel
+
+
+class TopicPoint(BaseModel):
+    """话题在某次抓取中的排名与热度"""
+    t: datetime = Field(..., description="抓取时间")
+    rank: int = Field(..., description="排名")
+    hot_value: Optional[int] = Field(None, description="热度值")
+
+
+class TopicModel(MongoBaseModel):
+    """
+    热搜话题模型
+    同一平台下归一化标题相同的热搜视为同一话题, _id为平台与归一化标题的哈希
+    """
+    platform: str = Field(..., description="平台: weibo, baidu, zhihu, douyin, bilibili")
+    title: str = Field(..., description="最近一次出现时的标题")
+    url: str = Field(..., description="最近一次出现时的链接")
+    first_seen: datetime = Field(..., description="首次上榜时间")
+    last_seen: datetime = Field(..., description="最近上榜时间")
+    best_rank: int = Field(..., description="最高排名")
+    peak_hot_value: Optional[int] = Field(None, description="峰值热度")
+    appearances: int = Field(0, description="上榜次数")
+    points: List[TopicPoint] = Field(default_factory=list, description="排名与热度时间序列")
+    
+    model_config = {
+        "collection": "hot_search_topics",
+        "json_schema_extra": {
+            "example": {
+                "platform": "weibo",
+                "title": "2023世界杯",
+                "url": "https://s.weibo.com/weibo?q=2023%E4%B8%96%E7%95%8C%E6%9D%AF",
+                "first_seen": "2023-01-01T10:00:00",
+                "last_seen": "2023-01-01T12:00:00",
+                "best_rank": 1,
+                "peak_hot_value": 6542321,
+                "appearances": 3,
+                "points": [
+                    {"t": "2023-01-01T10:00:00", "rank": 5, "hot_value": 1200000},
+                    {"t": "2023-01-01T11:00:00", "rank": 2, "hot_value": 3500000},
+                    {"t": "2023-01-01T12:00:00", "rank": 1, "hot_value": 6542321}
+                ],
+                "created_at": "2023-01-01T10:00:00",
+                "updated_at": "2023-01-01T12:00:00"
+            }
+        }
+    }
@@ -0,0 +1,34 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from app.models.base import MongoBaseModel
+
+
+class TrendItem(BaseModel):
+    """热搜条目相对上一次抓取的变化"""
+    topic_id: str = Field(..., description="话题ID")
+    title: str = Field(..., description="热搜标题")
+    url: str = Field(..., description="热搜链接")
+    rank: int = Field(..., description="当前排名")
+    hot_value: Optional[int] = Field(None, description="当前热度值")
+    prev_rank: Optional[int] = Field(None, description="上一次抓取的排名")
+    rank_delta: int = Field(0, description="排名变化, 正数表示上升")
+    heat_growth: Optional[float] = Field(None, description="热度增长率")
+    is_new: bool = Field(False, description="是否新上榜")
+    momentum: float = Field(0.0, description="上升势头得分")
+
+
+class TrendModel(MongoBaseModel):
+    """
+    平台热搜趋势模型
+    每个平台一个文档(_id为平台标识), 每次抓取后用最新榜单与文档中保存的上一次榜单比较并整体替换
+    """
+    platform: str = Field(..., description="平台: weibo, baidu, zhihu, douyin, bilibili")
+    crawled_at: datetime = Field(..., description="本次抓取时间")
+    previous_crawled_at: Optional[datetime] = Field(None, description="上一次抓取时间")
+    items: List[TrendItem] = Field(default_factory=list, description="按上升势头降序排列的条目")
+    
+    model_config = {
+        "collection": "hot_search_trends"
+    }
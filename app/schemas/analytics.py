@@ -0,0 +1,39 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, model_validator
+
+
+# 响应模式
+class RollupResponse(BaseModel):
+    """话题汇总响应"""
+    id: str
+    platform: str
+    topic_id: str
+    bucket: datetime
+    title: str
+    url: str
+    best_rank: int
+    peak_hot_value: Optional[int] = None
+    appearances: int
+    time_on_list: int
+    first_seen: datetime
+    last_seen: datetime
+    
+    model_config = {
+        "from_attributes": True
+    }
+
+    @model_validator(mode="before")
+    @classmethod
+    def map_object_id(cls, data):
+        """将MongoDB文档的_id映射为字符串id"""
+        if isinstance(data, dict) and "id" not in data and "_id" in data:
+            data = {**data, "id": str(data["_id"])}
+        return data
+
+
+class RollupList(BaseModel):
+    """话题汇总列表响应"""
+    data: List[RollupResponse]
+    total: int
+    bucket: Optional[datetime] = None
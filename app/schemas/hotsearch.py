@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Literal
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
+from app.core.config import settings
 from app.models.hotsearch import HotSearchModel
 
 
@@ -29,6 +30,12 @@ class HotSearchUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
+class HotSearchBulkCreate(BaseModel):
+    """批量写入热搜请求"""
+    items: List[HotSearchCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    crawled_at: Optional[datetime] = Field(None, description="抓取时间, 与平台、标题共同作为去重键, 默认为请求时间")
+
+
 # 响应模式
 class HotSearchResponse(BaseModel):
     """热搜响应"""
@@ -48,13 +55,67 @@ class HotSearchResponse(BaseModel):
         "from_attributes": True
     }
 
+    @model_validator(mode="before")
+    @classmethod
+    def map_object_id(cls, data):
+        """将MongoDB文档的_id映射为字符串id"""
+        if isinstance(data, dict) and "id" not in data and "_id" in data:
+            data = {**data, "id": str(data["_id"])}
+        return data
+
 
 class HotSearchList(BaseModel):
     """热搜列表响应"""
     data: List[HotSearchResponse]
+    total: int = Field(..., description="符合条件的记录总数")
+    next_cursor: Optional[str] = Field(None, description="下一页游标, 为空表示没有更多数据")
+
+
+class RisingHotSearch(BaseModel):
+    """上升热搜响应"""
+    platform: str
+    topic_id: str
+    title: str
+    url: str
+    rank: int
+    hot_value: Optional[int] = None
+    prev_rank: Optional[int] = None
+    rank_delta: int
+    heat_growth: Optional[float] = None
+    is_new: bool
+    momentum: float
+    crawled_at: datetime
+
+
+class RisingHotSearchList(BaseModel):
+    """上升热搜列表响应"""
+    data: List[RisingHotSearch]
     total: int
 
 
+class HotSearchBulkError(BaseModel):
+    """批量写入失败条目"""
+    index: int = Field(..., description="条目在请求items中的下标")
+    message: str
+
+
+class HotSearchBulkResult(BaseModel):
+    """批量写入热搜响应"""
+    received: int
+    upserted: int = Field(..., description="新增条数")
+    matched: int = Field(..., description="已存在而被更新的条数")
+    modified: int = Field(..., description="内容实际发生变化的条数")
+    errors: List[HotSearchBulkError] = []
+
+
+class HotSearchCacheStats(BaseModel):
+    """热搜缓存统计响应"""
+    requests: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
 # 查询参数
 class HotSearchQueryParams(BaseModel):
     """热搜查询参数"""
@@ -63,5 +124,10 @@ class HotSearchQueryParams(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     keyword: Optional[str] = None
+    search_mode: Literal["text", "regex"] = Field(
+        "regex",
+        description="关键词匹配方式: regex(子串匹配) 或 text(全文检索, 按相关度排序, 字母数字按整词匹配, 需先回填检索字段)"
+    )
     skip: int = 0
-    limit: int = 100 
\ No newline at end of file
+    limit: int = 100
+    cursor: Optional[str] = Field(None, description="分页游标, 提供时忽略skip") 
\ No newline at end of file
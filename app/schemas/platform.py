@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from app.models.platform import PlatformModel
 
@@ -37,6 +37,9 @@ class PlatformResponse(BaseModel):
     is_active: bool
     crawl_frequency: int
     last_crawl: Optional[datetime] = None
+    crawl_interval: Optional[float] = None
+    volatility: Optional[float] = None
+    next_crawl: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
@@ -44,6 +47,14 @@ class PlatformResponse(BaseModel):
         "from_attributes": True
     }
 
+    @model_validator(mode="before")
+    @classmethod
+    def map_object_id(cls, data):
+        """将MongoDB文档的_id映射为字符串id"""
+        if isinstance(data, dict) and "id" not in data and "_id" in data:
+            data = {**data, "id": str(data["_id"])}
+        return data
+
 
 class PlatformList(BaseModel):
     """平台列表响应"""
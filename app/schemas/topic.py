@@ -0,0 +1,50 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, model_validator
+
+from app.models.cluster import Cluster
+from app.models.topic import TopicPoint
+
+
+# 响应模式
+class TopicResponse(BaseModel):
+    """话题响应"""
+    id: str
+    platform: str
+    title: str
+    url: str
+    first_seen: datetime
+    last_seen: datetime
+    best_rank: int
+    peak_hot_value: Optional[int] = None
+    appearances: int
+    
+    model_config = {
+        "from_attributes": True
+    }
+
+    @model_validator(mode="before")
+    @classmethod
+    def map_object_id(cls, data):
+        """将MongoDB文档的_id映射为字符串id"""
+        if isinstance(data, dict) and "id" not in data and "_id" in data:
+            data = {**data, "id": str(data["_id"])}
+        return data
+
+
+class TopicDetail(TopicResponse):
+    """话题详情响应, 包含排名与热度时间序列"""
+    points: List[TopicPoint] = []
+
+
+class TopicList(BaseModel):
+    """话题列表响应"""
+    data: List[TopicResponse]
+    total: int
+
+
+class ClusterList(BaseModel):
+    """跨平台聚类列表响应"""
+    data: List[Cluster]
+    total: int
+    computed_at: Optional[datetime] = None
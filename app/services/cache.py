@@ -0,0 +1,148 @@
+from typing import Optional, Dict, Any
+import hashlib
+
+from bson import json_util
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+
+# 缓存键设计:
+#   hotsearch:list:{platform|all}  -> Hash, field为"{skip}:{limit}", value为序列化后的HotSearchList
+#   hotsearch:cache:stats          -> Hash, 记录requests/misses计数
+#   hotsearch:count:{digest}       -> String, 按过滤条件摘要缓存的总数, 短期过期
+# 同一平台的所有分页缓存放在同一个Hash中, 失效时一次DEL即可, 无需SCAN
+LIST_CACHE_PREFIX = "hotsearch:list"
+COUNT_CACHE_PREFIX = "hotsearch:count"
+STATS_KEY = "hotsearch:cache:stats"
+ALL_SCOPE = "all"
+
+
+def _scope_key(platform: Optional[str] = None) -> str:
+    """获取缓存作用域键"""
+    return f"{LIST_CACHE_PREFIX}:{platform or ALL_SCOPE}"
+
+
+def _page_field(skip: int, limit: int) -> str:
+    """获取分页字段名"""
+    return f"{skip}:{limit}"
+
+
+async def get_cached_list(
+    redis: Redis,
+    platform: Optional[str],
+    skip: int,
+    limit: int
+) -> Optional[bytes]:
+    """
+    读取缓存的热搜列表
+    :return: 序列化后的HotSearchList, 未命中时返回None
+    """
+    if not settings.HOTSEARCH_CACHE_ENABLED:
+        return None
+
+    try:
+        # 读取与请求计数合并在一次往返中完成
+        pipe = redis.pipeline(transaction=False)
+        pipe.hget(_scope_key(platform), _page_field(skip, limit))
+        pipe.hincrby(STATS_KEY, "requests", 1)
+        payload, _ = await pipe.execute()
+        return payload
+    except RedisError as e:
+        logger.warning(f"读取热搜缓存失败: {e}")
+        return None
+
+
+async def set_cached_list(
+    redis: Redis,
+    platform: Optional[str],
+    skip: int,
+    limit: int,
+    payload: bytes
+) -> None:
+    """写入热搜列表缓存, 同时记录一次未命中"""
+    if not settings.HOTSEARCH_CACHE_ENABLED:
+        return
+
+    key = _scope_key(platform)
+    try:
+        pipe = redis.pipeline(transaction=False)
+        pipe.hset(key, _page_field(skip, limit), payload)
+        pipe.expire(key, settings.HOTSEARCH_CACHE_TTL)
+        pipe.hincrby(STATS_KEY, "misses", 1)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"写入热搜缓存失败: {e}")
+
+
+async def invalidate_hotsearch_cache(
+    redis: Redis,
+    platform: Optional[str] = None
+) -> None:
+    """
+    使热搜列表缓存及对应的总数缓存失效
+    列表缓存中嵌入了总数, 总数缓存需一并失效, 否则重建的列表缓存会沿用抓取前的总数
+    :param platform: 指定平台时失效该平台及全量列表缓存, 为None时失效所有平台
+    """
+    platforms = [platform] if platform else list(settings.PLATFORMS)
+    keys = [_scope_key(name) for name in platforms] + [_scope_key()]
+    keys += [_count_key({"platform": name}) for name in platforms] + [_count_key({})]
+
+    try:
+        await redis.delete(*keys)
+        logger.info(f"已失效热搜列表缓存: {platform or ALL_SCOPE}")
+    except RedisError as e:
+        logger.warning(f"失效热搜缓存失败: {e}")
+
+
+def _count_key(query: Dict[str, Any]) -> str:
+    """根据过滤条件生成计数缓存键"""
+    signature = json_util.dumps(query, sort_keys=True)
+    return f"{COUNT_CACHE_PREFIX}:{hashlib.sha1(signature.encode()).hexdigest()}"
+
+
+async def get_cached_count(
+    redis: Redis,
+    query: Dict[str, Any]
+) -> Optional[int]:
+    """读取缓存的总数, 未命中时返回None"""
+    try:
+        total = await redis.get(_count_key(query))
+        return int(total) if total is not None else None
+    except RedisError as e:
+        logger.warning(f"读取计数缓存失败: {e}")
+        return None
+
+
+async def set_cached_count(
+    redis: Redis,
+    query: Dict[str, Any],
+    total: int
+) -> None:
+    """写入总数缓存"""
+    try:
+        await redis.set(_count_key(query), total, ex=settings.HOTSEARCH_COUNT_CACHE_TTL)
+    except RedisError as e:
+        logger.warning(f"写入计数缓存失败: {e}")
+
+
+async def get_cache_stats(redis: Redis) -> Dict[str, float]:
+    """获取缓存命中统计"""
+    try:
+        stats = await redis.hgetall(STATS_KEY)
+    except RedisError as e:
+        logger.warning(f"读取缓存统计失败: {e}")
+        stats = {}
+
+    requests = int(stats.get(b"requests", 0))
+    misses = min(int(stats.get(b"misses", 0)), requests)
+    hits = requests - misses
+
+    return {
+        "requests": requests,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / requests, 4) if requests else 0.0
+    }
@@ -0,0 +1,148 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+import numpy as np
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models.cluster import ClusterModel
+from app.models.trend import TrendModel
+from app.services.search import tokenize
+
+
+# 最新聚类结果保存在单个文档中
+LATEST_CLUSTER_ID = "latest"
+
+
+def vectorize_titles(titles: List[str]) -> np.ndarray:
+    """
+    将标题表示为字符n-gram的TF-IDF向量(行已L2归一化)
+    :return: 形状为(标题数, 词表大小)的矩阵
+    """
+    docs = [tokenize(title) for title in titles]
+    vocabulary: Dict[str, int] = {}
+    for grams in docs:
+        for gram in grams:
+            vocabulary.setdefault(gram, len(vocabulary))
+
+    matrix = np.zeros((len(docs), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, grams in enumerate(docs):
+        matrix[row, [vocabulary[gram] for gram in grams]] = 1.0
+
+    # 在多个标题中都出现的n-gram(如"官宣"、"回应")区分度低, 按IDF降权
+    document_frequency = matrix.sum(axis=0)
+    matrix *= np.log((1 + len(docs)) / (1 + document_frequency)) + 1.0
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _find(parent: List[int], i: int) -> int:
+    """并查集查找(路径压缩)"""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_items(
+    items: List[Dict[str, Any]],
+    threshold: float
+) -> List[List[int]]:
+    """
+    按标题相似度对条目聚类
+    一次矩阵乘法得到全部两两余弦相似度, 相似度不低于阈值且来自不同平台的条目连边, 取连通分量
+    :return: 每个聚类中条目的下标列表(仅包含跨平台聚类)
+    """
+    if len(items) < 2:
+        return []
+
+    vectors = vectorize_titles([item["title"] for item in items])
+    similarity = vectors @ vectors.T
+
+    platforms = np.array([item["platform"] for item in items])
+    cross_platform = platforms[:, None] != platforms[None, :]
+    rows, cols = np.nonzero(np.triu((similarity >= threshold) & cross_platform, k=1))
+
+    parent = list(range(len(items)))
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def build_clusters(items: List[Dict[str, Any]], threshold: float) -> List[dict]:
+    """
+    构建跨平台聚类
+    聚类得分为各条目排名得分(1/排名)之和, 代表标题取排名最高的条目
+    """
+    clusters = []
+    for indexes in cluster_items(items, threshold):
+        members = sorted((items[i] for i in indexes), key=lambda x: x["rank"])
+        clusters.append({
+            "title": members[0]["title"],
+            "platforms": sorted({item["platform"] for item in members}),
+            "size": len(members),
+            "score": round(sum(1.0 / item["rank"] for item in members), 4),
+            "items": [
+                {
+                    "platform": item["platform"],
+                    "topic_id": item["topic_id"],
+                    "title": item["title"],
+                    "url": item["url"],
+                    "rank": item["rank"],
+                    "hot_value": item.get("hot_value")
+                }
+                for item in members
+            ]
+        })
+
+    clusters.sort(key=lambda x: (-len(x["platforms"]), -x["score"]))
+    return clusters
+
+
+async def update_clusters(db: AsyncIOMotorClient) -> dict:
+    """基于各平台最新榜单重新计算跨平台聚类"""
+    items = []
+    async for doc in db[TrendModel.model_config["collection"]].find({}, {"platform": 1, "items": 1}):
+        for item in doc.get("items", []):
+            items.append({**item, "platform": doc["platform"]})
+
+    clusters = build_clusters(items, settings.CLUSTER_SIMILARITY_THRESHOLD)
+    doc = {
+        "computed_at": datetime.now(),
+        "item_count": len(items),
+        "clusters": clusters
+    }
+    await db[ClusterModel.model_config["collection"]].replace_one({"_id": LATEST_CLUSTER_ID}, doc, upsert=True)
+
+    logger.info(f"跨平台聚类完成: {len(items)}条热搜, {len(clusters)}个聚类")
+    return doc
+
+
+async def get_clusters(
+    db: AsyncIOMotorClient,
+    platform: Optional[str] = None,
+    limit: int = 50
+) -> Optional[dict]:
+    """
+    获取最新的跨平台聚类
+    :param platform: 仅返回涉及该平台的聚类
+    """
+    doc = await db[ClusterModel.model_config["collection"]].find_one({"_id": LATEST_CLUSTER_ID})
+    if doc is None:
+        return None
+
+    clusters = doc["clusters"]
+    if platform:
+        clusters = [cluster for cluster in clusters if platform in cluster["platforms"]]
+    doc["clusters"] = clusters[:limit]
+    return doc
@@ -0,0 +1,133 @@
+from typing import Optional
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.models.platform import PlatformModel
+
+
+# 键设计:
+#   crawler:lock:{platform}         -> String, 抓取租约, 值为持有者的fencing令牌, 到期自动释放
+#   crawler:fence:{platform}        -> String, fencing令牌计数器, 每次获得租约时递增
+#   crawler:done:{platform}:{key}   -> String, 幂等键, 抓取窗口(或任务)已成功完成的标记
+LOCK_PREFIX = "crawler:lock"
+FENCE_PREFIX = "crawler:fence"
+DONE_PREFIX = "crawler:done"
+
+# 租约空闲时写入并返回新的fencing令牌, 否则返回nil
+_ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return nil
+end
+local token = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], token, 'PX', ARGV[1])
+return token
+"""
+
+# 仅当租约仍由自己持有时释放
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class FencingError(Exception):
+    """租约已过期且已被新的抓取接管, 当前抓取的写入被拒绝"""
+
+
+class CrawlLock:
+    """
+    平台抓取租约
+    同一平台同时只允许一次抓取(定时调度、手动触发及任务重试之间互斥), 租约到期自动释放,
+    持有者崩溃不会永久阻塞该平台; 每次获得租约时分配单调递增的fencing令牌, 写入前由check_fence校验,
+    租约过期后才恢复执行的旧抓取不会覆盖新抓取的数据
+    Redis不可用时不加锁(token为None)
+    """
+
+    def __init__(self, redis: Redis, platform: str, ttl: Optional[int] = None):
+        self.redis = redis
+        self.platform = platform
+        self.key = f"{LOCK_PREFIX}:{platform}"
+        self.fence_key = f"{FENCE_PREFIX}:{platform}"
+        self.ttl = ttl or settings.CRAWLER_LOCK_TTL
+        self.token: Optional[int] = None
+
+    async def acquire(self) -> bool:
+        """
+        获取租约
+        :return: 租约已被其他抓取持有时返回False
+        """
+        try:
+            token = await self.redis.register_script(_ACQUIRE_SCRIPT)(
+                keys=[self.key, self.fence_key], args=[self.ttl * 1000]
+            )
+        except RedisError as e:
+            logger.warning(f"获取平台[{self.platform}]抓取租约失败, 本次不加锁: {e}")
+            return True
+        if token is None:
+            return False
+        self.token = int(token)
+        return True
+
+    async def release(self):
+        """释放租约(仅当仍由自己持有时)"""
+        if self.token is None:
+            return
+        try:
+            await self.redis.register_script(_RELEASE_SCRIPT)(keys=[self.key], args=[self.token])
+        except RedisError as e:
+            logger.warning(f"释放平台[{self.platform}]抓取租约失败, 将在到期后自动释放: {e}")
+        finally:
+            self.token = None
+
+
+async def check_fence(
+    db: AsyncIOMotorClient,
+    platform: str,
+    token: Optional[int]
+):
+    """
+    写入前在平台文档上校验并推进fencing令牌
+    令牌不小于已记录的令牌时记录该令牌并允许写入; 更大的令牌已写入过说明本次租约已过期且被接管
+    :raises FencingError: 令牌已过期
+    """
+    if token is None:
+        return
+    collection = db[PlatformModel.model_config["collection"]]
+    doc = await collection.find_one_and_update(
+        {"name": platform, "$or": [{"crawl_fence": None}, {"crawl_fence": {"$lte": token}}]},
+        {"$set": {"crawl_fence": token}},
+        projection={"_id": 1}
+    )
+    if doc is None and await collection.count_documents({"name": platform, "crawl_fence": {"$gt": token}}, limit=1):
+        raise FencingError(f"平台[{platform}]抓取租约已过期(令牌{token}), 放弃写入")
+
+
+def _done_key(platform: str, idempotency_key: str) -> str:
+    return f"{DONE_PREFIX}:{platform}:{idempotency_key}"
+
+
+async def is_done(redis: Redis, platform: str, idempotency_key: Optional[str]) -> bool:
+    """抓取窗口是否已成功完成, 未提供幂等键或Redis不可用时返回False"""
+    if not idempotency_key:
+        return False
+    try:
+        return bool(await redis.exists(_done_key(platform, idempotency_key)))
+    except RedisError as e:
+        logger.warning(f"读取幂等键失败: {e}")
+        return False
+
+
+async def mark_done(redis: Redis, platform: str, idempotency_key: Optional[str]):
+    """标记抓取窗口已完成(榜单已存储或未变化), 存储前失败的抓取不标记, 以便任务重试"""
+    if not idempotency_key:
+        return
+    try:
+        await redis.set(_done_key(platform, idempotency_key), 1, ex=settings.CRAWLER_STATE_TTL)
+    except RedisError as e:
+        logger.warning(f"写入幂等键失败: {e}")
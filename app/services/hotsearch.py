@@ -1,25 +1,60 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
+import re
+import time
 
 from loguru import logger
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from redis.asyncio import Redis
 
+from app.core.config import settings
+from app.models.base import parse_object_id
 from app.models.hotsearch import HotSearchModel
+from app.models.snapshot import HotSearchSnapshotModel
 from app.schemas.hotsearch import HotSearchCreate, HotSearchUpdate, HotSearchQueryParams
+from app.services import cache
+from app.services.pagination import build_keyset_filter
+from app.services.search import SEARCH_FIELD, build_search_grams, build_text_query, build_score_stage
+from app.services.snapshot import get_latest_snapshot, expand_snapshot
+
+
+# 列表排序规则, 以_id结尾保证全序, 供skip分页与游标分页共用
+LIST_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+PLATFORM_SORT = [("created_at", DESCENDING), ("rank", ASCENDING), ("_id", ASCENDING)]
+# 全文检索按相关度排序
+TEXT_SORT = [("score", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# 列表查询不返回检索字段
+LIST_PROJECTION = {SEARCH_FIELD: 0}
+
+
+def _apply_cursor(query: Dict[str, Any], cursor: Optional[str], sort: list) -> Dict[str, Any]:
+    """在查询条件上叠加游标分页条件"""
+    if not cursor:
+        return query
+    keyset = build_keyset_filter(cursor, sort)
+    return {"$and": [query, keyset]} if query else keyset
 
 
 async def get_all_hotsearches(
     db: AsyncIOMotorClient,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> List[dict]:
-    """获取所有热搜"""
+    """
+    获取所有热搜
+    :param cursor: 分页游标, 提供时忽略skip
+    """
     hotsearches = []
-    collection = db[HotSearchModel.Config.collection]
+    collection = db[HotSearchModel.model_config["collection"]]
     
-    cursor = collection.find().sort("created_at", DESCENDING).skip(skip).limit(limit)
-    async for doc in cursor:
+    query = _apply_cursor({}, cursor, LIST_SORT)
+    skip = 0 if cursor else skip
+    db_cursor = collection.find(query, LIST_PROJECTION).sort(LIST_SORT).skip(skip).limit(limit)
+    async for doc in db_cursor:
         hotsearches.append(doc)
         
     return hotsearches
@@ -29,30 +64,47 @@ async def get_hotsearches_by_platform(
     db: AsyncIOMotorClient,
     platform: str,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> List[dict]:
-    """按平台获取热搜"""
+    """
+    按平台获取热搜
+    :param cursor: 分页游标, 提供时忽略skip
+    """
     hotsearches = []
-    collection = db[HotSearchModel.Config.collection]
+    collection = db[HotSearchModel.model_config["collection"]]
     
-    cursor = collection.find({"platform": platform}).sort([
-        ("created_at", DESCENDING),
-        ("rank", 1)
-    ]).skip(skip).limit(limit)
+    query = _apply_cursor({"platform": platform}, cursor, PLATFORM_SORT)
+    skip = 0 if cursor else skip
+    db_cursor = collection.find(query, LIST_PROJECTION).sort(PLATFORM_SORT).skip(skip).limit(limit)
     
-    async for doc in cursor:
+    async for doc in db_cursor:
         hotsearches.append(doc)
         
     return hotsearches
 
 
+async def get_latest_hotsearches(
+    db: AsyncIOMotorClient,
+    platform: str
+) -> List[dict]:
+    """获取平台当前热搜榜, 从最新快照读取"""
+    snapshot = await get_latest_snapshot(db, platform)
+    if snapshot is None:
+        return []
+    return expand_snapshot(snapshot)
+
+
 async def get_hotsearch(
     db: AsyncIOMotorClient,
     hotsearch_id: str
 ) -> Optional[dict]:
     """获取单个热搜"""
-    collection = db[HotSearchModel.Config.collection]
-    return await collection.find_one({"_id": hotsearch_id})
+    object_id = parse_object_id(hotsearch_id)
+    if object_id is None:
+        return None
+    collection = db[HotSearchModel.model_config["collection"]]
+    return await collection.find_one({"_id": object_id})
 
 
 async def create_hotsearch(
@@ -60,15 +112,17 @@ async def create_hotsearch(
     hotsearch: HotSearchCreate
 ) -> dict:
     """创建热搜"""
-    collection = db[HotSearchModel.Config.collection]
+    collection = db[HotSearchModel.model_config["collection"]]
     
     hotsearch_dict = hotsearch.dict()
+    hotsearch_dict[SEARCH_FIELD] = build_search_grams(hotsearch.title, hotsearch.content)
     hotsearch_dict["created_at"] = datetime.now()
     hotsearch_dict["updated_at"] = datetime.now()
     
-    result = await collection.insert_one(hotsearch_dict)
+    # insert_one会将生成的_id写回hotsearch_dict, 无需再次查询
+    await collection.insert_one(hotsearch_dict)
     
-    return await collection.find_one({"_id": result.inserted_id})
+    return hotsearch_dict
 
 
 async def update_hotsearch(
@@ -76,38 +130,55 @@ async def update_hotsearch(
     hotsearch_id: str,
     hotsearch: HotSearchUpdate
 ) -> Optional[dict]:
-    """更新热搜"""
-    collection = db[HotSearchModel.Config.collection]
+    """
+    更新热搜, 通过find_one_and_update一次往返完成更新并返回更新后的文档
+    仅修改标题或内容之一时, 检索字段依赖另一字段的现值, 需额外一次写入重建
+    :return: 热搜不存在时返回None
+    """
+    object_id = parse_object_id(hotsearch_id)
+    if object_id is None:
+        return None
+    collection = db[HotSearchModel.model_config["collection"]]
     
     hotsearch_dict = {k: v for k, v in hotsearch.dict().items() if v is not None}
     hotsearch_dict["updated_at"] = datetime.now()
+    if "title" in hotsearch_dict and "content" in hotsearch_dict:
+        hotsearch_dict[SEARCH_FIELD] = build_search_grams(hotsearch_dict["title"], hotsearch_dict["content"])
     
-    await collection.update_one(
-        {"_id": hotsearch_id},
-        {"$set": hotsearch_dict}
+    doc = await collection.find_one_and_update(
+        {"_id": object_id},
+        {"$set": hotsearch_dict},
+        return_document=ReturnDocument.AFTER
     )
     
-    return await collection.find_one({"_id": hotsearch_id})
+    # 标题或内容变化时重建检索字段
+    if doc and SEARCH_FIELD not in hotsearch_dict and ("title" in hotsearch_dict or "content" in hotsearch_dict):
+        doc[SEARCH_FIELD] = build_search_grams(doc.get("title"), doc.get("content"))
+        await collection.update_one(
+            {"_id": object_id},
+            {"$set": {SEARCH_FIELD: doc[SEARCH_FIELD]}}
+        )
+    
+    return doc
 
 
 async def delete_hotsearch(
     db: AsyncIOMotorClient,
     hotsearch_id: str
-) -> bool:
-    """删除热搜"""
-    collection = db[HotSearchModel.Config.collection]
-    result = await collection.delete_one({"_id": hotsearch_id})
-    return result.deleted_count > 0
+) -> Optional[dict]:
+    """
+    删除热搜
+    :return: 被删除的热搜(仅含平台, 供调用方失效缓存), 不存在时返回None
+    """
+    object_id = parse_object_id(hotsearch_id)
+    if object_id is None:
+        return None
+    collection = db[HotSearchModel.model_config["collection"]]
+    return await collection.find_one_and_delete({"_id": object_id}, projection={"platform": 1})
 
 
-async def search_hotsearches(
-    db: AsyncIOMotorClient,
-    params: HotSearchQueryParams
-) -> List[dict]:
-    """搜索热搜"""
-    hotsearches = []
-    collection = db[HotSearchModel.Config.collection]
-    
+def _build_search_query(params: HotSearchQueryParams) -> Dict[str, Any]:
+    """根据查询参数构建过滤条件(不含分页条件)"""
     query: Dict[str, Any] = {}
     
     # 平台过滤
@@ -127,30 +198,171 @@ async def search_hotsearches(
     if date_query:
         query["created_at"] = date_query
     
-    # 关键词过滤
+    # 关键词过滤: 全文检索模式使用n-gram索引, 关键词无法切分时回退为正则匹配
     if params.keyword:
-        query["$or"] = [
-            {"title": {"$regex": params.keyword, "$options": "i"}},
-            {"content": {"$regex": params.keyword, "$options": "i"}}
+        text_query = build_text_query(params.keyword) if params.search_mode == "text" else None
+        if text_query:
+            query.update(text_query)
+        else:
+            # 关键词按字面匹配, 不解释为正则表达式
+            pattern = re.escape(params.keyword)
+            query["$or"] = [
+                {"title": {"$regex": pattern, "$options": "i"}},
+                {"content": {"$regex": pattern, "$options": "i"}}
+            ]
+    
+    return query
+
+
+def get_search_sort(params: HotSearchQueryParams) -> list:
+    """获取搜索结果的排序规则, 全文检索按相关度排序"""
+    if params.keyword and params.search_mode == "text" and build_text_query(params.keyword):
+        return TEXT_SORT
+    return LIST_SORT
+
+
+async def search_hotsearches(
+    db: AsyncIOMotorClient,
+    params: HotSearchQueryParams
+) -> List[dict]:
+    """搜索热搜"""
+    hotsearches = []
+    collection = db[HotSearchModel.model_config["collection"]]
+    
+    query = _build_search_query(params)
+    sort = get_search_sort(params)
+    skip = 0 if params.cursor else params.skip
+    
+    if sort is TEXT_SORT:
+        # 相关度为计算字段, 需先计算得分再叠加游标条件并排序
+        pipeline = [
+            {"$match": query},
+            build_score_stage(params.keyword),
+            {"$match": _apply_cursor({}, params.cursor, sort)},
+            {"$sort": dict(sort)},
+            {"$skip": skip},
+            {"$limit": params.limit},
+            {"$project": LIST_PROJECTION}
         ]
+        cursor = collection.aggregate(pipeline)
+    else:
+        query = _apply_cursor(query, params.cursor, sort)
+        cursor = collection.find(query, LIST_PROJECTION).sort(sort).skip(skip).limit(params.limit)
     
-    cursor = collection.find(query).sort("created_at", DESCENDING).skip(params.skip).limit(params.limit)
     async for doc in cursor:
         hotsearches.append(doc)
         
     return hotsearches
 
 
-async def clean_expired_data(
+async def _count_hotsearches(
     db: AsyncIOMotorClient,
-    days: int = 7
+    redis: Redis,
+    query: Dict[str, Any]
 ) -> int:
-    """清理过期数据"""
-    collection = db[HotSearchModel.Config.collection]
-    expiry_date = datetime.now() - timedelta(days=days)
+    """
+    统计热搜总数
+    无过滤条件时使用基于集合元数据的estimated_document_count, 否则使用count_documents;
+    结果按过滤条件短暂缓存, 避免每次列表请求都额外执行一次计数
+    """
+    total = await cache.get_cached_count(redis, query)
+    if total is not None:
+        return total
     
-    result = await collection.delete_many({"created_at": {"$lt": expiry_date}})
-    deleted_count = result.deleted_count
+    collection = db[HotSearchModel.model_config["collection"]]
+    if query:
+        total = await collection.count_documents(query)
+    else:
+        total = await collection.estimated_document_count()
     
-    logger.info(f"已清理 {deleted_count} 条过期热搜数据")
-    return deleted_count 
\ No newline at end of file
+    await cache.set_cached_count(redis, query, total)
+    return total
+
+
+async def count_all_hotsearches(
+    db: AsyncIOMotorClient,
+    redis: Redis
+) -> int:
+    """统计所有热搜总数"""
+    return await _count_hotsearches(db, redis, {})
+
+
+async def count_hotsearches_by_platform(
+    db: AsyncIOMotorClient,
+    redis: Redis,
+    platform: str
+) -> int:
+    """统计指定平台热搜总数"""
+    return await _count_hotsearches(db, redis, {"platform": platform})
+
+
+async def count_search_hotsearches(
+    db: AsyncIOMotorClient,
+    redis: Redis,
+    params: HotSearchQueryParams
+) -> int:
+    """统计搜索结果总数"""
+    return await _count_hotsearches(db, redis, _build_search_query(params))
+
+
+# 分批清理的集合及其时间字段
+EXPIRING_COLLECTIONS = (
+    (HotSearchModel.model_config["collection"], "created_at"),
+    (HotSearchSnapshotModel.model_config["collection"], "crawled_at"),
+)
+
+
+async def clean_expired_data(
+    db: AsyncIOMotorClient,
+    days: int = 7,
+    batch_size: Optional[int] = None,
+    batch_interval: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    分批清理过期的热搜及快照数据
+    每批按时间升序取出一批_id后按_id删除, 批次之间休眠以分散写入压力,
+    避免一次性delete_many造成的写入尖峰和锁竞争
+    :param days: 保留天数
+    :param batch_size: 每批删除条数, 默认为settings.PURGE_BATCH_SIZE
+    :param batch_interval: 批次间隔(秒), 默认为settings.PURGE_BATCH_INTERVAL
+    :return: 清理统计
+    """
+    expiry_date = datetime.now() - timedelta(days=days)
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    batch_interval = settings.PURGE_BATCH_INTERVAL if batch_interval is None else batch_interval
+
+    deleted_count = 0
+    batches = 0
+    start = time.perf_counter()
+
+    for collection_name, field in EXPIRING_COLLECTIONS:
+        collection = db[collection_name]
+        while True:
+            cursor = collection.find(
+                {field: {"$lt": expiry_date}},
+                {"_id": 1}
+            ).sort(field, ASCENDING).limit(batch_size)
+            ids = [doc["_id"] async for doc in cursor]
+            if not ids:
+                break
+
+            result = await collection.delete_many({"_id": {"$in": ids}})
+            deleted_count += result.deleted_count
+            batches += 1
+
+            if batches % 10 == 0:
+                logger.info(f"过期数据清理进度: 已完成{batches}批, 共清理{deleted_count}条")
+
+            if len(ids) < batch_size:
+                break
+            await asyncio.sleep(batch_interval)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "deleted_count": deleted_count,
+        "batches": batches,
+        "elapsed": round(elapsed, 3),
+        "rate": round(deleted_count / elapsed, 1) if elapsed > 0 else 0.0
+    }
+    logger.info(f"已清理 {deleted_count} 条过期热搜及快照数据, 统计: {stats}")
+    return stats
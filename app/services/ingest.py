@@ -0,0 +1,119 @@
+from typing import List, Optional, Dict, Any, Tuple, Union
+from datetime import datetime
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+
+from app.core.config import settings
+from app.models.hotsearch import HotSearchModel
+from app.services.search import SEARCH_FIELD, build_search_grams
+
+
+# 批量写入时覆盖的字段, 其余字段(平台、标题、抓取时间)构成唯一键, 只在插入时写入
+BULK_UPDATE_FIELDS = ("url", "rank", "hot_value", "category", "content", "tags")
+
+# MongoDB重复键错误码
+DUPLICATE_KEY_ERROR = 11000
+
+
+def get_write_concern(
+    w: Optional[Union[int, str]] = None,
+    journal: Optional[bool] = None
+) -> WriteConcern:
+    """
+    构建批量写入的写关注
+    :param w: 写确认级别, 0(不确认)、1(主节点确认)或majority, 默认为settings.BULK_WRITE_CONCERN
+    :param journal: 是否等待写入日志, 默认为settings.BULK_WRITE_JOURNAL
+    """
+    w = settings.BULK_WRITE_CONCERN if w is None else w
+    if isinstance(w, str) and w.isdigit():
+        w = int(w)
+    journal = settings.BULK_WRITE_JOURNAL if journal is None else journal
+    # w=0时不能要求写入日志
+    return WriteConcern(w=w, j=journal or None) if w != 0 else WriteConcern(w=0)
+
+
+def build_upsert(item: Dict[str, Any], crawled_at: datetime, now: datetime) -> UpdateOne:
+    """
+    构建单条热搜的upsert操作, 以平台+标题+抓取时间为键
+    同一次抓取重复写入(如任务重试、外部推送重发)时更新已有文档而不产生重复数据
+    """
+    return UpdateOne(
+        {"platform": item["platform"], "title": item["title"], "created_at": crawled_at},
+        {
+            "$setOnInsert": {"platform": item["platform"], "title": item["title"], "created_at": crawled_at},
+            "$set": {
+                **{field: item[field] for field in BULK_UPDATE_FIELDS if field in item},
+                SEARCH_FIELD: build_search_grams(item["title"], item.get("content")),
+                "updated_at": now
+            }
+        },
+        upsert=True
+    )
+
+
+async def _bulk_write(collection, operations: List[UpdateOne]) -> Tuple[Optional[dict], List[dict]]:
+    """
+    执行无序bulk_write
+    :return: 写入结果(w=0时服务端不返回, 为None)及失败操作的writeErrors
+    """
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return (result.bulk_api_result if result.acknowledged else None), []
+    except BulkWriteError as e:
+        return e.details, e.details.get("writeErrors", [])
+
+
+async def bulk_upsert_hotsearches(
+    db: AsyncIOMotorClient,
+    items: List[Dict[str, Any]],
+    crawled_at: Optional[datetime] = None,
+    write_concern: Optional[WriteConcern] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    批量写入热搜
+    按batch_size分批执行无序bulk_write, 单条失败不影响同批及后续批次的其他操作;
+    并发请求同时插入同一键时, upsert竞争失败的一方触发唯一索引的重复键错误, 此时文档已存在, 重试一次即按更新处理
+    :param crawled_at: 抓取时间, 默认取条目的created_at, 均未提供时使用当前时间
+    :param write_concern: 写关注, 默认为get_write_concern()
+    :return: 写入统计及失败条目(下标对应items)
+    """
+    collection = db[HotSearchModel.model_config["collection"]].with_options(
+        write_concern=write_concern or get_write_concern()
+    )
+    batch_size = batch_size or settings.BULK_BATCH_SIZE
+    now = datetime.now()
+
+    stats = {"received": len(items), "upserted": 0, "matched": 0, "modified": 0, "errors": []}
+    for offset in range(0, len(items), batch_size):
+        batch = items[offset:offset + batch_size]
+        operations = [
+            build_upsert(item, crawled_at or item.get("created_at") or now, now)
+            for item in batch
+        ]
+        results = [await _bulk_write(collection, operations)]
+        errors = [error for error in results[0][1] if error.get("code") != DUPLICATE_KEY_ERROR]
+        duplicates = [error["index"] for error in results[0][1] if error.get("code") == DUPLICATE_KEY_ERROR]
+        if duplicates:
+            results.append(await _bulk_write(collection, [operations[index] for index in duplicates]))
+            errors += [{**error, "index": duplicates[error["index"]]} for error in results[1][1]]
+
+        for details, _ in results:
+            # w=0时服务端不返回写入结果
+            if details is not None:
+                stats["upserted"] += details.get("nUpserted", 0)
+                stats["matched"] += details.get("nMatched", 0)
+                stats["modified"] += details.get("nModified", 0)
+        for error in sorted(errors, key=lambda error: error["index"]):
+            stats["errors"].append({"index": offset + error["index"], "message": error["errmsg"]})
+
+    if stats["errors"]:
+        logger.warning(f"批量写入热搜部分失败: {len(stats['errors'])}/{len(items)}条")
+    logger.info(
+        f"批量写入热搜完成: 新增{stats['upserted']}, 匹配{stats['matched']}, 更新{stats['modified']}"
+    )
+    return stats
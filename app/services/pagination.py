@@ -0,0 +1,57 @@
+import base64
+import binascii
+from typing import List, Optional, Tuple, Dict, Any
+
+from bson import json_util
+from bson.errors import BSONError
+from pymongo import DESCENDING
+
+
+# 排序规则: [(字段, 方向), ...], 最后一个字段必须唯一(通常为_id)以保证全序
+SortSpec = List[Tuple[str, int]]
+
+
+def encode_cursor(doc: Dict[str, Any], sort: SortSpec) -> str:
+    """将文档的排序键编码为不透明游标"""
+    values = {field: doc.get(field) for field, _ in sort}
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> Dict[str, Any]:
+    """
+    解码游标
+    :raises ValueError: 游标格式无效或与排序规则不匹配
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error, BSONError) as e:
+        raise ValueError("无效的分页游标") from e
+
+    if not isinstance(values, dict) or any(field not in values for field, _ in sort):
+        raise ValueError("无效的分页游标")
+    return values
+
+
+def build_keyset_filter(cursor: str, sort: SortSpec) -> Dict[str, Any]:
+    """
+    根据游标构建键集分页条件, 即按排序规则严格位于游标之后的文档
+    例如sort为[(created_at, -1), (_id, -1)]时生成:
+    {"$or": [{"created_at": {"$lt": t}}, {"created_at": t, "_id": {"$lt": id}}]}
+    """
+    values = decode_cursor(cursor, sort)
+    conditions = []
+    for i, (field, direction) in enumerate(sort):
+        condition = {prev_field: values[prev_field] for prev_field, _ in sort[:i]}
+        operator = "$lt" if direction == DESCENDING else "$gt"
+        condition[field] = {operator: values[field]}
+        conditions.append(condition)
+    return {"$or": conditions}
+
+
+def get_next_cursor(docs: List[Dict[str, Any]], limit: int, sort: SortSpec) -> Optional[str]:
+    """获取下一页游标, 当前页未满时说明已无更多数据"""
+    if not docs or len(docs) < limit:
+        return None
+    return encode_cursor(docs[-1], sort)
@@ -1,9 +1,11 @@
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import ASCENDING
+from pymongo import ASCENDING, ReturnDocument
 
+from app.core.config import settings
+from app.models.base import parse_object_id
 from app.models.platform import PlatformModel
 from app.schemas.platform import PlatformCreate, PlatformUpdate
 
@@ -15,7 +17,7 @@ async def get_all_platforms(
 ) -> List[dict]:
     """获取所有平台"""
     platforms = []
-    collection = db[PlatformModel.Config.collection]
+    collection = db[PlatformModel.model_config["collection"]]
     
     cursor = collection.find().sort("name", ASCENDING).skip(skip).limit(limit)
     async for doc in cursor:
@@ -30,10 +32,11 @@ async def get_platform(
     platform_name: str = None
 ) -> Optional[dict]:
     """获取单个平台"""
-    collection = db[PlatformModel.Config.collection]
+    collection = db[PlatformModel.model_config["collection"]]
     
     if platform_id:
-        return await collection.find_one({"_id": platform_id})
+        object_id = parse_object_id(platform_id)
+        return await collection.find_one({"_id": object_id}) if object_id else None
     elif platform_name:
         return await collection.find_one({"name": platform_name})
     
@@ -44,21 +47,22 @@ async def create_platform(
     db: AsyncIOMotorClient,
     platform: PlatformCreate
 ) -> dict:
-    """创建平台"""
-    collection = db[PlatformModel.Config.collection]
-    
-    # 检查平台是否已存在
-    existing = await collection.find_one({"name": platform.name})
-    if existing:
-        return existing
+    """
+    创建平台
+    以名称upsert, 平台已存在时直接返回已有平台, 一次往返完成检查与创建
+    """
+    collection = db[PlatformModel.model_config["collection"]]
     
     platform_dict = platform.dict()
     platform_dict["created_at"] = datetime.now()
     platform_dict["updated_at"] = datetime.now()
     
-    result = await collection.insert_one(platform_dict)
-    
-    return await collection.find_one({"_id": result.inserted_id})
+    return await collection.find_one_and_update(
+        {"name": platform.name},
+        {"$setOnInsert": platform_dict},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
 
 
 async def update_platform(
@@ -66,28 +70,43 @@ async def update_platform(
     platform_id: str,
     platform: PlatformUpdate
 ) -> Optional[dict]:
-    """更新平台"""
-    collection = db[PlatformModel.Config.collection]
+    """
+    更新平台
+    :return: 更新后的平台, 不存在时返回None
+    """
+    object_id = parse_object_id(platform_id)
+    if object_id is None:
+        return None
+    collection = db[PlatformModel.model_config["collection"]]
     
     platform_dict = {k: v for k, v in platform.dict().items() if v is not None}
     platform_dict["updated_at"] = datetime.now()
-    
-    await collection.update_one(
-        {"_id": platform_id},
-        {"$set": platform_dict}
+    update = {"$set": platform_dict}
+    if platform.crawl_frequency is not None:
+        # 修改抓取频率后从新频率重新开始自适应调整, 下次抓取时间不晚于按新频率计算的时间
+        platform_dict["crawl_interval"] = float(platform.crawl_frequency)
+        update["$min"] = {"next_crawl": platform_dict["updated_at"] + timedelta(minutes=platform.crawl_frequency)}
+    
+    return await collection.find_one_and_update(
+        {"_id": object_id},
+        update,
+        return_document=ReturnDocument.AFTER
     )
-    
-    return await collection.find_one({"_id": platform_id})
 
 
 async def delete_platform(
     db: AsyncIOMotorClient,
     platform_id: str
-) -> bool:
-    """删除平台"""
-    collection = db[PlatformModel.Config.collection]
-    result = await collection.delete_one({"_id": platform_id})
-    return result.deleted_count > 0
+) -> Optional[dict]:
+    """
+    删除平台
+    :return: 被删除的平台, 不存在时返回None
+    """
+    object_id = parse_object_id(platform_id)
+    if object_id is None:
+        return None
+    collection = db[PlatformModel.model_config["collection"]]
+    return await collection.find_one_and_delete({"_id": object_id})
 
 
 async def update_last_crawl(
@@ -95,15 +114,14 @@ async def update_last_crawl(
     platform_name: str
 ) -> Optional[dict]:
     """更新平台最后爬取时间"""
-    collection = db[PlatformModel.Config.collection]
+    collection = db[PlatformModel.model_config["collection"]]
     
     now = datetime.now()
-    await collection.update_one(
+    return await collection.find_one_and_update(
         {"name": platform_name},
-        {"$set": {"last_crawl": now, "updated_at": now}}
+        {"$set": {"last_crawl": now, "updated_at": now}},
+        return_document=ReturnDocument.AFTER
     )
-    
-    return await collection.find_one({"name": platform_name})
 
 
 async def get_active_platforms(
@@ -111,7 +129,7 @@ async def get_active_platforms(
 ) -> List[dict]:
     """获取所有激活的平台"""
     platforms = []
-    collection = db[PlatformModel.Config.collection]
+    collection = db[PlatformModel.model_config["collection"]]
     
     cursor = collection.find({"is_active": True}).sort("name", ASCENDING)
     async for doc in cursor:
@@ -130,50 +148,50 @@ async def initialize_default_platforms(
             "display_name": "微博",
             "base_url": "https://s.weibo.com/top/summary",
             "is_active": True,
-            "crawl_frequency": 60
+            "crawl_frequency": settings.FETCH_FREQUENCY
         },
         {
             "name": "baidu",
             "display_name": "百度",
             "base_url": "https://top.baidu.com/board?tab=realtime",
             "is_active": True,
-            "crawl_frequency": 60
+            "crawl_frequency": settings.FETCH_FREQUENCY
         },
         {
             "name": "zhihu",
             "display_name": "知乎",
             "base_url": "https://www.zhihu.com/hot",
             "is_active": True,
-            "crawl_frequency": 60
+            "crawl_frequency": settings.FETCH_FREQUENCY
         },
         {
             "name": "douyin",
             "display_name": "抖音",
             "base_url": "https://www.douyin.com/hot",
             "is_active": True,
-            "crawl_frequency": 60
+            "crawl_frequency": settings.FETCH_FREQUENCY
         },
         {
             "name": "bilibili",
             "display_name": "B站",
             "base_url": "https://www.bilibili.com/v/popular/rank/all",
             "is_active": True,
-            "crawl_frequency": 60
+            "crawl_frequency": settings.FETCH_FREQUENCY
         }
     ]
     
-    collection = db[PlatformModel.Config.collection]
+    collection = db[PlatformModel.model_config["collection"]]
     platforms = []
     
     for platform_data in default_platforms:
-        # 检查平台是否已存在
-        existing = await collection.find_one({"name": platform_data["name"]})
-        if not existing:
-            platform_data["created_at"] = datetime.now()
-            platform_data["updated_at"] = datetime.now()
-            await collection.insert_one(platform_data)
-            platforms.append(platform_data)
-        else:
-            platforms.append(existing)
+        # 平台已存在时保留原有数据
+        platform_data["created_at"] = datetime.now()
+        platform_data["updated_at"] = datetime.now()
+        platforms.append(await collection.find_one_and_update(
+            {"name": platform_data["name"]},
+            {"$setOnInsert": platform_data},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        ))
     
     return platforms 
\ No newline at end of file
@@ -0,0 +1,141 @@
+import asyncio
+from typing import Dict, List, Optional
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.models.platform import PlatformModel
+
+
+# 平台变更时向该频道发布消息, 所有订阅的进程(API及Worker)重新加载注册表
+INVALIDATION_CHANNEL = "platform:invalidate"
+
+# 订阅连接断开后的重连间隔(秒)
+RECONNECT_INTERVAL = 5.0
+
+
+class PlatformRegistry:
+    """
+    进程内的平台注册表
+    启动时从MongoDB加载全部平台, 之后通过Redis发布/订阅接收变更通知并重新加载,
+    接口校验平台及调度读取平台配置时只需查询内存中的字典
+    """
+
+    def __init__(self):
+        self._platforms: Dict[str, dict] = {}
+        self._by_id: Dict[str, dict] = {}
+        self._db: Optional[AsyncIOMotorClient] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.loaded = False
+
+    async def load(self, db: AsyncIOMotorClient) -> int:
+        """从数据库加载全部平台并整体替换"""
+        platforms = {}
+        async for doc in db[PlatformModel.model_config["collection"]].find():
+            platforms[doc["name"]] = doc
+
+        self._platforms = platforms
+        self._by_id = {str(doc["_id"]): doc for doc in platforms.values()}
+        self.loaded = True
+        logger.info(f"平台注册表已加载: {len(platforms)}个平台")
+        return len(platforms)
+
+    async def ensure_loaded(self, db: AsyncIOMotorClient):
+        """尚未加载(如未经启动流程的进程)时按需加载, 已加载时不产生网络IO"""
+        if not self.loaded:
+            await self.load(db)
+
+    def put(self, platform: dict):
+        """写入或替换单个平台, 用于本进程的写操作立即生效"""
+        self._platforms[platform["name"]] = platform
+        self._by_id[str(platform["_id"])] = platform
+
+    def remove(self, platform: dict):
+        """移除单个平台"""
+        self._platforms.pop(platform["name"], None)
+        self._by_id.pop(str(platform["_id"]), None)
+
+    def get(self, name: str) -> Optional[dict]:
+        """按名称获取平台"""
+        return self._platforms.get(name)
+
+    def get_by_id(self, platform_id: str) -> Optional[dict]:
+        """按ID获取平台"""
+        return self._by_id.get(platform_id)
+
+    def get_active(self) -> List[dict]:
+        """获取所有激活的平台(按名称排序)"""
+        return sorted(
+            (doc for doc in self._platforms.values() if doc.get("is_active")),
+            key=lambda x: x["name"]
+        )
+
+    def is_valid(self, name: str) -> bool:
+        """
+        校验平台标识
+        注册表为空(尚未加载或未初始化平台数据)时回退为settings.PLATFORMS
+        """
+        if not self._platforms:
+            return name in settings.PLATFORMS
+        return name in self._platforms
+
+    def get_active_names(self) -> List[str]:
+        """获取所有激活平台的标识, 注册表为空时回退为settings.PLATFORMS"""
+        if not self._platforms:
+            return list(settings.PLATFORMS)
+        return [doc["name"] for doc in self.get_active()]
+
+    async def _listen(self, redis: Redis):
+        """订阅变更通知, 收到消息后重新加载; 连接异常时自动重连并补加载一次"""
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        logger.info(f"收到平台变更通知: {message['data']!r}")
+                        await self.load(self._db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"平台变更订阅异常, {RECONNECT_INTERVAL}秒后重连: {e}")
+                await asyncio.sleep(RECONNECT_INTERVAL)
+                # 断线期间可能错过通知
+                try:
+                    await self.load(self._db)
+                except Exception as e:
+                    logger.warning(f"重新加载平台注册表失败: {e}")
+            finally:
+                await pubsub.aclose()
+
+    async def start(self, db: AsyncIOMotorClient, redis: Redis):
+        """加载注册表并在当前事件循环中启动变更订阅"""
+        self._db = db
+        await self.load(db)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(redis))
+
+    async def stop(self):
+        """停止变更订阅"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+platform_registry = PlatformRegistry()
+
+
+async def publish_platform_change(redis: Redis, name: str):
+    """通知所有进程平台已变更"""
+    try:
+        await redis.publish(INVALIDATION_CHANNEL, name)
+    except RedisError as e:
+        logger.warning(f"发布平台变更通知失败: {e}")
@@ -0,0 +1,338 @@
+import argparse
+import asyncio
+from typing import List, Optional, Dict, Any, AsyncIterator, Set, Tuple
+from datetime import datetime, timedelta
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from app.core.config import settings
+from app.models.hotsearch import HotSearchModel
+from app.models.rollup import HourlyRollupModel, DailyRollupModel
+from app.models.snapshot import HotSearchSnapshotModel
+from app.services.registry import platform_registry
+from app.services.scheduler import get_max_interval
+from app.services.topic import get_topic_id
+
+
+# 汇总粒度 -> (集合名, 时间桶截断函数)
+GRANULARITIES = {
+    "hour": (
+        HourlyRollupModel.model_config["collection"],
+        lambda t: t.replace(minute=0, second=0, microsecond=0)
+    ),
+    "day": (
+        DailyRollupModel.model_config["collection"],
+        lambda t: t.replace(hour=0, minute=0, second=0, microsecond=0)
+    ),
+}
+
+# 排行支持的排序方式
+ROLLUP_SORTS = {
+    "best_rank": [("best_rank", ASCENDING), ("time_on_list", DESCENDING)],
+    "time_on_list": [("time_on_list", DESCENDING), ("best_rank", ASCENDING)],
+    "peak_hot_value": [("peak_hot_value", DESCENDING), ("best_rank", ASCENDING)],
+}
+
+
+def get_rollup_id(topic_id: str, bucket: datetime) -> str:
+    """汇总文档ID"""
+    return f"{topic_id}:{bucket:%Y%m%d%H}"
+
+
+def get_max_gap(platform: str) -> int:
+    """
+    累计在榜时长时相邻两次抓取的最大间隔(秒)
+    不小于ROLLUP_MAX_INTERVAL, 且覆盖平台自适应调度后的最长抓取间隔(加一个调度周期), 稳定榜单放慢抓取时不会少计
+    """
+    longest = get_max_interval(platform_registry.get(platform) or {}) * 60 + settings.SCHEDULER_TICK
+    return max(settings.ROLLUP_MAX_INTERVAL, int(longest))
+
+
+def accumulate_crawl(
+    aggregates: Dict[Tuple[str, str], dict],
+    platform: str,
+    items: List[Dict[str, Any]],
+    crawled_at: datetime,
+    previous_topic_ids: Set[str],
+    previous_crawled_at: Optional[datetime] = None,
+    max_gap: Optional[int] = None
+) -> Set[str]:
+    """
+    将一次抓取累加到各粒度的汇总中
+    在榜时长: 相邻两次抓取均在榜的话题累加两次抓取的间隔(不超过max_gap, 避免停抓期间被计入)
+    :param aggregates: (粒度, 汇总文档ID) -> 汇总, 原地更新
+    :param previous_topic_ids: 上一次抓取在榜的话题ID
+    :param max_gap: 计入的最大间隔(秒), 默认为settings.ROLLUP_MAX_INTERVAL
+    :return: 本次抓取在榜的话题ID
+    """
+    interval = 0
+    if previous_crawled_at is not None:
+        interval = min(int((crawled_at - previous_crawled_at).total_seconds()), max_gap or settings.ROLLUP_MAX_INTERVAL)
+
+    topic_ids = set()
+    for item in sorted(items, key=lambda x: x["rank"]):
+        topic_id = get_topic_id(platform, item["title"])
+        # 同一次抓取中归一化后重复的标题只记录排名最高的一条
+        if topic_id in topic_ids:
+            continue
+        topic_ids.add(topic_id)
+
+        hot_value = item.get("hot_value")
+        time_on_list = interval if topic_id in previous_topic_ids else 0
+        for granularity, (_, truncate) in GRANULARITIES.items():
+            bucket = truncate(crawled_at)
+            key = (granularity, get_rollup_id(topic_id, bucket))
+            rollup = aggregates.get(key)
+            if rollup is None:
+                aggregates[key] = {
+                    "platform": platform,
+                    "topic_id": topic_id,
+                    "bucket": bucket,
+                    "title": item["title"],
+                    "url": item["url"],
+                    "best_rank": item["rank"],
+                    "peak_hot_value": hot_value,
+                    "appearances": 1,
+                    "time_on_list": time_on_list,
+                    "first_seen": crawled_at,
+                    "last_seen": crawled_at,
+                }
+                continue
+
+            rollup["best_rank"] = min(rollup["best_rank"], item["rank"])
+            if hot_value is not None:
+                rollup["peak_hot_value"] = max(rollup["peak_hot_value"] or hot_value, hot_value)
+            rollup["appearances"] += 1
+            rollup["time_on_list"] += time_on_list
+            rollup["first_seen"] = min(rollup["first_seen"], crawled_at)
+            if crawled_at >= rollup["last_seen"]:
+                rollup.update({"title": item["title"], "url": item["url"], "last_seen": crawled_at})
+
+    return topic_ids
+
+
+async def _write_rollups(
+    db: AsyncIOMotorClient,
+    aggregates: Dict[Tuple[str, str], dict],
+    repair: bool = False
+) -> int:
+    """
+    写入汇总
+    :param repair: False时将本次抓取累加到已有汇总; True时为重算结果, 与已有汇总逐字段取最值合并(幂等),
+                   只补齐增量更新遗漏的部分, 不会用不完整的原始数据(已过期, 或榜单未变化而未存储的抓取)降低已有汇总
+    :return: 新增或更新的汇总文档数
+    """
+    operations: Dict[str, List[UpdateOne]] = {granularity: [] for granularity in GRANULARITIES}
+    now = datetime.now()
+    for (granularity, rollup_id), rollup in aggregates.items():
+        update = {
+            "$setOnInsert": {
+                "platform": rollup["platform"],
+                "topic_id": rollup["topic_id"],
+                "bucket": rollup["bucket"],
+                "created_at": now
+            },
+            "$set": {"title": rollup["title"], "url": rollup["url"], "updated_at": now},
+            "$min": {"best_rank": rollup["best_rank"], "first_seen": rollup["first_seen"]},
+            "$max": {"last_seen": rollup["last_seen"]},
+        }
+        counters = {"appearances": rollup["appearances"], "time_on_list": rollup["time_on_list"]}
+        if repair:
+            update["$max"].update(counters)
+        else:
+            update["$inc"] = counters
+        if rollup["peak_hot_value"] is not None:
+            update["$max"]["peak_hot_value"] = rollup["peak_hot_value"]
+        operations[granularity].append(UpdateOne({"_id": rollup_id}, update, upsert=True))
+
+    count = 0
+    for granularity, ops in operations.items():
+        if ops:
+            result = await db[GRANULARITIES[granularity][0]].bulk_write(ops, ordered=False)
+            count += result.upserted_count + result.modified_count
+    return count
+
+
+async def update_rollups(
+    db: AsyncIOMotorClient,
+    platform: str,
+    trend: Dict[str, Any],
+    unchanged: bool = False
+) -> int:
+    """
+    抓取完成后增量更新汇总
+    直接使用update_trends返回的趋势文档: 带prev_rank的条目即上一次抓取也在榜的话题
+    :param unchanged: 榜单与上一次抓取相同(trend为touch_trends返回的趋势文档), 所有条目均在上一次抓取在榜,
+                      本次抓取同样计入出现次数及在榜时长, 稳定的榜单不会因跳过存储而少计
+    """
+    if unchanged:
+        previous_topic_ids = {item["topic_id"] for item in trend["items"]}
+    else:
+        previous_topic_ids = {item["topic_id"] for item in trend["items"] if item.get("prev_rank") is not None}
+    aggregates: Dict[Tuple[str, str], dict] = {}
+    accumulate_crawl(
+        aggregates, platform, trend["items"], trend["crawled_at"],
+        previous_topic_ids, trend.get("previous_crawled_at"), get_max_gap(platform)
+    )
+
+    count = await _write_rollups(db, aggregates)
+    logger.info(f"平台[{platform}]汇总已更新: {count}条")
+    return count
+
+
+async def _iter_crawls(
+    db: AsyncIOMotorClient,
+    start: datetime,
+    end: datetime
+) -> AsyncIterator[Tuple[str, datetime, List[dict]]]:
+    """
+    按平台、抓取时间顺序读取原始抓取数据
+    STORAGE_MODE为items时没有快照, 按(platform, created_at)将hot_searches中的条目还原为抓取
+    """
+    if settings.STORAGE_MODE != "items":
+        collection = db[HotSearchSnapshotModel.model_config["collection"]]
+        cursor = collection.find(
+            {"crawled_at": {"$gte": start, "$lt": end}},
+            {"platform": 1, "crawled_at": 1, "items": 1}
+        ).sort([("platform", ASCENDING), ("crawled_at", ASCENDING)])
+        async for snapshot in cursor:
+            yield snapshot["platform"], snapshot["crawled_at"], snapshot["items"]
+        return
+
+    collection = db[HotSearchModel.model_config["collection"]]
+    cursor = collection.find(
+        {"created_at": {"$gte": start, "$lt": end}},
+        {"platform": 1, "created_at": 1, "title": 1, "url": 1, "rank": 1, "hot_value": 1}
+    ).sort([("platform", ASCENDING), ("created_at", ASCENDING)])
+    crawl_key, items = None, []
+    async for doc in cursor:
+        key = (doc["platform"], doc["created_at"])
+        if key != crawl_key and items:
+            yield crawl_key[0], crawl_key[1], items
+            items = []
+        crawl_key = key
+        items.append(doc)
+    if items:
+        yield crawl_key[0], crawl_key[1], items
+
+
+def get_retained_start(now: Optional[datetime] = None) -> datetime:
+    """
+    原始数据保证完整的起点
+    更早的原始数据可能已被TTL索引或清理任务删除, 保留边界所在的小时可能正在被删除, 额外留出一个小时桶的余量
+    """
+    now = now or datetime.now()
+    return GRANULARITIES["hour"][1](now - timedelta(days=settings.HISTORY_DAYS)) + timedelta(hours=1)
+
+
+async def rebuild_rollups(
+    db: AsyncIOMotorClient,
+    start: datetime,
+    end: Optional[datetime] = None
+) -> int:
+    """
+    根据原始数据重算时间范围内的汇总并与已有汇总取最值合并(幂等), 用于修复增量更新遗漏及回填历史
+    start向前对齐到整天以重算完整的日汇总, 但不早于原始数据的保留起点(get_retained_start);
+    榜单未变化的抓取不写入原始数据, 重算结果可能低于增量汇总, 因此只补齐而不覆盖
+    :return: 写入的汇总文档数
+    """
+    end = end or datetime.now()
+    start = max(GRANULARITIES["day"][1](start), get_retained_start(end))
+    # 多读取一段start之前的抓取, 只用于计算第一次抓取的在榜时长
+    lookback = start - timedelta(seconds=max(get_max_gap(platform) for platform in settings.PLATFORMS))
+
+    aggregates: Dict[Tuple[str, str], dict] = {}
+    crawls = 0
+    previous: Dict[str, Tuple[datetime, Set[str]]] = {}
+    async for platform, crawled_at, items in _iter_crawls(db, lookback, end):
+        previous_crawled_at, previous_topic_ids = previous.get(platform, (None, set()))
+        if crawled_at < start:
+            topic_ids = {get_topic_id(platform, item["title"]) for item in items}
+        else:
+            topic_ids = accumulate_crawl(
+                aggregates, platform, items, crawled_at, previous_topic_ids, previous_crawled_at,
+                get_max_gap(platform)
+            )
+            crawls += 1
+        previous[platform] = (crawled_at, topic_ids)
+
+    count = await _write_rollups(db, aggregates, repair=True)
+    logger.info(f"汇总重算完成: {start} ~ {end}, {crawls}次抓取, 写入{count}条")
+    return count
+
+
+async def get_top_topics(
+    db: AsyncIOMotorClient,
+    platform: str,
+    granularity: str = "day",
+    bucket: Optional[datetime] = None,
+    sort_by: str = "best_rank",
+    limit: int = 20
+) -> Tuple[Optional[datetime], List[dict]]:
+    """
+    获取平台在某个时间桶内的话题排行, 只读取汇总集合
+    :param bucket: 时间桶内的任意时间, 默认为最近一个时间桶
+    :return: (时间桶起点, 话题汇总列表)
+    """
+    collection_name, truncate = GRANULARITIES[granularity]
+    collection = db[collection_name]
+
+    if bucket is None:
+        latest = await collection.find_one({"platform": platform}, {"bucket": 1}, sort=[("bucket", DESCENDING)])
+        if latest is None:
+            return None, []
+        bucket = latest["bucket"]
+    else:
+        bucket = truncate(bucket)
+
+    rollups = []
+    cursor = collection.find({"platform": platform, "bucket": bucket}).sort(ROLLUP_SORTS[sort_by]).limit(limit)
+    async for doc in cursor:
+        rollups.append(doc)
+
+    return bucket, rollups
+
+
+async def get_topic_rollups(
+    db: AsyncIOMotorClient,
+    topic_id: str,
+    granularity: str = "day",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 100
+) -> List[dict]:
+    """按时间顺序获取话题各时间桶的汇总"""
+    rollups = []
+    collection = db[GRANULARITIES[granularity][0]]
+
+    query: Dict[str, Any] = {"topic_id": topic_id}
+    date_query = {}
+    if start_date:
+        date_query["$gte"] = start_date
+    if end_date:
+        date_query["$lte"] = end_date
+    if date_query:
+        query["bucket"] = date_query
+
+    cursor = collection.find(query).sort("bucket", ASCENDING).limit(limit)
+    async for doc in cursor:
+        rollups.append(doc)
+
+    return rollups
+
+
+async def _main(hours: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        await rebuild_rollups(client.get_database(), datetime.now() - timedelta(hours=hours))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="热搜话题汇总重算")
+    parser.add_argument("--hours", type=int, default=settings.ROLLUP_REBUILD_HOURS, help="重算最近多少小时的汇总")
+    args = parser.parse_args()
+    asyncio.run(_main(args.hours))
@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.models.platform import PlatformModel
+from app.services.platform import initialize_default_platforms
+
+
+def compute_volatility(trends: List[Dict[str, Any]]) -> Optional[float]:
+    """
+    根据趋势计算本次榜单相对上一次的变化程度, 取值0~1
+    变化程度 = (新上榜条数 + 已在榜条目排名变化总和 / 榜单长度) / 榜单长度
+    即榜单中被替换的比例加上排名整体移动的比例, 例如榜首新增一条时约为2/榜单长度, 整个榜单更换时为1
+    :return: 首次抓取(没有可比较的上一次榜单)时返回None
+    """
+    if not trends:
+        return None
+    if not any(trend["is_new"] or trend["prev_rank"] is not None for trend in trends):
+        return None
+
+    size = len(trends)
+    new_count = sum(1 for trend in trends if trend["is_new"])
+    moved = sum(abs(trend["rank_delta"]) for trend in trends if not trend["is_new"])
+    return round(min(1.0, (new_count + moved / size) / size), 4)
+
+
+def get_base_interval(platform: dict) -> float:
+    """平台配置的抓取间隔(分钟), 未配置时使用settings.FETCH_FREQUENCY"""
+    return float(platform.get("crawl_frequency") or settings.FETCH_FREQUENCY)
+
+
+def get_interval(platform: dict) -> float:
+    """平台当前的抓取间隔(分钟)"""
+    return float(platform.get("crawl_interval") or get_base_interval(platform))
+
+
+def get_max_interval(platform: dict) -> float:
+    """平台可能的最长抓取间隔(分钟), 自适应调度时为配置间隔 * SCHEDULER_MAX_FACTOR"""
+    base = get_base_interval(platform)
+    return base * settings.SCHEDULER_MAX_FACTOR if settings.SCHEDULER_ADAPTIVE else base
+
+
+def next_interval(platform: dict, volatility: Optional[float]) -> Dict[str, Any]:
+    """
+    根据本次榜单变化程度调整抓取间隔
+    变化程度取指数移动平均, 高于SCHEDULER_HIGH_VOLATILITY时缩短间隔, 低于SCHEDULER_LOW_VOLATILITY时延长间隔,
+    介于两者之间时保持不变; 间隔限制在[min(SCHEDULER_MIN_INTERVAL, 配置间隔), 配置间隔 * SCHEDULER_MAX_FACTOR]
+    :return: crawl_interval及volatility字段
+    """
+    base = get_base_interval(platform)
+    ema = platform.get("volatility")
+    if volatility is not None:
+        alpha = settings.SCHEDULER_VOLATILITY_ALPHA
+        ema = volatility if ema is None else alpha * volatility + (1 - alpha) * ema
+
+    if ema is not None:
+        ema = round(ema, 4)
+    if not settings.SCHEDULER_ADAPTIVE:
+        return {"crawl_interval": base, "volatility": ema}
+
+    interval = get_interval(platform)
+    if volatility is not None:
+        if ema >= settings.SCHEDULER_HIGH_VOLATILITY:
+            interval *= settings.SCHEDULER_SPEEDUP
+        elif ema <= settings.SCHEDULER_LOW_VOLATILITY:
+            interval *= settings.SCHEDULER_SLOWDOWN
+
+    lower = min(settings.SCHEDULER_MIN_INTERVAL, base)
+    upper = get_max_interval(platform)
+    return {"crawl_interval": round(min(max(interval, lower), upper), 2), "volatility": ema}
+
+
+async def record_crawl(
+    db: AsyncIOMotorClient,
+    platform_name: str,
+    volatility: Optional[float] = None,
+    crawled_at: Optional[datetime] = None
+) -> Optional[dict]:
+    """
+    抓取完成后更新平台的最后抓取时间, 并根据榜单变化程度调整下次抓取时间
+    :param volatility: 本次榜单变化程度, 为None(首次抓取或未获取到数据)时保持当前间隔
+    :return: 更新后的平台, 不存在时返回None
+    """
+    collection = db[PlatformModel.model_config["collection"]]
+    platform = await collection.find_one({"name": platform_name})
+    if platform is None:
+        return None
+
+    now = crawled_at or datetime.now()
+    schedule = next_interval(platform, volatility)
+    if schedule["crawl_interval"] != platform.get("crawl_interval"):
+        logger.info(
+            f"平台[{platform_name}]抓取间隔调整为{schedule['crawl_interval']}分钟"
+            f"(变化程度: {volatility}, 平均: {schedule['volatility']})"
+        )
+
+    return await collection.find_one_and_update(
+        {"_id": platform["_id"]},
+        {"$set": {
+            **schedule,
+            "last_crawl": now,
+            "next_crawl": now + timedelta(minutes=schedule["crawl_interval"]),
+            "updated_at": now
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def claim_due_platforms(
+    db: AsyncIOMotorClient,
+    now: Optional[datetime] = None
+) -> List[dict]:
+    """
+    领取到期需要抓取的激活平台
+    领取时以原next_crawl为条件将其推迟一个抓取间隔, 抓取任务排队或执行期间不会被重复领取,
+    多个调度进程同时运行时同一平台也只会被其中一个领取; 抓取完成后由record_crawl重新计算下次抓取时间
+    平台数据尚未初始化时先写入默认平台
+    :return: 领取成功的平台
+    """
+    collection = db[PlatformModel.model_config["collection"]]
+    now = now or datetime.now()
+
+    claimed = []
+    cursor = collection.find({
+        "is_active": True,
+        "$or": [{"next_crawl": None}, {"next_crawl": {"$lte": now}}]
+    })
+    async for platform in cursor:
+        doc = await collection.find_one_and_update(
+            {"_id": platform["_id"], "next_crawl": platform.get("next_crawl")},
+            {"$set": {"next_crawl": now + timedelta(minutes=get_interval(platform))}},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc is not None:
+            claimed.append(doc)
+
+    if not claimed and not await collection.estimated_document_count():
+        await initialize_default_platforms(db)
+        return await claim_due_platforms(db, now)
+
+    return claimed
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import re
+import unicodedata
+from typing import List, Optional, Dict, Any
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.models.hotsearch import HotSearchModel
+
+
+# 热搜标题的全文检索基于字符n-gram倒排索引:
+# 入库时将标题和内容切分为n-gram写入search_grams字段(多键索引),
+# 查询时将关键词按相同规则切分, 要求文档包含全部n-gram, 再按匹配密度排序。
+# 中文按连续汉字的二元组切分, 无需分词词典; 字母数字按整词切分。
+SEARCH_FIELD = "search_grams"
+
+# 连续的汉字(含日韩文字)或连续的字母数字
+_TOKEN_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+|[0-9a-z]+")
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """文本归一化: 全角转半角并转为小写"""
+    if not text:
+        return ""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    将文本切分为去重后的n-gram
+    连续汉字切分为二元组(单个汉字保留为一元组), 字母数字保留整词
+    """
+    grams: List[str] = []
+    seen = set()
+    for run in _TOKEN_PATTERN.findall(normalize_text(text)):
+        if _CJK_PATTERN.match(run) and len(run) > 1:
+            candidates = [run[i:i + 2] for i in range(len(run) - 1)]
+        else:
+            candidates = [run]
+        for gram in candidates:
+            if gram not in seen:
+                seen.add(gram)
+                grams.append(gram)
+    return grams
+
+
+def build_search_grams(title: Optional[str], content: Optional[str] = None) -> List[str]:
+    """构建文档的检索字段"""
+    grams = tokenize(title)
+    seen = set(grams)
+    grams.extend(gram for gram in tokenize(content) if gram not in seen)
+    return grams
+
+
+def _query_grams(keyword: str) -> List[str]:
+    """关键词的n-gram, 忽略无法可靠匹配的单个汉字"""
+    return [gram for gram in tokenize(keyword) if not (len(gram) == 1 and _CJK_PATTERN.match(gram))]
+
+
+def build_text_query(keyword: str) -> Optional[Dict[str, Any]]:
+    """
+    构建全文检索条件
+    :return: 关键词无法切分为可检索的n-gram(如单个汉字)时返回None, 由调用方回退为正则匹配
+    """
+    grams = _query_grams(keyword)
+    if not grams:
+        return None
+    return {SEARCH_FIELD: {"$all": grams}}
+
+
+def build_score_stage(keyword: str) -> Dict[str, Any]:
+    """
+    构建相关度计算阶段
+    相关度为关键词n-gram数占文档n-gram数的比例, 标题越短越贴近关键词则得分越高
+    """
+    query_size = len(_query_grams(keyword))
+    return {
+        "$addFields": {
+            "score": {
+                "$divide": [query_size, {"$max": [{"$size": {"$ifNull": [f"${SEARCH_FIELD}", []]}}, 1]}]
+            }
+        }
+    }
+
+
+async def rebuild_search_index(
+    db: AsyncIOMotorClient,
+    batch_size: int = 1000,
+    only_missing: bool = True
+) -> int:
+    """
+    为已有文档回填检索字段
+    :param only_missing: 仅处理缺少检索字段的文档
+    :return: 更新的文档数
+    """
+    collection = db[HotSearchModel.model_config["collection"]]
+    query = {SEARCH_FIELD: {"$exists": False}} if only_missing else {}
+
+    updated = 0
+    operations = []
+    async for doc in collection.find(query, {"title": 1, "content": 1}):
+        grams = build_search_grams(doc.get("title"), doc.get("content"))
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {SEARCH_FIELD: grams}}))
+        if len(operations) >= batch_size:
+            result = await collection.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+            operations = []
+            logger.info(f"检索字段回填进度: {updated}")
+
+    if operations:
+        result = await collection.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+
+    logger.info(f"检索字段回填完成, 共更新{updated}条")
+    return updated
+
+
+async def _main(rebuild_all: bool):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        await rebuild_search_index(client.get_database(), only_missing=not rebuild_all)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="热搜全文检索字段回填")
+    parser.add_argument("--all", action="store_true", help="重建所有文档的检索字段(默认仅处理缺失的文档)")
+    args = parser.parse_args()
+    asyncio.run(_main(args.all))
@@ -0,0 +1,102 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING
+
+from app.models.snapshot import HotSearchSnapshotModel
+
+
+# 快照条目保留的字段, 平台、时间戳等公共字段只在快照文档上保存一次
+SNAPSHOT_ITEM_FIELDS = ("title", "url", "rank", "hot_value", "category", "content", "tags")
+
+# 条目字段为默认值时不存储
+SNAPSHOT_ITEM_DEFAULTS = {"category": "general", "content": None, "tags": [], "hot_value": None}
+
+
+def compact_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """将热搜条目压缩为快照条目"""
+    return {
+        field: item[field]
+        for field in SNAPSHOT_ITEM_FIELDS
+        if field in item and (field not in SNAPSHOT_ITEM_DEFAULTS or item[field] != SNAPSHOT_ITEM_DEFAULTS[field])
+    }
+
+
+def expand_snapshot(snapshot: Dict[str, Any]) -> List[dict]:
+    """将快照展开为与hot_searches文档结构一致的热搜列表"""
+    hotsearches = []
+    for item in snapshot.get("items", []):
+        hotsearch = {**SNAPSHOT_ITEM_DEFAULTS, **item}
+        hotsearch["tags"] = list(hotsearch["tags"])
+        hotsearch.update({
+            "id": f"{snapshot['_id']}-{item['rank']}",
+            "platform": snapshot["platform"],
+            "created_at": snapshot["crawled_at"],
+            "updated_at": snapshot["crawled_at"]
+        })
+        hotsearches.append(hotsearch)
+    return hotsearches
+
+
+async def save_snapshot(
+    db: AsyncIOMotorClient,
+    platform: str,
+    items: List[Dict[str, Any]],
+    crawled_at: Optional[datetime] = None
+) -> dict:
+    """保存一次抓取的快照"""
+    collection = db[HotSearchSnapshotModel.model_config["collection"]]
+    
+    now = datetime.now()
+    snapshot = {
+        "platform": platform,
+        "crawled_at": crawled_at or now,
+        "item_count": len(items),
+        "items": [compact_item(item) for item in sorted(items, key=lambda x: x["rank"])],
+        "created_at": now,
+        "updated_at": now
+    }
+    
+    result = await collection.insert_one(snapshot)
+    snapshot["_id"] = result.inserted_id
+    return snapshot
+
+
+async def get_latest_snapshot(
+    db: AsyncIOMotorClient,
+    platform: str
+) -> Optional[dict]:
+    """获取平台最新快照, 通过(platform, crawled_at)索引一次查询完成"""
+    collection = db[HotSearchSnapshotModel.model_config["collection"]]
+    return await collection.find_one(
+        {"platform": platform},
+        sort=[("crawled_at", DESCENDING)]
+    )
+
+
+async def get_snapshots(
+    db: AsyncIOMotorClient,
+    platform: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 24
+) -> List[dict]:
+    """按时间倒序获取平台的历史快照"""
+    snapshots = []
+    collection = db[HotSearchSnapshotModel.model_config["collection"]]
+    
+    query: Dict[str, Any] = {"platform": platform}
+    date_query = {}
+    if start_date:
+        date_query["$gte"] = start_date
+    if end_date:
+        date_query["$lte"] = end_date
+    if date_query:
+        query["crawled_at"] = date_query
+    
+    cursor = collection.find(query).sort("crawled_at", DESCENDING).limit(limit)
+    async for doc in cursor:
+        snapshots.append(doc)
+        
+    return snapshots
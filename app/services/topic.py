@@ -0,0 +1,127 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+import hashlib
+import re
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING, UpdateOne
+
+from app.core.config import settings
+from app.models.topic import TopicModel
+from app.services.search import normalize_text
+
+
+# 列表查询不返回时间序列
+TOPIC_LIST_PROJECTION = {"points": 0}
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """标题归一化: 全角转半角、转小写并去除空白及标点"""
+    return _NON_WORD_PATTERN.sub("", normalize_text(title))
+
+
+def get_topic_id(platform: str, title: str) -> str:
+    """
+    根据平台与归一化标题生成话题ID
+    仅由标点、表情组成的标题归一化后为空, 改用原始标题, 避免不同标题合并为同一个话题
+    """
+    key = normalize_title(title) or title.strip()
+    return hashlib.sha1(f"{platform}:{key}".encode()).hexdigest()
+
+
+async def ingest_topics(
+    db: AsyncIOMotorClient,
+    platform: str,
+    items: List[Dict[str, Any]],
+    crawled_at: Optional[datetime] = None
+) -> int:
+    """
+    将一次抓取的热搜合并到话题
+    每个条目对应一次upsert: 新话题写入首次上榜时间, 已有话题追加时间序列点并更新最高排名与峰值热度
+    :return: 新增或更新的话题数
+    """
+    if not items:
+        return 0
+
+    collection = db[TopicModel.model_config["collection"]]
+    crawled_at = crawled_at or datetime.now()
+
+    operations = []
+    seen = set()
+    for item in items:
+        topic_id = get_topic_id(platform, item["title"])
+        # 同一次抓取中归一化后重复的标题只记录排名最高的一条
+        if topic_id in seen:
+            continue
+        seen.add(topic_id)
+
+        hot_value = item.get("hot_value")
+        update = {
+            "$setOnInsert": {"platform": platform, "first_seen": crawled_at, "created_at": crawled_at},
+            "$set": {"title": item["title"], "url": item["url"], "last_seen": crawled_at, "updated_at": crawled_at},
+            "$min": {"best_rank": item["rank"]},
+            "$inc": {"appearances": 1},
+            "$push": {
+                "points": {
+                    "$each": [{"t": crawled_at, "rank": item["rank"], "hot_value": hot_value}],
+                    "$slice": -settings.TOPIC_MAX_POINTS
+                }
+            }
+        }
+        if hot_value is not None:
+            update["$max"] = {"peak_hot_value": hot_value}
+        operations.append(UpdateOne({"_id": topic_id}, update, upsert=True))
+
+    result = await collection.bulk_write(operations, ordered=False)
+    count = result.upserted_count + result.modified_count
+    logger.info(f"平台[{platform}]话题合并完成: 新增{result.upserted_count}, 更新{result.modified_count}")
+    return count
+
+
+async def get_topics(
+    db: AsyncIOMotorClient,
+    platform: str,
+    skip: int = 0,
+    limit: int = 100
+) -> List[dict]:
+    """按最近上榜时间获取平台话题"""
+    topics = []
+    collection = db[TopicModel.model_config["collection"]]
+
+    cursor = collection.find({"platform": platform}, TOPIC_LIST_PROJECTION).sort(
+        "last_seen", DESCENDING
+    ).skip(skip).limit(limit)
+    async for doc in cursor:
+        topics.append(doc)
+
+    return topics
+
+
+async def get_topic(
+    db: AsyncIOMotorClient,
+    topic_id: str
+) -> Optional[dict]:
+    """获取单个话题(含时间序列)"""
+    collection = db[TopicModel.model_config["collection"]]
+    return await collection.find_one({"_id": topic_id})
+
+
+async def get_topic_trajectory(
+    db: AsyncIOMotorClient,
+    topic_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Optional[dict]:
+    """获取话题在指定时间范围内的排名与热度走势"""
+    topic = await get_topic(db, topic_id)
+    if topic is None:
+        return None
+
+    topic["points"] = [
+        point for point in topic.get("points", [])
+        if (start_date is None or point["t"] >= start_date) and (end_date is None or point["t"] <= end_date)
+    ]
+    return topic
@@ -0,0 +1,143 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.models.trend import TrendModel
+from app.services.topic import get_topic_id
+
+
+def compute_trends(
+    platform: str,
+    previous_items: List[Dict[str, Any]],
+    current_items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    比较相邻两次抓取的榜单, 计算每个条目的排名变化、热度增长率及是否新上榜
+    上升势头得分:
+      - 已在榜条目: 排名上升位数 + 热度增长率 * RISING_HEAT_WEIGHT
+      - 新上榜条目: 视为从榜单之外升至当前排名, 即 榜单长度 - 排名 + 1
+    没有上一次榜单(首次抓取)时所有条目均作为基线, 得分为0
+    :return: 按上升势头降序排列的条目
+    """
+    previous = {item["topic_id"]: item for item in previous_items}
+    list_size = len(current_items)
+
+    trends = []
+    seen = set()
+    for item in sorted(current_items, key=lambda x: x["rank"]):
+        topic_id = get_topic_id(platform, item["title"])
+        if topic_id in seen:
+            continue
+        seen.add(topic_id)
+
+        hot_value = item.get("hot_value")
+        trend = {
+            "topic_id": topic_id,
+            "title": item["title"],
+            "url": item["url"],
+            "rank": item["rank"],
+            "hot_value": hot_value,
+            "prev_rank": None,
+            "rank_delta": 0,
+            "heat_growth": None,
+            "is_new": bool(previous) and topic_id not in previous,
+            "momentum": 0.0,
+        }
+
+        if trend["is_new"]:
+            trend["momentum"] = float(list_size - item["rank"] + 1)
+        elif topic_id in previous:
+            prev = previous[topic_id]
+            prev_hot_value = prev.get("hot_value")
+            trend["prev_rank"] = prev["rank"]
+            trend["rank_delta"] = prev["rank"] - item["rank"]
+            if hot_value is not None and prev_hot_value:
+                trend["heat_growth"] = round((hot_value - prev_hot_value) / prev_hot_value, 4)
+            trend["momentum"] = trend["rank_delta"] + (trend["heat_growth"] or 0.0) * settings.RISING_HEAT_WEIGHT
+
+        trends.append(trend)
+
+    trends.sort(key=lambda x: (-x["momentum"], x["rank"]))
+    return trends
+
+
+async def update_trends(
+    db: AsyncIOMotorClient,
+    platform: str,
+    items: List[Dict[str, Any]],
+    crawled_at: Optional[datetime] = None
+) -> dict:
+    """
+    抓取完成后增量更新平台趋势
+    只读取并替换该平台的趋势文档, 代价与历史数据量无关
+    """
+    collection = db[TrendModel.model_config["collection"]]
+    crawled_at = crawled_at or datetime.now()
+
+    previous = await collection.find_one({"_id": platform}) or {}
+    trends = compute_trends(platform, previous.get("items", []), items)
+
+    doc = {
+        "platform": platform,
+        "crawled_at": crawled_at,
+        "previous_crawled_at": previous.get("crawled_at"),
+        "items": trends,
+        "created_at": previous.get("created_at", crawled_at),
+        "updated_at": datetime.now()
+    }
+    await collection.replace_one({"_id": platform}, doc, upsert=True)
+
+    new_count = sum(1 for trend in trends if trend["is_new"])
+    logger.info(f"平台[{platform}]趋势已更新: {len(trends)}条, 新上榜{new_count}条")
+    return doc
+
+
+async def touch_trends(
+    db: AsyncIOMotorClient,
+    platform: str,
+    crawled_at: Optional[datetime] = None
+) -> Optional[dict]:
+    """
+    榜单与上一次抓取相同时只更新趋势文档的抓取时间, 条目及上升势头保持不变,
+    之后的抓取以本次抓取为上一次抓取计算间隔
+    :return: 更新后的趋势文档, 平台尚无趋势时返回None
+    """
+    collection = db[TrendModel.model_config["collection"]]
+    previous = await collection.find_one({"_id": platform}, {"crawled_at": 1})
+    if previous is None:
+        return None
+
+    return await collection.find_one_and_update(
+        {"_id": platform},
+        {"$set": {
+            "crawled_at": crawled_at or datetime.now(),
+            "previous_crawled_at": previous["crawled_at"],
+            "updated_at": datetime.now()
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def get_rising(
+    db: AsyncIOMotorClient,
+    platform: Optional[str] = None,
+    limit: int = 20
+) -> List[dict]:
+    """
+    获取上升最快的热搜
+    趋势在抓取时已计算并排序, 此处只需读取各平台的趋势文档并合并
+    """
+    rising = []
+    collection = db[TrendModel.model_config["collection"]]
+
+    query = {"_id": platform} if platform else {}
+    async for doc in collection.find(query):
+        for trend in doc.get("items", [])[:limit]:
+            rising.append({**trend, "platform": doc["platform"], "crawled_at": doc["crawled_at"]})
+
+    rising.sort(key=lambda x: (-x["momentum"], x["rank"]))
+    return rising[:limit]
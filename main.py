@@ -6,8 +6,11 @@ import sys
 
 from app.api.router import api_router
 from app.core.config import settings
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database
+from app.db.indexes import ensure_indexes
 from app.db.redis import redis_client
+from app.apis.session import http_session
+from app.services.registry import platform_registry
 
 
 # 配置日志
@@ -52,7 +55,10 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 async def startup_db_client():
     logger.info("应用启动...")
     await connect_to_mongo()
-    redis_client.connect()
+    if settings.MONGODB_ENSURE_INDEXES:
+        await ensure_indexes(get_database())
+    await redis_client.connect()
+    await platform_registry.start(get_database(), redis_client.get_client())
     logger.info("数据库连接已建立")
 
 
@@ -60,15 +66,17 @@ async def startup_db_client():
 @app.on_event("shutdown")
 async def shutdown_db_client():
     logger.info("应用关闭中...")
+    await platform_registry.stop()
     await close_mongo_connection()
-    redis_client.close()
+    await redis_client.close()
+    await http_session.close()
     logger.info("数据库连接已关闭")
 
 
 # 健康检查端点
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "redis": await redis_client.ping()}
 
 
 # 直接运行时的入口点
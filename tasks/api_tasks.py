@@ -2,129 +2,159 @@ import sys
 import os
 from pathlib import Path
 from loguru import logger
-from motor.motor_asyncio import AsyncIOMotorClient
-import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
 
 from tasks.celery_app import celery_app
 from app.core.config import settings
+from app.db.indexes import ensure_indexes
 from app.services.hotsearch import clean_expired_data
-from app.services.platform import update_last_crawl
-from tasks.fetch import sync_fetch_weibo_hot_search
+from app.services.rollup import rebuild_rollups
+from app.services.scheduler import claim_due_platforms
+from app.apis.registry import get_crawler
+from app.apis.resilience import backoff_delay
+from tasks.fetch import sync_fetch_platforms
+from tasks.runtime import worker_runtime
 
 def get_project_root():
     """获取项目根目录"""
     return Path(__file__).parent.parent
 
 
-@celery_app.task(name="tasks.api_tasks.fetch_weibo")
-def fetch_weibo():
-    """获取微博热搜"""
+def _fetch_platform(platform: str, display_name: str, idempotency_key: Optional[str] = None) -> dict:
+    """
+    通过抓取编排器获取单个平台
+    :param idempotency_key: 幂等键, 相同键的抓取成功后, 重新投递的任务不再重复抓取
+    """
     try:
-        logger.info("开始获取微博热搜")
-        
-        # 调用同步接口
-        sync_fetch_weibo_hot_search()
-        
-        # 更新平台最后获取时间
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(_update_platform_last_fetch("weibo"))
-        
-        logger.info("微博热搜获取完成")
-        return {"status": "success", "message": "微博热搜获取完成"}
+        logger.info(f"开始获取{display_name}")
+        result = sync_fetch_platforms([platform], idempotency_key)[platform]
+        logger.info(f"{display_name}获取结束: {result}")
+        return result
     except Exception as e:
-        logger.exception(f"微博热搜获取异常: {e}")
+        logger.exception(f"{display_name}获取异常: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@celery_app.task(name="tasks.api_tasks.fetch_baidu")
-def fetch_baidu():
-    """获取百度热搜"""
+@celery_app.task(name="tasks.api_tasks.fetch_platform", bind=True)
+def fetch_platform(self, platform: str, window: Optional[str] = None):
+    """
+    获取单个平台, 由调度任务按平台的抓取间隔分发
+    抓取失败(请求内的重试已耗尽)时按指数退避重新排队, 最多CRAWLER_TASK_MAX_RETRIES次, 以缩短数据缺口;
+    平台熔断时不重试, 由熔断冷却结束后的调度恢复抓取
+    :param window: 调度时领取的抓取窗口, 作为幂等键; 未提供时使用任务ID
+    """
+    result = _fetch_platform(platform, f"平台[{platform}]热搜", window or self.request.id)
+    if result["status"] == "error" and self.request.retries < settings.CRAWLER_TASK_MAX_RETRIES:
+        base = settings.CRAWLER_TASK_RETRY_DELAY
+        countdown = backoff_delay(self.request.retries + 1, base, base * 2 ** settings.CRAWLER_TASK_MAX_RETRIES)
+        logger.warning(f"平台[{platform}]抓取失败, {countdown:.0f}秒后重试")
+        raise self.retry(countdown=countdown)
+    return result
+
+
+@celery_app.task(name="tasks.api_tasks.schedule_fetches")
+def schedule_fetches():
+    """
+    领取到期的平台并分发抓取任务
+    各平台按自身的抓取间隔(平台配置的抓取频率, 经榜单变化程度自适应调整)到期, 由Celery Beat每SCHEDULER_TICK秒触发
+    """
     try:
-        logger.info("开始获取百度热搜")
-        # TODO: 实现百度热搜API
-        logger.warning("百度热搜API尚未实现")
-        return {"status": "skipped", "message": "百度热搜API尚未实现"}
+        platforms = worker_runtime.run(claim_due_platforms(worker_runtime.get_database()))
     except Exception as e:
-        logger.exception(f"百度热搜获取异常: {e}")
+        logger.exception(f"抓取调度异常: {e}")
         return {"status": "error", "message": str(e)}
 
+    dispatched = []
+    for platform in platforms:
+        if get_crawler(platform["name"]) is None:
+            continue
+        fetch_platform.delay(platform["name"], window=platform["next_crawl"].isoformat())
+        dispatched.append(platform["name"])
+
+    if dispatched:
+        logger.info(f"已分发抓取任务: {dispatched}")
+    return {"status": "success", "dispatched": dispatched}
+
+
+@celery_app.task(name="tasks.api_tasks.fetch_weibo", bind=True)
+def fetch_weibo(self):
+    """获取微博热搜"""
+    return _fetch_platform("weibo", "微博热搜", self.request.id)
+
 
-@celery_app.task(name="tasks.api_tasks.fetch_zhihu")
-def fetch_zhihu():
+@celery_app.task(name="tasks.api_tasks.fetch_baidu", bind=True)
+def fetch_baidu(self):
+    """获取百度热搜"""
+    return _fetch_platform("baidu", "百度热搜", self.request.id)
+
+
+@celery_app.task(name="tasks.api_tasks.fetch_zhihu", bind=True)
+def fetch_zhihu(self):
     """获取知乎热榜"""
-    try:
-        logger.info("开始获取知乎热榜")
-        # TODO: 实现知乎热榜API
-        logger.warning("知乎热榜API尚未实现")
-        return {"status": "skipped", "message": "知乎热榜API尚未实现"}
-    except Exception as e:
-        logger.exception(f"知乎热榜获取异常: {e}")
-        return {"status": "error", "message": str(e)}
+    return _fetch_platform("zhihu", "知乎热榜", self.request.id)
 
 
-@celery_app.task(name="tasks.api_tasks.fetch_douyin")
-def fetch_douyin():
+@celery_app.task(name="tasks.api_tasks.fetch_douyin", bind=True)
+def fetch_douyin(self):
     """获取抖音热点"""
-    try:
-        logger.info("开始获取抖音热点")
-        # TODO: 实现抖音热点API
-        logger.warning("抖音热点API尚未实现")
-        return {"status": "skipped", "message": "抖音热点API尚未实现"}
-    except Exception as e:
-        logger.exception(f"抖音热点获取异常: {e}")
-        return {"status": "error", "message": str(e)}
+    return _fetch_platform("douyin", "抖音热点", self.request.id)
 
 
-@celery_app.task(name="tasks.api_tasks.fetch_bilibili")
-def fetch_bilibili():
+@celery_app.task(name="tasks.api_tasks.fetch_bilibili", bind=True)
+def fetch_bilibili(self):
     """获取B站热门"""
-    try:
-        logger.info("开始获取B站热门")
-        # TODO: 实现B站热门API
-        logger.warning("B站热门API尚未实现")
-        return {"status": "skipped", "message": "B站热门API尚未实现"}
-    except Exception as e:
-        logger.exception(f"B站热门获取异常: {e}")
-        return {"status": "error", "message": str(e)}
+    return _fetch_platform("bilibili", "B站热门", self.request.id)
 
 
 @celery_app.task(name="tasks.api_tasks.clean_expired_data")
 def clean_expired_data_task(days=7):
-    """清理过期数据"""
+    """
+    清理过期数据
+    ttl模式下仅校验TTL索引(过期时间与保留天数同步), 由MongoDB后台持续删除过期数据;
+    purge模式下先将TTL索引替换为普通索引, 再分批限速删除
+    """
     try:
-        logger.info(f"开始清理{days}天前的过期数据")
-        loop = asyncio.get_event_loop()
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
-        result = loop.run_until_complete(clean_expired_data(client, days))
-        logger.info(f"过期数据清理完成，共清理{result}条数据")
-        return {"status": "success", "deleted_count": result}
+        db = worker_runtime.get_database()
+        worker_runtime.run(ensure_indexes(db))
+        if settings.CLEANUP_MODE == "ttl":
+            logger.info("过期数据由TTL索引自动清理")
+            return {"status": "success", "mode": "ttl"}
+
+        logger.info(f"开始分批清理{days}天前的过期数据")
+        stats = worker_runtime.run(clean_expired_data(db, days))
+        logger.info(f"过期数据清理完成，共清理{stats['deleted_count']}条数据")
+        return {"status": "success", "mode": "purge", **stats}
     except Exception as e:
         logger.exception(f"过期数据清理异常: {e}")
         return {"status": "error", "message": str(e)}
 
 
-async def _update_platform_last_fetch(platform_name):
-    """更新平台最后获取时间"""
+@celery_app.task(name="tasks.api_tasks.rebuild_rollups")
+def rebuild_rollups_task(hours=settings.ROLLUP_REBUILD_HOURS):
+    """根据原始数据重算最近的话题小时/日汇总, 修复增量更新的遗漏"""
     try:
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
-        await update_last_crawl(client, platform_name)
+        start = datetime.now() - timedelta(hours=hours)
+        count = worker_runtime.run(rebuild_rollups(worker_runtime.get_database(), start))
+        return {"status": "success", "count": count}
     except Exception as e:
-        logger.exception(f"更新平台[{platform_name}]最后获取时间异常: {e}")
-
-
-@celery_app.task(name="tasks.api_tasks.fetch_all")
-def fetch_all():
-    """获取所有平台"""
-    results = {}
-    
-    # 获取各平台热搜
-    results["weibo"] = fetch_weibo()
-    results["baidu"] = fetch_baidu()
-    results["zhihu"] = fetch_zhihu()
-    results["douyin"] = fetch_douyin()
-    results["bilibili"] = fetch_bilibili()
-    
+        logger.exception(f"汇总重算异常: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(name="tasks.api_tasks.fetch_all", bind=True)
+def fetch_all(self):
+    """并发获取所有平台"""
+    start = time.perf_counter()
+    try:
+        results = sync_fetch_platforms(idempotency_key=self.request.id)
+    except Exception as e:
+        logger.exception(f"全平台获取异常: {e}")
+        return {"status": "error", "message": str(e)}
+
     return {
-        "status": "completed", 
+        "status": "completed",
+        "elapsed": round(time.perf_counter() - start, 3),
         "results": results
-    } 
\ No newline at end of file
+    }
@@ -1,9 +1,12 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 from loguru import logger
 import os
 
 from app.core.config import settings
+from tasks.routing import get_task_queues, resolve_profile, route_task
+from tasks.runtime import worker_runtime
 
 
 # 创建Celery实例
@@ -22,39 +25,33 @@ celery_app.conf.update(
     timezone="Asia/Shanghai",
     enable_utc=True,
     worker_hijack_root_logger=False,
+    # 任务路由: 各平台抓取任务使用独立队列, 可按平台单独扩容Worker
+    task_default_queue=settings.CELERY_DEFAULT_QUEUE,
+    task_queues=get_task_queues(settings.CELERY_WORKER_PROFILE),
+    task_routes=(route_task,),
+    # 抓取任务以网络等待为主, 每个进程只预取一个任务, 避免慢任务积压其后已预取的任务
+    worker_prefetch_multiplier=1,
 )
 
+if settings.CELERY_WORKER_PROFILE:
+    _profile = resolve_profile(settings.CELERY_WORKER_PROFILE)
+    if _profile["concurrency"]:
+        celery_app.conf.worker_concurrency = _profile["concurrency"]
+    logger.info(f"Worker配置[{settings.CELERY_WORKER_PROFILE}]: 队列{_profile['queues']}")
+
 # 定时任务配置
 celery_app.conf.beat_schedule = {
-    # 微博热搜
-    "fetch_weibo_hourly": {
-        "task": "tasks.api_tasks.fetch_weibo",
-        "schedule": crontab(minute=0),  # 每小时整点
-        "args": ()
-    },
-    # 百度热搜
-    "fetch_baidu_hourly": {
-        "task": "tasks.api_tasks.fetch_baidu",
-        "schedule": crontab(minute=10),  # 每小时10分
-        "args": ()
-    },
-    # 知乎热榜
-    "fetch_zhihu_hourly": {
-        "task": "tasks.api_tasks.fetch_zhihu",
-        "schedule": crontab(minute=20),  # 每小时20分
-        "args": ()
-    },
-    # 抖音热点
-    "fetch_douyin_hourly": {
-        "task": "tasks.api_tasks.fetch_douyin",
-        "schedule": crontab(minute=30),  # 每小时30分
+    # 扫描到期的平台并分发抓取任务, 各平台的抓取间隔由平台配置及榜单变化程度决定
+    "schedule_fetches": {
+        "task": "tasks.api_tasks.schedule_fetches",
+        "schedule": settings.SCHEDULER_TICK,
         "args": ()
     },
-    # B站热门
-    "fetch_bilibili_hourly": {
-        "task": "tasks.api_tasks.fetch_bilibili",
-        "schedule": crontab(minute=40),  # 每小时40分
-        "args": ()
+    # 重算话题汇总
+    "rebuild_rollups_hourly": {
+        "task": "tasks.api_tasks.rebuild_rollups",
+        "schedule": crontab(minute=50),  # 每小时50分
+        "args": (settings.ROLLUP_REBUILD_HOURS,)
     },
     # 清理过期数据
     "clean_expired_data_daily": {
@@ -72,5 +69,17 @@ def setup_periodic_tasks(sender, **kwargs):
         logger.info(f"任务: {task_name}, 计划: {task_config['schedule']}")
 
 
+@worker_process_init.connect
+def init_worker_runtime(**kwargs):
+    """Worker进程启动时创建事件循环及数据库连接"""
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+def close_worker_runtime(**kwargs):
+    """Worker进程退出时释放数据库连接、HTTP会话及事件循环"""
+    worker_runtime.stop()
+
+
 if __name__ == "__main__":
     celery_app.start()
\ No newline at end of file
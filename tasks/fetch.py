@@ -1,47 +1,215 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, Dict, List, Optional
+import asyncio
+import time
+
+import aiohttp
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.core.config import settings
-from app.apis.weibo import WeiboAPI
+from app.apis.session import get_http_session
+from app.apis.base import BaseCrawler, NotModified
+from app.apis.resilience import CircuitOpenError
+from app.apis.registry import get_crawler
+from app.db.redis import redis_client
+from app.services.cache import invalidate_hotsearch_cache
+from app.services.cluster import update_clusters
+from app.services.crawl_lock import CrawlLock, FencingError, check_fence, is_done, mark_done
+from app.services.ingest import bulk_upsert_hotsearches
+from app.services.registry import platform_registry
+from app.services.rollup import update_rollups
+from app.services.scheduler import compute_volatility, record_crawl
+from app.services.snapshot import save_snapshot
+from app.services.topic import ingest_topics
+from app.services.trending import touch_trends, update_trends
+from tasks.runtime import worker_runtime
 from loguru import logger
-import asyncio
 
-async def fetch_weibo_hot_search():
-    """获取微博热搜"""
-    # 1. 初始化API客户端
-    api_client = WeiboAPI()
-    
-    # 连接数据库
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
-    db = client.news_trending
-    collection = db.hotsearch
-    
+
+async def store_hot_search_items(
+    db: AsyncIOMotorDatabase,
+    platform: str,
+    items: List[dict],
+    fence: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    按settings.STORAGE_MODE存储一次抓取的热搜
+    每个写入阶段(热搜、快照、话题、趋势、汇总)之前校验fencing令牌, 存储过程中租约过期并被接管时停止写入
+    :param fence: 抓取租约的fencing令牌
+    :return: 存储的热搜条数(count)、写入失败的条数(errors)及榜单相对上一次的变化程度(volatility)
+    :raises FencingError: 租约已过期且已被新的抓取接管
+    """
+    stored = 0
+    errors = 0
+    crawled_at = items[0].get("created_at")
+
+    if settings.STORAGE_MODE in ("items", "both"):
+        await check_fence(db, platform, fence)
+        # 无序批量upsert, 单条失败不影响其他条目, 任务重试时不会产生重复数据
+        result = await bulk_upsert_hotsearches(db, items, crawled_at)
+        errors = len(result["errors"])
+        stored = len(items) - errors
+        if not stored:
+            logger.error(f"平台[{platform}]数据存储失败")
+            return {"count": 0, "errors": errors, "volatility": None}
+
+    if settings.STORAGE_MODE in ("snapshot", "both"):
+        await check_fence(db, platform, fence)
+        snapshot = await save_snapshot(db, platform, items, crawled_at)
+        stored = stored or snapshot["item_count"]
+
+    if settings.TOPIC_TRACKING_ENABLED:
+        await check_fence(db, platform, fence)
+        await ingest_topics(db, platform, items, crawled_at)
+
+    # 与上一次榜单比较, 增量计算上升趋势
+    await check_fence(db, platform, fence)
+    trend = await update_trends(db, platform, items, crawled_at)
+
+    if settings.ROLLUP_ENABLED:
+        await check_fence(db, platform, fence)
+        await update_rollups(db, platform, trend)
+
+    logger.info(f"成功存储 {stored} 条平台[{platform}]热搜数据")
+    # 数据已更新, 使热搜列表缓存失效
+    await invalidate_hotsearch_cache(redis_client.get_client(), platform)
+    return {"count": stored, "errors": errors, "volatility": compute_volatility(trend["items"])}
+
+
+async def crawl_platform(
+    db: AsyncIOMotorDatabase,
+    crawler: BaseCrawler,
+    session: aiohttp.ClientSession,
+    fence: Optional[int] = None,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    执行单个平台的抓取流程: 抓取 -> 解析 -> 规范化 -> 存储
+    榜单与上一次成功抓取相同(HTTP 304或内容摘要一致)时跳过存储、话题、趋势等后续处理, 只记录抓取时间并累加汇总
+    :param fence: 抓取租约的fencing令牌, 每个写入阶段前校验, 租约已被接管时放弃写入
+    :param idempotency_key: 幂等键, 存储完成后立即标记, 之后的步骤失败触发任务重试时不会重复累加话题及汇总
+    :return: 抓取状态(success或unchanged)、存储的热搜条数及榜单变化程度
+    :raises FencingError: 租约已过期且已被新的抓取接管
+    """
+    redis = redis_client.get_client()
+    await crawler.load_state(redis)
     try:
-        # 2. 获取数据
-        items = await api_client.fetch_hot_search()
-        if not items:
-            logger.warning("未获取到微博热搜数据")
-            return
-        
-        logger.info(f"获取到 {len(items)} 条微博热搜数据")
-            
-        # 3. 存储数据
-        # 使用批量插入提高效率
-        if len(items) > 0:
-            result = await collection.insert_many(items)
-            if result and result.inserted_ids:
-                logger.info(f"成功存储 {len(result.inserted_ids)} 条微博热搜数据")
-            else:
-                logger.error("数据存储失败")
-        else:
-            logger.warning("没有数据需要存储")
-            
-    except Exception as e:
-        logger.exception(f"获取微博热搜失败: {str(e)}")
-        
-    finally:
-        await client.close()
-        
+        items = await crawler.fetch_items(session)
+    except NotModified as e:
+        logger.info(f"平台[{crawler.platform}]热搜未变化({e}), 跳过存储")
+        # 仍记录本次抓取时间, 稳定的榜单继续累加在榜时长, 之后的抓取也以本次抓取计算间隔
+        await check_fence(db, crawler.platform, fence)
+        trend = await touch_trends(db, crawler.platform)
+        if trend is not None and settings.ROLLUP_ENABLED:
+            await check_fence(db, crawler.platform, fence)
+            await update_rollups(db, crawler.platform, trend, unchanged=True)
+        await mark_done(redis, crawler.platform, idempotency_key)
+        return {"status": "unchanged", "count": 0, "volatility": 0.0}
+
+    if not items:
+        logger.warning(f"未获取到平台[{crawler.platform}]热搜数据")
+        return {"status": "success", "count": 0, "volatility": None}
+
+    logger.info(f"获取到 {len(items)} 条平台[{crawler.platform}]热搜数据")
+    stored = await store_hot_search_items(db, crawler.platform, items, fence)
+    if stored["count"]:
+        await mark_done(redis, crawler.platform, idempotency_key)
+        # 有条目写入失败时不提交内容摘要, 下一次抓取不会因摘要一致而跳过存储
+        if not stored["errors"]:
+            await crawler.commit_state()
+    return {"status": "success", **stored}
+
+
+async def fetch_platforms(
+    db: AsyncIOMotorDatabase,
+    platforms: Optional[List[str]] = None,
+    concurrency: Optional[int] = None,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, dict]:
+    """
+    在同一事件循环中并发抓取多个平台
+    所有平台共享进程级的aiohttp会话(长连接在多次抓取间复用)和同一个数据库连接, 并发数受信号量限制;
+    每个平台在抓取租约内执行, 同一平台已有抓取进行中时跳过(locked),
+    同一幂等键(抓取窗口或任务ID)已成功完成时不再重复抓取(duplicate)
+    :param db: 数据库
+    :param platforms: 平台列表, 默认为平台注册表中所有激活的平台
+    :param concurrency: 最大并发数, 默认为settings.FETCH_CONCURRENCY
+    :param idempotency_key: 幂等键, 重新投递的任务使用相同的键
+    :return: 各平台的抓取结果及耗时
+    """
+    await platform_registry.ensure_loaded(db)
+    platforms = platforms or platform_registry.get_active_names()
+    semaphore = asyncio.Semaphore(concurrency or settings.FETCH_CONCURRENCY)
+
+    async def run(platform: str, session: aiohttp.ClientSession) -> dict:
+        if not platform_registry.is_valid(platform):
+            logger.warning(f"平台[{platform}]未注册")
+            return {"status": "skipped", "message": f"平台[{platform}]未注册", "elapsed": 0.0}
+        platform_doc = platform_registry.get(platform)
+        if platform_doc is not None and not platform_doc.get("is_active"):
+            logger.info(f"平台[{platform}]已停用, 跳过抓取")
+            return {"status": "skipped", "message": f"平台[{platform}]已停用", "elapsed": 0.0}
+
+        crawler = get_crawler(platform)
+        if crawler is None:
+            logger.warning(f"平台[{platform}]API尚未实现")
+            return {"status": "skipped", "message": f"平台[{platform}]API尚未实现", "elapsed": 0.0}
+
+        async with semaphore:
+            redis = redis_client.get_client()
+            lock = CrawlLock(redis, platform)
+            if not await lock.acquire():
+                logger.info(f"平台[{platform}]正在由其他任务抓取, 跳过")
+                return {"status": "locked", "message": f"平台[{platform}]正在抓取中", "elapsed": 0.0}
+
+            start = time.perf_counter()
+            try:
+                if await is_done(redis, platform, idempotency_key):
+                    logger.info(f"平台[{platform}]抓取窗口[{idempotency_key}]已完成, 跳过")
+                    result = {"status": "duplicate", "message": f"抓取窗口[{idempotency_key}]已完成"}
+                else:
+                    result = await crawl_platform(db, crawler, session, lock.token, idempotency_key)
+                    # 根据榜单变化程度调整该平台的下次抓取时间
+                    await check_fence(db, platform, lock.token)
+                    platform_doc = await record_crawl(db, platform, result["volatility"])
+                    if platform_doc is not None:
+                        platform_registry.put(platform_doc)
+                        result["next_crawl"] = platform_doc["next_crawl"].isoformat()
+            except (CircuitOpenError, FencingError) as e:
+                logger.warning(str(e))
+                status = "circuit_open" if isinstance(e, CircuitOpenError) else "fenced"
+                result = {"status": status, "message": str(e)}
+            except Exception as e:
+                logger.exception(f"平台[{platform}]抓取异常: {e}")
+                result = {"status": "error", "message": str(e)}
+            finally:
+                await lock.release()
+            result["elapsed"] = round(time.perf_counter() - start, 3)
+            logger.info(f"平台[{platform}]抓取结束, 状态: {result['status']}, 耗时: {result['elapsed']}s")
+            return result
+
+    session = get_http_session()
+    results = await asyncio.gather(*(run(platform, session) for platform in platforms))
+
+    # 各平台最新榜单就绪后重新计算跨平台聚类, 失败不影响抓取结果
+    if settings.CLUSTER_ENABLED and any(result.get("count") for result in results):
+        try:
+            await update_clusters(db)
+        except Exception as e:
+            logger.exception(f"跨平台聚类计算异常: {e}")
+
+    return dict(zip(platforms, results))
+
+
 # 提供同步接口用于Celery任务
-def sync_fetch_weibo_hot_search():
+def sync_fetch_platforms(
+    platforms: Optional[List[str]] = None,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, dict]:
+    """同步接口：并发抓取多个平台"""
+    return worker_runtime.run(
+        fetch_platforms(worker_runtime.get_database(), platforms, idempotency_key=idempotency_key)
+    )
+
+
+def sync_fetch_weibo_hot_search() -> dict:
     """同步接口：获取微博热搜"""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(fetch_weibo_hot_search()) 
\ No newline at end of file
+    return sync_fetch_platforms(["weibo"])["weibo"]
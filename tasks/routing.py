@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Optional
+
+from kombu import Queue
+
+from app.core.config import settings
+
+
+# 通配符: Worker配置中表示所有平台的抓取队列
+ALL_FETCH_QUEUES = f"{settings.CELERY_FETCH_QUEUE_PREFIX}.*"
+
+# 按平台抓取的任务: 任务名 -> 平台(通用任务fetch_platform的平台取自参数)
+FETCH_TASK = "tasks.api_tasks.fetch_platform"
+PLATFORM_TASKS = {f"tasks.api_tasks.fetch_{platform}": platform for platform in settings.PLATFORMS}
+
+# 低优先级的维护任务, 不与抓取争用Worker
+MAINTENANCE_TASKS = {
+    "tasks.api_tasks.clean_expired_data",
+    "tasks.api_tasks.rebuild_rollups",
+}
+
+
+def fetch_queue(platform: str) -> str:
+    """平台的抓取队列"""
+    return f"{settings.CELERY_FETCH_QUEUE_PREFIX}.{platform}"
+
+
+def get_all_queues() -> List[str]:
+    """所有队列: 默认队列、各平台抓取队列及维护队列"""
+    return [
+        settings.CELERY_DEFAULT_QUEUE,
+        *(fetch_queue(platform) for platform in settings.PLATFORMS),
+        settings.CELERY_MAINTENANCE_QUEUE,
+    ]
+
+
+def route_task(name: str, args: tuple, kwargs: dict, options: dict, task=None, **kw) -> Optional[Dict[str, Any]]:
+    """
+    Celery任务路由
+    - 平台抓取任务进入各平台独立的抓取队列, 慢平台只占用自己的Worker
+    - 过期数据清理、汇总重算进入维护队列
+    - 其余任务(调度、全平台抓取)进入默认队列
+    """
+    if name == FETCH_TASK:
+        platform = args[0] if args else kwargs.get("platform")
+        return {"queue": fetch_queue(platform)}
+    if name in PLATFORM_TASKS:
+        return {"queue": fetch_queue(PLATFORM_TASKS[name])}
+    if name in MAINTENANCE_TASKS:
+        return {"queue": settings.CELERY_MAINTENANCE_QUEUE}
+    return None
+
+
+def resolve_profile(profile: str) -> Dict[str, Any]:
+    """
+    解析Worker配置
+    :param profile: settings.CELERY_WORKER_PROFILES中的配置名, 或以逗号分隔的队列名(如"fetch.weibo,fetch.douyin")
+    :return: 消费的队列(queues)及并发数(concurrency, 未配置时为None)
+    """
+    config = settings.CELERY_WORKER_PROFILES.get(profile)
+    if config is None:
+        config = {"queues": [queue.strip() for queue in profile.split(",") if queue.strip()]}
+
+    queues = []
+    for queue in config.get("queues", []):
+        if queue == ALL_FETCH_QUEUES:
+            queues.extend(fetch_queue(platform) for platform in settings.PLATFORMS)
+        else:
+            queues.append(queue)
+
+    if not queues:
+        raise ValueError(f"Worker配置[{profile}]未包含任何队列")
+    return {"queues": list(dict.fromkeys(queues)), "concurrency": config.get("concurrency")}
+
+
+def get_task_queues(profile: Optional[str] = None) -> List[Queue]:
+    """
+    当前进程声明及消费的队列
+    未指定Worker配置时(如Beat、API进程)声明所有队列
+    """
+    names = resolve_profile(profile)["queues"] if profile else get_all_queues()
+    return [Queue(name, routing_key=name) for name in names]
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from loguru import logger
+
+from app.core.config import settings
+from app.apis.session import http_session
+from app.db.redis import redis_client
+from app.services.registry import platform_registry
+
+
+class WorkerRuntime:
+    """
+    Celery Worker进程级运行时
+    每个Worker进程持有一个事件循环和一个Motor客户端, 由所有任务复用,
+    在worker_process_init时创建, 在worker_process_shutdown时释放
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.mongo_client: Optional[AsyncIOMotorClient] = None
+
+    def start(self):
+        """创建事件循环及数据库连接"""
+        if self.loop is not None and not self.loop.is_closed():
+            return
+
+        logger.info("正在初始化Worker运行时...")
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.mongo_client = AsyncIOMotorClient(settings.MONGODB_URL, io_loop=self.loop)
+        # 平台变更订阅在Worker事件循环中运行, 循环空闲(无任务执行)时积压的通知在下一个任务开始时处理
+        try:
+            self.loop.run_until_complete(
+                platform_registry.start(self.mongo_client.get_database(), redis_client.get_client())
+            )
+        except Exception as e:
+            logger.warning(f"平台注册表加载失败, 将在首次抓取时重试: {e}")
+        logger.info("Worker运行时已就绪")
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """在Worker事件循环中执行协程"""
+        if self.loop is None or self.loop.is_closed():
+            # 未通过信号初始化(如solo池或直接调用任务)时按需创建
+            self.start()
+        return self.loop.run_until_complete(coro)
+
+    def get_database(self) -> AsyncIOMotorDatabase:
+        """获取数据库"""
+        if self.mongo_client is None:
+            self.start()
+        return self.mongo_client.get_database()
+
+    def stop(self):
+        """关闭所有连接及事件循环"""
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        logger.info("正在关闭Worker运行时...")
+        try:
+            self.loop.run_until_complete(platform_registry.stop())
+            self.loop.run_until_complete(http_session.close())
+            self.loop.run_until_complete(redis_client.close())
+        except Exception as e:
+            logger.warning(f"关闭Worker连接异常: {e}")
+        finally:
+            if self.mongo_client is not None:
+                self.mongo_client.close()
+            self.loop.close()
+            self.mongo_client = None
+            self.loop = None
+            logger.info("Worker运行时已关闭")
+
+
+worker_runtime = WorkerRuntime()
@@ -0,0 +1,23 @@
+from app.services.cluster import build_clusters
+
+
+def _item(platform, title, rank):
+    return {"platform": platform, "topic_id": f"{platform}-{rank}", "title": title, "url": "", "rank": rank}
+
+
+def test_build_clusters():
+    """测试跨平台聚类"""
+    items = [
+        _item("weibo", "神舟十八号载人飞船发射成功", 1),
+        _item("baidu", "神舟十八号发射圆满成功", 3),
+        _item("zhihu", "如何看待神舟十八号载人飞船发射成功？", 2),
+        _item("weibo", "神舟十八号航天员出舱", 4),
+        _item("douyin", "某地发布暴雨预警", 5),
+    ]
+    clusters = build_clusters(items, 0.3)
+
+    assert len(clusters) == 1
+    assert clusters[0]["platforms"] == ["baidu", "weibo", "zhihu"]
+    assert [item["rank"] for item in clusters[0]["items"]] == [1, 2, 3]
+    # 同一平台的相似标题不单独成簇
+    assert build_clusters(items[3:4] + items[:1], 0.1) == []
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from app.apis.base import FIXTURE_DIR
+from app.services.crawl_lock import CrawlLock, FencingError, check_fence, is_done, mark_done
+from tasks.fetch import fetch_platforms, store_hot_search_items
+
+fakeredis = pytest.importorskip("fakeredis")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+pytest.importorskip("lupa")
+
+
+def test_crawl_lock_exclusive():
+    """测试同一平台的租约互斥, 释放时只删除自己持有的租约"""
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        first, second = CrawlLock(redis, "weibo", ttl=60), CrawlLock(redis, "weibo", ttl=60)
+        assert await first.acquire()
+        assert not await second.acquire()
+        assert await CrawlLock(redis, "zhihu", ttl=60).acquire()
+
+        # 租约过期后被接管, 旧持有者的释放不影响新租约
+        await redis.delete(first.key)
+        assert await second.acquire()
+        assert second.token > first.token
+        await first.release()
+        assert int(await redis.get(second.key)) == second.token
+        await second.release()
+        assert not await redis.exists(second.key)
+
+    asyncio.run(run())
+
+
+def test_stale_fence_rejected(monkeypatch):
+    """测试过期租约的令牌在新令牌写入后被拒绝, 存储阶段不再写入"""
+    monkeypatch.setattr("app.core.config.settings.STORAGE_MODE", "snapshot")
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        await db.platforms.insert_one({"name": "weibo"})
+        await check_fence(db, "weibo", 1)
+        await check_fence(db, "weibo", 2)
+        await check_fence(db, "weibo", 2)
+        with pytest.raises(FencingError):
+            await check_fence(db, "weibo", 1)
+        with pytest.raises(FencingError):
+            await store_hot_search_items(db, "weibo", [{"title": "A", "rank": 1}], fence=1)
+        assert await db.hot_search_snapshots.count_documents({}) == 0
+
+    asyncio.run(run())
+
+
+def test_redelivered_window_is_duplicate(monkeypatch):
+    """测试已完成的抓取窗口被重新投递时直接跳过"""
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr("app.db.redis.redis_client.get_client", lambda: redis)
+    monkeypatch.setattr("app.core.config.settings.CRAWLER_FIXTURE_DIR", str(FIXTURE_DIR))
+    monkeypatch.setattr("app.core.config.settings.STORAGE_MODE", "snapshot")
+    monkeypatch.setattr("app.core.config.settings.TOPIC_TRACKING_ENABLED", False)
+    monkeypatch.setattr("app.core.config.settings.ROLLUP_ENABLED", False)
+    monkeypatch.setattr("app.core.config.settings.CLUSTER_ENABLED", False)
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        assert not await is_done(redis, "weibo", "window-1")
+        first = await fetch_platforms(db, ["weibo"], idempotency_key="window-1")
+        assert first["weibo"]["status"] == "success"
+        assert await is_done(redis, "weibo", "window-1")
+
+        again = await fetch_platforms(db, ["weibo"], idempotency_key="window-1")
+        assert again["weibo"]["status"] == "duplicate"
+        assert await db.hot_search_snapshots.count_documents({"platform": "weibo"}) == 1
+
+        await mark_done(redis, "weibo", "window-2")
+        assert (await fetch_platforms(db, ["weibo"], idempotency_key="window-2"))["weibo"]["status"] == "duplicate"
+
+    asyncio.run(run())
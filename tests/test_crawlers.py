@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.apis.base import (
+    FIXTURE_DIR, BaseCrawler, CrawlerError, NotModified, TransientError, compute_content_hash, parse_hot_value,
+    register_crawler
+)
+from app.apis.resilience import CircuitBreaker, backoff_delay, call_with_retries
+from app.apis.registry import get_crawler, get_crawlers
+
+
+def test_parse_hot_value():
+    """测试热度文本解析"""
+    assert parse_hot_value(1234) == 1234
+    assert parse_hot_value("1,234") == 1234
+    assert parse_hot_value("1234 万热度") == 12340000
+    assert parse_hot_value("1.5亿") == 150000000
+    assert parse_hot_value("") is None
+    # 不含数字或格式异常的文本不应中断整个平台的抓取
+    assert parse_hot_value("热度...") is None
+    assert parse_hot_value("v1.2.3") == 1
+
+
+def test_crawlers_parse_fixtures():
+    """测试各平台抓取器解析本地样本"""
+    crawled_at = datetime(2023, 1, 1, 12, 0)
+    crawlers = get_crawlers()
+    assert set(crawlers) == {"weibo", "baidu", "zhihu", "douyin", "bilibili"}
+
+    for platform, crawler in crawlers.items():
+        items = crawler.normalize(crawler.parse(crawler.load_fixture(FIXTURE_DIR)), crawled_at)
+        assert items, platform
+        assert [item["rank"] for item in items] == list(range(1, len(items) + 1))
+        for item in items:
+            assert item["platform"] == platform
+            assert item["title"] and item["url"].startswith("https://")
+            assert isinstance(item["hot_value"], int)
+            assert item["created_at"] == crawled_at
+
+
+def test_register_incomplete_crawler():
+    """测试未实现parse的抓取器在注册时即失败"""
+    with pytest.raises(TypeError):
+        @register_crawler
+        class IncompleteCrawler(BaseCrawler):
+            platform = "incomplete"
+
+
+def test_crawler_skips_promoted_entries():
+    """测试广告及置顶条目不参与排名"""
+    weibo = get_crawler("weibo")
+    titles = [item["title"] for item in weibo.parse(weibo.load_fixture(FIXTURE_DIR))]
+    assert "品牌推广" not in titles
+    assert get_crawler("unknown") is None
+
+
+def test_content_hash_short_circuit(monkeypatch):
+    """测试内容摘要与时间戳无关, 且内容未变化时跳过后续处理"""
+    monkeypatch.setattr("app.core.config.settings.CRAWLER_FIXTURE_DIR", str(FIXTURE_DIR))
+    crawler = get_crawler("baidu")
+    items = asyncio.run(crawler.fetch_items(crawled_at=datetime(2023, 1, 1, 12, 0)))
+    later = crawler.normalize(crawler.parse(crawler.load_fixture()), datetime(2023, 1, 1, 12, 5))
+    assert compute_content_hash(items) == compute_content_hash(later)
+    later[0]["hot_value"] += 1
+    assert compute_content_hash(items) != compute_content_hash(later)
+
+    asyncio.run(crawler.commit_state())
+    assert crawler.state["content_hash"] == compute_content_hash(items)
+    with pytest.raises(NotModified):
+        asyncio.run(crawler.fetch_items())
+
+
+def test_call_with_retries():
+    """测试可重试异常按退避重试, 次数耗尽后抛出最后一次异常"""
+    assert all(0 <= backoff_delay(attempt, 1.0, 5.0) <= min(5.0, 2 ** attempt) for attempt in range(6))
+
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TransientError("HTTP 503")
+        return "ok"
+
+    assert asyncio.run(call_with_retries(flaky, (TransientError,), attempts=3, base_delay=0)) == "ok"
+    calls.clear()
+    with pytest.raises(TransientError):
+        asyncio.run(call_with_retries(flaky, (TransientError,), attempts=2, base_delay=0))
+    assert len(calls) == 2
+
+
+def test_non_json_response_counts_as_failure(monkeypatch):
+    """测试HTTP 200但响应不是JSON(如验证码页面)时计入熔断失败, 半开状态的试探不会一直占用"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    monkeypatch.setattr("app.core.config.settings.CRAWLER_FIXTURE_DIR", None)
+
+    async def captcha(request):
+        return web.Response(text="<html>请输入验证码</html>", content_type="text/html", headers={"ETag": "captcha"})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", captcha)
+        redis = fakeredis.FakeAsyncRedis()
+        crawler = get_crawler("baidu")
+        async with TestServer(app) as server, aiohttp.ClientSession() as session:
+            monkeypatch.setattr(crawler, "api_url", str(server.make_url("/")))
+            await crawler.load_state(redis)
+            with pytest.raises(CrawlerError) as exc_info:
+                await crawler.fetch(session)
+            assert not isinstance(exc_info.value, TransientError)
+            # 验证码页面的ETag不应在之后的抓取中提交
+            assert "etag" not in crawler._pending
+
+            # 冷却结束后的试探请求失败, 重新打开熔断并释放试探
+            breaker = CircuitBreaker(redis, "baidu")
+            await redis.hset(breaker.key, mapping={"failures": breaker.threshold, "open_until": 0})
+            with pytest.raises(CrawlerError):
+                await crawler.request(session)
+            assert not await redis.exists(breaker.probe_key)
+            assert float(await redis.hget(breaker.key, "open_until")) > 0
+
+    asyncio.run(run())
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.apis.base import FIXTURE_DIR
+from app.apis.registry import get_crawler
+from tasks.fetch import crawl_platform
+
+fakeredis = pytest.importorskip("fakeredis")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr("app.db.redis.redis_client.get_client", lambda: redis)
+    monkeypatch.setattr("app.core.config.settings.CRAWLER_FIXTURE_DIR", str(FIXTURE_DIR))
+    monkeypatch.setattr("app.core.config.settings.TOPIC_TRACKING_ENABLED", False)
+    monkeypatch.setattr("app.core.config.settings.CLUSTER_ENABLED", False)
+    return redis
+
+
+def test_failed_store_is_not_skipped_as_unchanged(redis, monkeypatch):
+    """测试存储失败时不提交内容摘要, 下一次抓取相同榜单时仍会写入"""
+    monkeypatch.setattr("app.core.config.settings.STORAGE_MODE", "items")
+    monkeypatch.setattr("app.core.config.settings.ROLLUP_ENABLED", False)
+    calls = []
+
+    async def bulk_upsert(db, items, crawled_at=None):
+        calls.append(len(items))
+        if len(calls) == 1:
+            return {"errors": [{"index": i, "message": "写入失败"} for i in range(len(items))]}
+        return {"errors": []}
+
+    monkeypatch.setattr("tasks.fetch.bulk_upsert_hotsearches", bulk_upsert)
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        failed = await crawl_platform(db, get_crawler("weibo"), None)
+        assert failed["count"] == 0
+        retried = await crawl_platform(db, get_crawler("weibo"), None)
+        assert retried["status"] == "success" and retried["count"] == calls[1]
+        # 成功存储后提交摘要, 之后相同的榜单才视为未变化
+        assert (await crawl_platform(db, get_crawler("weibo"), None))["status"] == "unchanged"
+
+    asyncio.run(run())
+
+
+def test_unchanged_crawls_accumulate_rollups(redis, monkeypatch):
+    """测试榜单未变化的抓取仍累加出现次数及在榜时长, 自适应放慢抓取后的间隔不会被截断"""
+    monkeypatch.setattr("app.core.config.settings.STORAGE_MODE", "snapshot")
+    monkeypatch.setattr("app.core.config.settings.ROLLUP_ENABLED", True)
+    writes = []
+
+    async def write_rollups(db, aggregates, repair=False):
+        writes.append(aggregates)
+        return len(aggregates)
+
+    monkeypatch.setattr("app.services.rollup._write_rollups", write_rollups)
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        assert (await crawl_platform(db, get_crawler("weibo"), None))["status"] == "success"
+        for _ in range(3):
+            # 模拟三小时后的下一次抓取(超过ROLLUP_MAX_INTERVAL, 不超过平台最长抓取间隔)
+            trend = await db.hot_search_trends.find_one({"_id": "weibo"})
+            await db.hot_search_trends.update_one(
+                {"_id": "weibo"}, {"$set": {"crawled_at": trend["crawled_at"] - timedelta(hours=3)}}
+            )
+            assert (await crawl_platform(db, get_crawler("weibo"), None))["status"] == "unchanged"
+        return await db.hot_search_snapshots.count_documents({})
+
+    assert asyncio.run(run()) == 1
+    assert len(writes) == 4
+    totals = {}
+    for aggregates in writes[1:]:
+        for (granularity, _), rollup in aggregates.items():
+            if granularity == "day":
+                total = totals.setdefault(rollup["topic_id"], {"appearances": 0, "time_on_list": 0})
+                total["appearances"] += rollup["appearances"]
+                total["time_on_list"] += rollup["time_on_list"]
+    assert totals and all(
+        total["appearances"] == 3 and total["time_on_list"] >= 3 * 3 * 3600 for total in totals.values()
+    )
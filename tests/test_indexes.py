@@ -0,0 +1,26 @@
+from app.db.indexes import _only_unique_added, expiry_index, get_index_registry
+
+
+def test_expiry_index_follows_cleanup_mode(monkeypatch):
+    """测试purge模式下过期时间索引为普通索引, 不会被TTL监视器删除数据"""
+    monkeypatch.setattr("app.core.config.settings.CLEANUP_MODE", "ttl")
+    ttl = expiry_index("created_at", 7).document
+    assert ttl["name"] == "created_at_ttl"
+    assert ttl["expireAfterSeconds"] == 7 * 24 * 3600
+
+    monkeypatch.setattr("app.core.config.settings.CLEANUP_MODE", "purge")
+    plain = expiry_index("created_at", 7).document
+    assert plain["name"] == "created_at"
+    assert "expireAfterSeconds" not in plain
+
+
+def test_upsert_key_index_is_unique():
+    """测试批量写入的upsert键为唯一索引, 已有的普通索引可原地迁移"""
+    spec = next(
+        index.document for index in get_index_registry()["hot_searches"]
+        if index.document["name"] == "platform_title_created_at"
+    )
+    assert spec["unique"] is True
+    existing = {"key": [("platform", 1), ("title", 1), ("created_at", -1)], "v": 2}
+    assert _only_unique_added(spec, existing)
+    assert not _only_unique_added(spec, {**existing, "unique": True})
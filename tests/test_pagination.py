@@ -0,0 +1,31 @@
+import base64
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.services.hotsearch import LIST_SORT
+from app.services.pagination import build_keyset_filter, decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    """测试游标编码后可还原为键集分页条件"""
+    doc = {"created_at": datetime(2023, 1, 1), "_id": ObjectId()}
+    keyset = build_keyset_filter(encode_cursor(doc, LIST_SORT), LIST_SORT)
+    assert keyset["$or"][1] == {"created_at": doc["created_at"], "_id": {"$lt": doc["_id"]}}
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    _raw_cursor("[1, 2]"),
+    _raw_cursor('{"created_at": 1}'),
+    _raw_cursor('{"created_at": 1, "_id": {"$oid": "zz"}}'),
+])
+def test_invalid_cursor(cursor):
+    """测试无效或伪造的游标统一抛出ValueError(接口返回400)"""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, LIST_SORT)
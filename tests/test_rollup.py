@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from app.services.rollup import accumulate_crawl, get_retained_start
+
+
+def test_accumulate_crawl():
+    """测试在榜时长按相邻两次抓取均在榜的间隔累计"""
+    start = datetime(2023, 1, 1, 10, 40)
+    aggregates = {}
+    previous_topic_ids, previous_crawled_at = set(), None
+    for i, titles in enumerate([["A", "B"], ["B", "A"], ["B"]]):
+        crawled_at = start + timedelta(minutes=20 * i)
+        items = [{"title": title, "url": "", "rank": rank + 1} for rank, title in enumerate(titles)]
+        previous_topic_ids = accumulate_crawl(
+            aggregates, "weibo", items, crawled_at, previous_topic_ids, previous_crawled_at
+        )
+        previous_crawled_at = crawled_at
+
+    daily = {rollup["title"]: rollup for (granularity, _), rollup in aggregates.items() if granularity == "day"}
+    assert daily["A"]["time_on_list"] == 1200
+    assert daily["B"]["time_on_list"] == 2400
+    assert daily["B"]["best_rank"] == 1
+    assert daily["B"]["appearances"] == 3
+    # 跨小时的抓取分别计入两个小时汇总
+    hourly = [rollup for (granularity, _), rollup in aggregates.items() if granularity == "hour"]
+    assert len(hourly) == 4
+
+
+def test_retained_start(monkeypatch):
+    """测试重算起点不早于原始数据保留期, 并留出一个小时桶的余量"""
+    monkeypatch.setattr("app.core.config.settings.HISTORY_DAYS", 7)
+    assert get_retained_start(datetime(2023, 1, 8, 12, 30)) == datetime(2023, 1, 1, 13)
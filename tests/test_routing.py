@@ -0,0 +1,18 @@
+from tasks.routing import resolve_profile, route_task
+
+
+def test_route_task():
+    """测试抓取任务按平台分队列, 维护任务进入维护队列"""
+    assert route_task("tasks.api_tasks.fetch_platform", ("weibo",), {}, {}) == {"queue": "fetch.weibo"}
+    assert route_task("tasks.api_tasks.fetch_platform", (), {"platform": "zhihu"}, {}) == {"queue": "fetch.zhihu"}
+    assert route_task("tasks.api_tasks.fetch_baidu", (), {}, {}) == {"queue": "fetch.baidu"}
+    assert route_task("tasks.api_tasks.clean_expired_data", (7,), {}, {}) == {"queue": "maintenance"}
+    assert route_task("tasks.api_tasks.schedule_fetches", (), {}, {}) is None
+
+
+def test_resolve_profile():
+    """测试Worker配置解析"""
+    fetch = resolve_profile("fetch")
+    assert fetch["queues"] == ["fetch.weibo", "fetch.baidu", "fetch.zhihu", "fetch.douyin", "fetch.bilibili"]
+    assert resolve_profile("maintenance") == {"queues": ["maintenance"], "concurrency": 1}
+    assert resolve_profile("fetch.weibo, fetch.douyin")["queues"] == ["fetch.weibo", "fetch.douyin"]
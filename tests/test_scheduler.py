@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.platform import PlatformUpdate
+from app.services.platform import update_platform
+from app.services.scheduler import compute_volatility, next_interval
+from app.services.trending import compute_trends
+
+
+def _item(title, rank):
+    return {"title": title, "url": "https://example.com", "rank": rank, "hot_value": 100}
+
+
+def test_compute_volatility():
+    """测试榜单变化程度"""
+    first = compute_trends("weibo", [], [_item("A", 1), _item("B", 2)])
+    # 首次抓取没有可比较的榜单
+    assert compute_volatility(first) is None
+
+    same = compute_trends("weibo", first, [_item("A", 1), _item("B", 2)])
+    assert compute_volatility(same) == 0.0
+
+    replaced = compute_trends("weibo", first, [_item("C", 1), _item("D", 2)])
+    assert compute_volatility(replaced) == 1.0
+
+
+def test_next_interval():
+    """测试根据变化程度自适应调整抓取间隔"""
+    platform = {"crawl_frequency": 60}
+    fast = next_interval(platform, 0.8)
+    assert fast["crawl_interval"] == 60 * settings.SCHEDULER_SPEEDUP
+
+    slow = next_interval({**platform, "crawl_interval": 200.0, "volatility": 0.0}, 0.0)
+    assert slow["crawl_interval"] == 60 * settings.SCHEDULER_MAX_FACTOR
+
+    # 首次抓取保持当前间隔
+    assert next_interval({**platform, "crawl_interval": 30.0}, None)["crawl_interval"] == 30.0
+
+
+def test_update_frequency_pulls_next_crawl_forward():
+    """测试缩短抓取频率后下次抓取时间提前到新频率之内, 延长频率时不推迟已排定的抓取"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        far = datetime.now() + timedelta(hours=4)
+        # BSON时间精度为毫秒
+        soon = (datetime.now() + timedelta(minutes=5)).replace(microsecond=0)
+        result = await db.platforms.insert_many([
+            {"name": "weibo", "crawl_frequency": 240, "crawl_interval": 240.0, "next_crawl": far},
+            {"name": "zhihu", "crawl_frequency": 10, "crawl_interval": 10.0, "next_crawl": soon},
+        ])
+        weibo_id, zhihu_id = (str(object_id) for object_id in result.inserted_ids)
+
+        weibo = await update_platform(db, weibo_id, PlatformUpdate(crawl_frequency=10))
+        assert weibo["crawl_interval"] == 10.0
+        assert weibo["next_crawl"] <= datetime.now() + timedelta(minutes=10)
+
+        zhihu = await update_platform(db, zhihu_id, PlatformUpdate(crawl_frequency=240))
+        assert zhihu["next_crawl"] == soon
+
+        unchanged = await update_platform(db, zhihu_id, PlatformUpdate(display_name="知乎"))
+        assert unchanged["next_crawl"] == soon
+
+    asyncio.run(run())
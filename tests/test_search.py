@@ -0,0 +1,28 @@
+from app.schemas.hotsearch import HotSearchQueryParams
+from app.services.hotsearch import _build_search_query
+from app.services.search import tokenize, build_search_grams, build_text_query
+
+
+def test_tokenize():
+    """测试n-gram切分"""
+    assert tokenize("2023世界杯 决赛！ＡＢＣ") == ["2023", "世界", "界杯", "决赛", "abc"]
+    assert tokenize("") == []
+
+
+def test_build_search_grams():
+    """测试检索字段合并标题和内容并去重"""
+    assert build_search_grams("世界杯", "世界杯决赛") == ["世界", "界杯", "杯决", "决赛"]
+
+
+def test_build_text_query():
+    """测试全文检索条件"""
+    assert build_text_query("世界杯") == {"search_grams": {"$all": ["世界", "界杯"]}}
+    # 单个汉字无法使用二元组索引, 回退为正则匹配
+    assert build_text_query("杯") is None
+
+
+def test_regex_search_escapes_keyword():
+    """测试默认的子串匹配按字面匹配关键词"""
+    params = HotSearchQueryParams(keyword="c++")
+    assert params.search_mode == "regex"
+    assert _build_search_query(params)["$or"][0] == {"title": {"$regex": r"c\+\+", "$options": "i"}}
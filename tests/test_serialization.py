@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.core.serialization import dumps_list
+from app.schemas.hotsearch import HotSearchList, RisingHotSearchList
+from app.schemas.platform import PlatformList
+
+
+def _hotsearch(rank):
+    now = datetime(2023, 1, 1, 12, 0, 0, 123000)
+    return {
+        "_id": ObjectId(),
+        "platform": "weibo",
+        "title": f"热搜{rank}",
+        "url": "https://example.com",
+        "rank": rank,
+        "hot_value": 1000 - rank,
+        "category": "general",
+        "content": None,
+        "tags": ["a"],
+        "search_grams": ["热搜"],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def test_fast_serialization_matches_models(monkeypatch):
+    """测试快速序列化与按Pydantic模型校验后的序列化输出一致"""
+    docs = [_hotsearch(rank) for rank in range(1, 4)]
+    del docs[0]["tags"]
+    rising = [{
+        "platform": "weibo", "topic_id": "t1", "title": "A", "url": "https://example.com", "rank": 1,
+        "hot_value": 10, "prev_rank": 3, "rank_delta": 2, "heat_growth": 0.25, "is_new": False,
+        "momentum": 4.5, "crawled_at": datetime(2023, 1, 1, 12, 0)
+    }]
+    platforms = [{
+        "_id": ObjectId(), "name": "weibo", "display_name": "微博", "base_url": "https://weibo.com",
+        "is_active": True, "crawl_frequency": 60, "created_at": datetime(2023, 1, 1), "updated_at": datetime(2023, 1, 1)
+    }]
+    cases = [
+        (HotSearchList, docs, {"total": 10, "next_cursor": "abc"}),
+        (HotSearchList, docs, {"total": 3}),
+        (RisingHotSearchList, rising, {"total": 1}),
+        (PlatformList, platforms, {"total": 1}),
+    ]
+    for list_model, items, fields in cases:
+        monkeypatch.setattr("app.core.config.settings.API_FAST_SERIALIZATION", True)
+        fast = dumps_list(list_model, items, **fields)
+        monkeypatch.setattr("app.core.config.settings.API_FAST_SERIALIZATION", False)
+        assert fast == dumps_list(list_model, items, **fields)
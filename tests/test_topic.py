@@ -0,0 +1,7 @@
+from app.services.topic import get_topic_id
+
+
+def test_topic_id():
+    """测试归一化后相同的标题合并为同一话题, 归一化为空的标题不会互相合并"""
+    assert get_topic_id("weibo", "世界杯 决赛！") == get_topic_id("weibo", "世界杯决赛")
+    assert get_topic_id("weibo", "！！！") != get_topic_id("weibo", "？？？")
@@ -0,0 +1,22 @@
+from app.services.trending import compute_trends
+
+
+def _item(title, rank, hot_value):
+    return {"title": title, "url": "https://example.com", "rank": rank, "hot_value": hot_value}
+
+
+def test_compute_trends():
+    """测试相邻两次榜单的趋势计算"""
+    first = compute_trends("weibo", [], [_item("A", 1, 100), _item("B", 2, 50)])
+    # 首次抓取作为基线
+    assert all(not trend["is_new"] and trend["momentum"] == 0 for trend in first)
+
+    second = compute_trends("weibo", first, [_item("B", 1, 150), _item("A", 2, 100), _item("C", 3, 10)])
+    trends = {trend["title"]: trend for trend in second}
+
+    assert trends["B"]["rank_delta"] == 1
+    assert trends["B"]["heat_growth"] == 2.0
+    assert trends["A"]["rank_delta"] == -1
+    assert trends["C"]["is_new"] and trends["C"]["prev_rank"] is None
+    # 按上升势头降序排列
+    assert [trend["title"] for trend in second] == ["B", "C", "A"]